@@ -0,0 +1,76 @@
+"""
+Measure the import time of libero.libero.envs with python -X importtime, in a
+fresh interpreter like the one of a spawned eval worker. The object and
+problem modules should not be imported until an env is created; the script
+fails if they are, or if the import takes longer than --max_ms.
+"""
+import argparse
+import subprocess
+import sys
+
+
+def import_times(module):
+    """
+    Import module in a fresh interpreter and return the cumulative import
+    time, in microseconds, of every module it imported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        times[fields[2].strip()] = int(fields[1])
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", type=str, default="libero.libero.envs")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument(
+        "--max_ms",
+        type=float,
+        default=None,
+        help="fail if importing the module takes longer than this",
+    )
+    args = parser.parse_args()
+
+    runs = [import_times(args.module) for _ in range(args.repeat)]
+    # the fastest run is the least disturbed by the rest of the machine
+    times = min(runs, key=lambda t: t.get(args.module, 0))
+    total_ms = times[args.module] / 1e3
+    print(f"[info] import {args.module}: {total_ms:.1f} ms")
+    for name, t in sorted(times.items(), key=lambda x: -x[1])[: args.top]:
+        print(f"[info] {t / 1e3:9.1f} ms  {name}")
+
+    eager = [
+        name
+        for name in times
+        if name.startswith("libero.libero.envs.problems.")
+        or (
+            name.startswith("libero.libero.envs.objects.")
+            and name.split(".")[-1]
+            not in ["site_object", "target_zones", "asset_cache"]
+        )
+    ]
+    failed = False
+    if len(eager) > 0:
+        print(f"[error] modules that should be imported lazily: {sorted(eager)}")
+        failed = True
+    if args.max_ms is not None and total_ms > args.max_ms:
+        print(f"[error] the import takes longer than {args.max_ms} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Compare the cost of the per-step success check with and without the
+incremental_success_check flag, on the demonstration actions of a task. Both
+envs replay the same actions, so their success flags must agree.
+"""
+import argparse
+import os
+import time
+
+import h5py
+import numpy as np
+
+from libero.libero import benchmark, get_libero_path
+from libero.libero.envs.env_wrapper import ControlEnv
+
+
+def time_success_checks(env):
+    """Wrap env._check_success to accumulate the time spent in it."""
+    check_success = env.env._check_success
+    stats = {"time": 0.0, "calls": 0}
+
+    def timed_check_success():
+        t0 = time.perf_counter()
+        result = check_success()
+        stats["time"] += time.perf_counter() - t0
+        stats["calls"] += 1
+        return result
+
+    env.env._check_success = timed_check_success
+    return stats
+
+
+def replay(bddl_file, init_state, actions, incremental):
+    env = ControlEnv(
+        bddl_file_name=bddl_file,
+        use_camera_obs=False,
+        has_offscreen_renderer=False,
+        incremental_success_check=incremental,
+    )
+    env.reset()
+    env.set_init_state(init_state)
+    stats = time_success_checks(env)
+
+    dones = []
+    t0 = time.perf_counter()
+    for action in actions:
+        _, _, done, _ = env.step(action)
+        dones.append(done)
+    step_time = time.perf_counter() - t0
+    predicate_stats = env.env.get_success_check_stats()
+    env.close()
+    return dones, step_time, stats, predicate_stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--benchmark_name", type=str, default="libero_10")
+    parser.add_argument("--task_id", type=int, default=0)
+    parser.add_argument("--demo_id", type=int, default=0)
+    args = parser.parse_args()
+
+    benchmark_instance = benchmark.get_benchmark_dict()[args.benchmark_name]()
+    task = benchmark_instance.get_task(args.task_id)
+    bddl_file = os.path.join(
+        get_libero_path("bddl_files"), task.problem_folder, task.bddl_file
+    )
+    demo_file = os.path.join(
+        get_libero_path("datasets"),
+        benchmark_instance.get_task_demonstration(args.task_id),
+    )
+    with h5py.File(demo_file, "r") as f:
+        actions = f[f"data/demo_{args.demo_id}/actions"][()]
+        init_state = f[f"data/demo_{args.demo_id}/states"][0]
+
+    print(f"[info] task: {task.language}, {len(actions)} steps")
+    results = {}
+    for incremental in [False, True]:
+        dones, step_time, stats, predicate_stats = replay(
+            bddl_file, init_state, actions, incremental
+        )
+        results[incremental] = dones
+        name = "incremental" if incremental else "full"
+        print(
+            f"[info] {name:>11}: step {1e3 * step_time / len(actions):.3f} ms"
+            + f" | success check {1e6 * stats['time'] / stats['calls']:.1f} us"
+            + f" over {stats['calls']} calls"
+        )
+        if predicate_stats is not None:
+            skipped = 1 - predicate_stats["evaluations"] / max(
+                predicate_stats["checks"], 1
+            )
+            print(
+                f"[info] {'':>11}  {predicate_stats['evaluations']}"
+                + f"/{predicate_stats['checks']} predicate evaluations,"
+                + f" {100 * skipped:.1f}% skipped"
+            )
+
+    mismatches = np.sum(np.array(results[False]) != np.array(results[True]))
+    print(f"[info] success flags differing between the modes: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Compare the throughput and the memory of SubprocVectorEnv for several
+numbers of envs per worker process, with the same total number of envs. Each
+configuration steps all the envs of a task with random actions, and the best
+one (most env steps per second) is reported, e.g. on a 32-core machine:
+
+    python benchmark_scripts/benchmark_vector_env.py --num_envs 32 \
+        --envs_per_process 1 2 4 8
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from libero.libero import benchmark, get_libero_path
+from libero.libero.envs import OffScreenRenderEnv, SubprocVectorEnv
+
+
+def rss_mb(pids):
+    """The total resident memory of the processes pids, in MB (Linux only)."""
+    total = 0
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/statm", "r") as f:
+                total += int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError):
+            return None
+    return total / 2**20
+
+
+def run(env_args, num_envs, envs_per_process, num_steps, share_memory):
+    t0 = time.perf_counter()
+    env = SubprocVectorEnv(
+        [lambda: OffScreenRenderEnv(**env_args) for _ in range(num_envs)],
+        share_memory=share_memory,
+        envs_per_process=envs_per_process,
+    )
+    env.reset()
+    startup_time = time.perf_counter() - t0
+
+    rng = np.random.default_rng(0)
+    env.step(np.zeros((num_envs, 7)))
+    t0 = time.perf_counter()
+    for _ in range(num_steps):
+        env.step(rng.uniform(-1, 1, size=(num_envs, 7)))
+    step_time = time.perf_counter() - t0
+
+    pids = {w.process.pid for w in env.workers}
+    memory = rss_mb(pids)
+    env.close()
+    return {
+        "processes": len(pids),
+        "startup": startup_time,
+        "steps_per_second": num_envs * num_steps / step_time,
+        "memory": memory,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--benchmark_name", type=str, default="libero_10")
+    parser.add_argument("--task_id", type=int, default=0)
+    parser.add_argument("--num_envs", type=int, default=32)
+    parser.add_argument(
+        "--envs_per_process", type=int, nargs="+", default=[1, 2, 4, 8]
+    )
+    parser.add_argument("--num_steps", type=int, default=200)
+    parser.add_argument("--img_size", type=int, default=128)
+    parser.add_argument("--share_memory", action="store_true")
+    args = parser.parse_args()
+
+    benchmark_instance = benchmark.get_benchmark_dict()[args.benchmark_name]()
+    task = benchmark_instance.get_task(args.task_id)
+    env_args = {
+        "bddl_file_name": os.path.join(
+            get_libero_path("bddl_files"), task.problem_folder, task.bddl_file
+        ),
+        "camera_heights": args.img_size,
+        "camera_widths": args.img_size,
+    }
+    print(
+        f"[info] task: {task.language}, {args.num_envs} envs,"
+        + f" {os.cpu_count()} cores"
+    )
+
+    results = {}
+    for envs_per_process in args.envs_per_process:
+        result = run(
+            env_args,
+            args.num_envs,
+            envs_per_process,
+            args.num_steps,
+            args.share_memory,
+        )
+        results[envs_per_process] = result
+        memory = "n/a" if result["memory"] is None else f"{result['memory']:.0f} MB"
+        print(
+            f"[info] {result['processes']:>3} processes x {envs_per_process}"
+            + f" envs: {result['steps_per_second']:8.1f} env steps/s"
+            + f" | startup {result['startup']:6.1f} s | memory {memory}"
+        )
+
+    best = max(results, key=lambda k: results[k]["steps_per_second"])
+    print(
+        f"[info] best: {results[best]['processes']} processes x {best} envs"
+        + f" (eval.envs_per_process={best})"
+    )
+
+
+if __name__ == "__main__":
+    main()
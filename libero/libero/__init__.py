@@ -35,62 +35,89 @@ def get_default_path_dict(custom_location=None):
     }
 
 
-def get_libero_path(query_key):
-    with open(config_file, "r") as f:
-        config = dict(yaml.load(f.read(), Loader=yaml.FullLoader))
+def _read_config_file():
+    try:
+        with open(config_file, "r") as f:
+            return dict(yaml.load(f.read(), Loader=yaml.FullLoader) or {})
+    except FileNotFoundError:
+        return {}
+
+
+def _write_config_file(path_dict):
+    os.makedirs(libero_config_path, exist_ok=True)
+    # written atomically, as several worker processes may create it at once
+    tmp_file = f"{config_file}.{os.getpid()}.tmp"
+    with open(tmp_file, "w") as f:
+        yaml.dump(path_dict, f)
+    os.replace(tmp_file, config_file)
+
+
+def env_var_name(query_key):
+    """The environment variable that overrides a path, e.g. LIBERO_DATASETS_PATH."""
+    return f"LIBERO_{query_key.upper()}_PATH"
+
+
+_libero_config = None
+
 
-    # Give warnings in case the user needs to access the paths
-    for key in config:
-        if not os.path.exists(config[key]):
-            print(f"[Warning]: {key} path {config[key]} does not exist!")
+def get_libero_config():
+    """
+    The libero paths, resolved once per process from, by order of priority,
+    the LIBERO_<KEY>_PATH environment variables, the config file and the
+    defaults. Call reset_libero_config to resolve them again.
+    """
+    global _libero_config
+    if _libero_config is None:
+        config = get_default_path_dict()
+        config.update(_read_config_file())
+        for key in config:
+            if env_var_name(key) in os.environ:
+                config[key] = os.environ[env_var_name(key)]
+        _libero_config = config
+    return _libero_config
 
+
+def reset_libero_config():
+    global _libero_config
+    _libero_config = None
+
+
+def get_libero_path(query_key):
+    config = get_libero_config()
     assert (
         query_key in config
     ), f"Key {query_key} not found in config file {config_file}. You need to modify it. Available keys are: {config.keys()}"
     return config[query_key]
 
 
+def check_libero_paths(keys=None, verbose=True):
+    """
+    Check that the configured paths (all of them, or those of keys) exist.
+    Returns the keys of the missing ones.
+    """
+    config = get_libero_config()
+    missing = []
+    for key in config if keys is None else keys:
+        if not os.path.exists(get_libero_path(key)):
+            missing.append(key)
+            if verbose:
+                print(f"[Warning]: {key} path {config[key]} does not exist!")
+    return missing
+
+
 def set_libero_default_path(custom_location=os.path.dirname(os.path.abspath(__file__))):
     print(
         f"[Warning] You are changing the default path for Libero config. This will affect all the paths in the config file."
     )
-    new_config = get_default_path_dict(custom_location)
-    with open(config_file, "w") as f:
-        yaml.dump(new_config, f)
-
+    _write_config_file(get_default_path_dict(custom_location))
+    reset_libero_config()
 
-if not os.path.exists(libero_config_path):
-    os.makedirs(libero_config_path)
 
 if not os.path.exists(config_file):
-    # Create a default config file
-
-    default_path_dict = get_default_path_dict()
-    answer = input(
-        "Do you want to specify a custom path for the dataset folder? (Y/N): "
-    ).lower()
-    if answer == "y":
-        # If the user wants to specify a custom storage path, prompt them to enter it
-        custom_dataset_path = input(
-            "Enter the path where you want to store the datasets: "
-        )
-        full_custom_dataset_path = os.path.join(
-            os.path.abspath(os.path.expanduser(custom_dataset_path)), "datasets"
-        )
-        # Check if the custom storage path exists, and create if it doesn't
-
-        print("The full path of the custom storage path you entered is:")
-        print(full_custom_dataset_path)
-        print("Do you want to continue? (Y/N)")
-        confirm_answer = input().lower()
-        if confirm_answer == "y":
-            if not os.path.exists(full_custom_dataset_path):
-                os.makedirs(full_custom_dataset_path)
-            default_path_dict["datasets"] = full_custom_dataset_path
-    print("Initializing the default config file...")
-    print(f"The following information is stored in the config file: {config_file}")
-    # write all the paths into a yaml file
-    with open(config_file, "w") as f:
-        yaml.dump(default_path_dict, f)
-    for key, value in default_path_dict.items():
-        print(f"{key}: {value}")
+    # Create a default config file, without prompting so that batch jobs and
+    # spawned workers never block. The paths can be changed in the file, or
+    # overridden with the LIBERO_<KEY>_PATH environment variables.
+    try:
+        _write_config_file(get_default_path_dict())
+    except OSError:
+        pass
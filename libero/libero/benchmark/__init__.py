@@ -141,6 +141,19 @@ class Benchmark(abc.ABC):
         )
         return bddl_file_path
 
+    def build_bddl_index(self, index_path):
+        """
+        Pre-parse the BDDL files of all the tasks into index_path. Processes
+        that call libero.libero.envs.bddl_utils.load_bddl_index(index_path)
+        then build the envs of this benchmark without scanning the files.
+        """
+        from libero.libero.envs.bddl_utils import build_bddl_index
+
+        return build_bddl_index(
+            [self.get_task_bddl_file_path(i) for i in range(self.n_tasks)],
+            index_path,
+        )
+
     def get_task_demonstration(self, i):
         assert (
             0 <= i and i < self.n_tasks
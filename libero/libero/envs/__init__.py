@@ -4,4 +4,4 @@ from .problems import *
 from .robots import *
 from .arenas import *
 from .env_wrapper import OffScreenRenderEnv, SegmentationRenderEnv
-from .venv import SubprocVectorEnv, DummyVectorEnv
+from .venv import SubprocVectorEnv, DummyVectorEnv, EnvWorkerError
@@ -1,14 +1,73 @@
+import importlib
 import re
 
-OBJECTS_DICT = {}
-VISUAL_CHANGE_OBJECTS_DICT = {}
+from collections.abc import MutableMapping
+
+from libero.libero.envs.registry_manifest import (
+    OBJECT_MANIFEST,
+    OBJECT_MODULES,
+    VISUAL_CHANGE_OBJECTS,
+)
+
+
+class LazyRegistry(MutableMapping):
+    """
+    A mapping from names to classes, filled by the register decorators as
+    their modules get imported. The names listed in manifest ("module:class"
+    by name, see registry_manifest.py) are known before their module was
+    imported: looking one of them up imports its module. A name missing from
+    a stale manifest is searched for by importing all of modules.
+    """
+
+    def __init__(self, manifest, modules=()):
+        self._manifest = dict(manifest)
+        self._modules = list(modules)
+        self._entries = {}
+
+    def register(self, key, target_class):
+        assert key not in self._entries
+        self._entries[key] = target_class
+
+    def _import(self, key):
+        if key in self._manifest:
+            importlib.import_module(self._manifest[key].split(":")[0])
+        if key not in self._entries:
+            for module in self._modules:
+                importlib.import_module(module)
+
+    def __getitem__(self, key):
+        if key not in self._entries:
+            self._import(key)
+        return self._entries[key]
+
+    def __setitem__(self, key, target_class):
+        self._entries[key] = target_class
+
+    def __delitem__(self, key):
+        self._manifest.pop(key, None)
+        del self._entries[key]
+
+    def __contains__(self, key):
+        return key in self._entries or key in self._manifest
+
+    def __iter__(self):
+        yield from self._entries
+        yield from (key for key in self._manifest if key not in self._entries)
+
+    def __len__(self):
+        return len(self._entries.keys() | self._manifest.keys())
+
+
+OBJECTS_DICT = LazyRegistry(OBJECT_MANIFEST, OBJECT_MODULES)
+VISUAL_CHANGE_OBJECTS_DICT = LazyRegistry(
+    {key: OBJECT_MANIFEST[key] for key in VISUAL_CHANGE_OBJECTS}
+)
 
 
 def register_object(target_class):
     """We design the mapping to be case-INsensitive."""
     key = "_".join(re.sub(r"([A-Z0-9])", r" \1", target_class.__name__).split()).lower()
-    assert key not in OBJECTS_DICT
-    OBJECTS_DICT[key] = target_class
+    OBJECTS_DICT.register(key, target_class)
     return target_class
 
 
@@ -2,9 +2,11 @@ import numpy as np
 import os
 import robosuite.utils.transform_utils as T
 
+from collections import namedtuple
 from copy import deepcopy
 from robosuite.environments.manipulation.single_arm_env import SingleArmEnv
 from robosuite.models.tasks import ManipulationTask
+from robosuite.utils.binding_utils import MjSim
 from robosuite.utils.placement_samplers import SequentialCompositeSampler
 from robosuite.utils.observables import Observable, sensor
 from robosuite.utils.mjcf_utils import CustomMaterial
@@ -17,13 +19,27 @@ from libero.libero.envs.robots import *
 from libero.libero.envs.utils import *
 from libero.libero.envs.object_states import *
 from libero.libero.envs.objects import *
+from libero.libero.envs.predicates import compile_goal
+from libero.libero.envs.predicates.incremental import compile_incremental_goal
+from libero.libero.envs.model_cache import get_model_cache, model_cache_key
+from libero.libero.envs.base_object import LazyRegistry
+from libero.libero.envs.registry_manifest import PROBLEM_MANIFEST, PROBLEM_MODULES
 from libero.libero.envs.regions import *
 from libero.libero.envs.arenas import *
 
 
 DIR_PATH = os.path.dirname(os.path.realpath(__file__))
 
-TASK_MAPPING = {}
+# Problem classes by name, see register_problem. The problem modules are
+# imported on the first lookup of one of their problems.
+TASK_MAPPING = LazyRegistry(PROBLEM_MANIFEST, PROBLEM_MODULES)
+
+# An entry of BDDLBaseDomain.object_registry. kind is one of "fixture",
+# "object" and "site"; body_id (fixtures and objects) and site_id (sites)
+# are None until the sim is set up.
+RegisteredObject = namedtuple(
+    "RegisteredObject", ["kind", "object", "body_id", "site_id"]
+)
 
 
 def register_problem(target_class):
@@ -75,9 +91,31 @@ class BDDLBaseDomain(SingleArmEnv):
         arena_type="table",
         scene_xml="scenes/libero_base_style.xml",
         scene_properties={},
+        incremental_success_check=False,
+        success_check_tolerance=1e-5,
+        model_cache=False,
+        model_cache_dir=None,
+        observation_keys=None,
+        site_visualization=True,
         **kwargs,
     ):
         t0 = time.time()
+        # whether to show and hide the visualization sites of the objects
+        # (e.g. the flames of a stove) as their states change. Headless
+        # evaluation can turn it off when no camera renders these sites.
+        self.site_visualization = site_visualization
+        self._vis_site_ids = np.zeros(0, dtype=int)
+        self._vis_site_entries = []
+        # If given, only these observations are computed and returned, see
+        # _filter_observables. A "<modality>-state" key keeps its modality.
+        self.observation_keys = (
+            None if observation_keys is None else list(observation_keys)
+        )
+        # whether to only re-evaluate the goal predicates whose operands moved
+        # by more than success_check_tolerance, see predicates/incremental.py
+        self.incremental_success_check = incremental_success_check
+        self.success_check_tolerance = success_check_tolerance
+        self._goal_tracker = None
         # settings for table top (hardcoded since it's not an essential part of the environment)
         self.workspace_offset = workspace_offset
         # reward configuration
@@ -109,12 +147,22 @@ class BDDLBaseDomain(SingleArmEnv):
         # This is a dictionary that stores all the object states
         # interface for all the objects
         self.object_states_dict = {}
+        # All the above by name, see _build_object_registry
+        self.object_registry = {}
 
         # For those that require visual feature changes, update the state every time step to avoid missing state changes. We keep track of this type of objects to make predicate checking more efficient.
         self.tracking_object_states_change = []
 
         self.object_sites_dict = {}
 
+        # The pairs of objects in contact at the current sim step, computed
+        # lazily by get_contact_pairs and invalidated whenever the sim moves
+        # (see invalidate_sim_caches), or when the sim time changes
+        self._contact_pairs = None
+        self._contact_pairs_time = None
+        self._contact_geom_owner = None
+        self._contact_owner_index = {}
+
         self.objects = []
         self.fixtures = []
         # self.custom_material_dict = {}
@@ -124,6 +172,35 @@ class BDDLBaseDomain(SingleArmEnv):
         self.bddl_file_name = bddl_file_name
         self.parsed_problem = BDDLUtils.robosuite_parse_problem(self.bddl_file_name)
 
+        # Hard resets reuse the MJCF assembled by the first _load_model, and
+        # the compiled model is shared by the envs of the same task (and by
+        # processes, through model_cache_dir), see model_cache.py. As the sim
+        # is then not compiled from XML, sim.model.get_xml() is not supported.
+        self._model_cache = None
+        self._model_cache_key = None
+        self._model_loaded = False
+        if model_cache:
+            self._model_cache = get_model_cache(model_cache_dir)
+            self._model_cache_key = model_cache_key(
+                bddl_file_name,
+                problem_class=type(self).__name__,
+                asset_dir=self.custom_asset_dir,
+                robots=robots,
+                controller_configs=controller_configs,
+                gripper_types=gripper_types,
+                camera_names=camera_names,
+                camera_heights=camera_heights,
+                camera_widths=camera_widths,
+                camera_depths=camera_depths,
+                renderer=renderer,
+                table_full_size=table_full_size,
+                workspace_offset=workspace_offset,
+                arena_type=arena_type,
+                scene_xml=scene_xml,
+                scene_properties=scene_properties,
+                **kwargs,
+            )
+
         self.obj_of_interest = self.parsed_problem["obj_of_interest"]
 
         self._assert_problem_name()
@@ -250,6 +327,30 @@ class BDDLBaseDomain(SingleArmEnv):
         self.object_states_dict = object_states_dict
         self.tracking_object_states_change = tracking_object_states_changes
 
+    def _build_object_registry(self, with_sim_ids=False):
+        """
+        Index the fixtures, objects and sites of the task by name, so that
+        get_object and is_fixture are dict lookups. It is built once the
+        model is loaded, then again with the body and site ids once the sim
+        is set up. A name used in several dicts resolves as it always has:
+        fixtures first, then objects, then sites.
+        """
+        object_registry = {}
+        for kind, query_dict in [
+            ("site", self.object_sites_dict),
+            ("object", self.objects_dict),
+            ("fixture", self.fixtures_dict),
+        ]:
+            for name, obj in query_dict.items():
+                body_id, site_id = None, None
+                if with_sim_ids:
+                    if kind == "site":
+                        site_id = self.sim.model.site_name2id(name)
+                    else:
+                        body_id = self.obj_body_id[name]
+                object_registry[name] = RegisteredObject(kind, obj, body_id, site_id)
+        self.object_registry = object_registry
+
     def _load_distracting_objects(self, mujoco_arena):
         raise NotImplementedError
 
@@ -298,6 +399,9 @@ class BDDLBaseDomain(SingleArmEnv):
         """
         Loads an xml model, puts it in self.model
         """
+        if self._model_loaded and self._model_cache is not None:
+            # hard reset, the model of this task is already assembled
+            return
         super()._load_model()
         # Adjust base pose accordingly
 
@@ -376,6 +480,8 @@ class BDDLBaseDomain(SingleArmEnv):
 
         self._load_sites_in_arena(mujoco_arena)
 
+        self._build_object_registry()
+
         self._generate_object_state_wrapper()
 
         self._setup_placement_initializer(mujoco_arena)
@@ -392,6 +498,23 @@ class BDDLBaseDomain(SingleArmEnv):
 
         for fixture in self.fixtures:
             self.model.merge_assets(fixture)
+        self._model_loaded = True
+
+    def _initialize_sim(self, xml_string=None):
+        """
+        Creates the sim, from the compiled model of the model cache if enabled.
+        """
+        if self._model_cache is None or xml_string is not None:
+            super()._initialize_sim(xml_string=xml_string)
+            return
+        mjmodel = self._model_cache.get_model(self._model_cache_key)
+        if mjmodel is None:
+            mjmodel = self._model_cache.compile(
+                self._model_cache_key, self.model.get_xml()
+            )
+        self.sim = MjSim(mjmodel)
+        self.sim.forward()
+        self.initialize_time(self.control_freq)
 
     def _setup_placement_initializer(self, mujoco_arena):
         self.placement_initializer = SequentialCompositeSampler(name="ObjectSampler")
@@ -424,6 +547,68 @@ class BDDLBaseDomain(SingleArmEnv):
                 fixture_body.root_body
             )
 
+        self._build_object_registry(with_sim_ids=True)
+
+        # Map every contact geom of the objects and fixtures to the index of
+        # the object it belongs to, for get_contact_pairs
+        self._contact_geom_owner = np.full(self.sim.model.ngeom, -1, dtype=int)
+        self._contact_owner_index = {}
+        for query_dict in [self.fixtures_dict, self.objects_dict]:
+            for object_body in query_dict.values():
+                index = len(self._contact_owner_index)
+                self._contact_owner_index[object_body.name] = index
+                for geom_name in object_body.contact_geoms:
+                    geom_id = self.sim.model.geom_name2id(geom_name)
+                    self._contact_geom_owner[geom_id] = index
+        self._contact_pairs = None
+
+        for object_state in self.object_states_dict.values():
+            object_state.setup_references()
+
+        # The visualization sites are resolved once per sim; set_visualization
+        # only reads the current visibility flags of the objects
+        self._vis_site_ids = []
+        self._vis_site_entries = []
+        vis_objects = dict.fromkeys(getattr(self, "visualization_sites_list", []))
+        for object_name in vis_objects:
+            vis_site_names = self.get_object(object_name).object_properties[
+                "vis_site_names"
+            ]
+            for key, (site_name, _) in vis_site_names.items():
+                self._vis_site_ids.append(self.sim.model.site_name2id(site_name))
+                self._vis_site_entries.append((vis_site_names, key))
+        self._vis_site_ids = np.array(self._vis_site_ids, dtype=int)
+
+        # The joint qpos of all the tracked objects are read in one pass by
+        # _post_process, then split between the objects
+        self._tracking_qpos_addrs = np.concatenate(
+            [np.zeros(0, dtype=int)]
+            + [
+                object_state.qpos_addrs
+                for object_state in self.tracking_object_states_change
+            ]
+        )
+        self._tracking_qpos_splits = np.cumsum(
+            [
+                len(object_state.qpos_addrs)
+                for object_state in self.tracking_object_states_change
+            ]
+        )[:-1]
+
+        # The goal is compiled once per sim, so that checking success, which
+        # runs every step, is a flat list of calls on resolved object states
+        if self.incremental_success_check:
+            self.goal_predicates, self._goal_tracker = compile_incremental_goal(
+                self,
+                self.parsed_problem["goal_state"],
+                self.object_states_dict,
+                self.success_check_tolerance,
+            )
+        else:
+            self.goal_predicates = compile_goal(
+                self.parsed_problem["goal_state"], self.object_states_dict
+            )
+
     def _setup_observables(self):
         """
         Sets up observables to be used for this environment. Creates object-based observables if enabled
@@ -489,8 +674,54 @@ class BDDLBaseDomain(SingleArmEnv):
                     name=name, sensor=s, sampling_rate=self.control_freq
                 )
 
+        if self.observation_keys is not None:
+            self._filter_observables(observables)
+
         return observables
 
+    def _filter_observables(self, observables):
+        """
+        Disables the observables that are not in observation_keys, so they are
+        neither computed nor returned. The ones that the requested observables
+        read from the observation cache stay enabled, but are not returned:
+        the poses behind <obj>_to_eef_*, <cam>_image (which renders
+        <cam>_depth) and the joint positions behind joint_pos_cos/sin.
+        """
+        pf = self.robots[0].robot_model.naming_prefix
+        keys = set(self.observation_keys)
+        modalities = {key[: -len("-state")] for key in keys if key.endswith("-state")}
+        requested = {
+            name
+            for name, observable in observables.items()
+            if name in keys or observable.modality in modalities
+        }
+
+        needed = set(requested)
+        for name in requested:
+            for suffix in [f"_to_{pf}eef_pos", f"_to_{pf}eef_quat"]:
+                if name.endswith(suffix):
+                    obj_name = name[: -len(suffix)]
+                    needed |= {
+                        f"{obj_name}_pos",
+                        f"{obj_name}_quat",
+                        f"{obj_name}_to_{pf}eef_pos",
+                        "world_pose_in_gripper",
+                    }
+        if "world_pose_in_gripper" in needed:
+            needed |= {f"{pf}eef_pos", f"{pf}eef_quat"}
+        for name in requested:
+            if name.endswith("_depth"):
+                needed.add(name[: -len("_depth")] + "_image")
+            elif name in [f"{pf}joint_pos_cos", f"{pf}joint_pos_sin"]:
+                needed.add(f"{pf}joint_pos")
+
+        for name, observable in observables.items():
+            if name not in needed:
+                observable.set_enabled(False)
+                observable.set_active(False)
+            elif name not in requested:
+                observable.set_active(False)
+
     def _create_obj_sensors(self, obj_name, modality="object"):
         """
         Helper function to create sensors for a given object. This is abstracted in a separate function call so that we
@@ -733,6 +964,10 @@ class BDDLBaseDomain(SingleArmEnv):
         Resets simulation internal configurations.
         """
         super()._reset_internal()
+        self.invalidate_sim_caches()
+        if self._goal_tracker is not None:
+            for predicate in self.goal_predicates:
+                predicate.reset()
 
         # Reset all object positions using initializer sampler if we're not directly loading from an xml
         if not self.deterministic_reset:
@@ -764,7 +999,7 @@ class BDDLBaseDomain(SingleArmEnv):
                 )
             )
             for obj_pos, obj_quat, obj in object_placements.values():
-                if obj.name not in list(self.fixtures_dict.keys()):
+                if not self.is_fixture(obj.name):
                     # This is for movable object resetting
                     self.sim.data.set_joint_qpos(
                         obj.joints[-1],
@@ -772,7 +1007,7 @@ class BDDLBaseDomain(SingleArmEnv):
                     )
                 else:
                     # This is for fixture resetting
-                    body_id = self.sim.model.body_name2id(obj.root_body)
+                    body_id = self.object_registry[obj.name].body_id
                     self.sim.model.body_pos[body_id] = obj_pos
                     self.sim.model.body_quat[body_id] = obj_quat
 
@@ -812,16 +1047,116 @@ class BDDLBaseDomain(SingleArmEnv):
         super()._pre_action(action, policy_step=policy_step)
 
     def _post_action(self, action):
+        self.invalidate_sim_caches()
         reward, done, info = super()._post_action(action)
 
         self._post_process()
 
         return reward, done, info
 
+    def invalidate_sim_caches(self):
+        """
+        Forget what was computed from the previous sim state: the contacts are
+        recomputed on the next query and all the goal predicates evaluated
+        again. To call after moving the sim outside of step / reset, e.g.
+        with sim.set_state_from_flattened.
+        """
+        self._contact_pairs = None
+        if self._goal_tracker is not None:
+            self._goal_tracker.invalidate()
+
     def _post_process(self):
+        self.invalidate_sim_caches()
         # Update some object states, such as light switching etc.
-        for object_state in self.tracking_object_states_change:
-            object_state.update_state()
+        if len(self.tracking_object_states_change) > 0:
+            tracking_qpos = np.split(
+                self.sim.data.qpos[self._tracking_qpos_addrs],
+                self._tracking_qpos_splits,
+            )
+            for object_state, qpos in zip(
+                self.tracking_object_states_change, tracking_qpos
+            ):
+                object_state.update_state(qpos)
+
+        if self.site_visualization:
+            self.set_visualization()
+
+    def set_visualization(self):
+        """
+        Toggle the alpha of the visualization sites whose visibility does not
+        match the state of their object, in one assignment to site_rgba.
+        """
+        if len(self._vis_site_ids) == 0:
+            return
+        visible = np.array(
+            [
+                vis_site_names[key][1]
+                for (vis_site_names, key) in self._vis_site_entries
+            ],
+            dtype=bool,
+        )
+        alpha = self.sim.model.site_rgba[self._vis_site_ids, 3]
+        toggle = ((alpha <= 0) & visible) | ((alpha > 0) & ~visible)
+        if toggle.any():
+            self.sim.model.site_rgba[self._vis_site_ids[toggle], 3] = (
+                1 - alpha[toggle]
+            )
+
+    def get_contact_pairs(self):
+        """
+        The set of (i, j) pairs, i <= j, of the indices of the objects and
+        fixtures whose contact geoms touch at the current sim step. It is
+        built once per step from the active contacts, so all the contact
+        queries of the predicates are set lookups.
+        """
+        # direct sim.set_state_from_flattened calls usually change the time
+        sim_time = self.sim.data.time
+        if self._contact_pairs is None or self._contact_pairs_time != sim_time:
+            self._contact_pairs_time = sim_time
+            contacts = self.sim.data.contact[: self.sim.data.ncon]
+            owner_1 = self._contact_geom_owner[np.asarray(contacts.geom1, dtype=int)]
+            owner_2 = self._contact_geom_owner[np.asarray(contacts.geom2, dtype=int)]
+            valid = (owner_1 >= 0) & (owner_2 >= 0)
+            owner_1, owner_2 = owner_1[valid], owner_2[valid]
+            self._contact_pairs = set(
+                zip(
+                    np.minimum(owner_1, owner_2).tolist(),
+                    np.maximum(owner_1, owner_2).tolist(),
+                )
+            )
+        return self._contact_pairs
+
+    def get_contact_owner(self, object_name):
+        """
+        The index of an object or fixture in get_contact_pairs, None for
+        anything else.
+        """
+        return self._contact_owner_index.get(object_name)
+
+    def get_success_check_stats(self):
+        """
+        With incremental_success_check, the number of goal predicate checks
+        and of those that actually evaluated the predicate.
+        """
+        if self._goal_tracker is None:
+            return None
+        return {
+            "checks": self._goal_tracker.num_checks,
+            "evaluations": self._goal_tracker.num_evaluations,
+        }
+
+    def check_contact(self, geoms_1, geoms_2=None):
+        """
+        Same as robosuite's check_contact, with a lookup in get_contact_pairs
+        when both arguments are objects or fixtures of the task.
+        """
+        index_1 = self._contact_owner_index.get(getattr(geoms_1, "name", None))
+        index_2 = self._contact_owner_index.get(getattr(geoms_2, "name", None))
+        if index_1 is None or index_2 is None:
+            return super().check_contact(geoms_1, geoms_2)
+        if index_1 > index_2:
+            index_1, index_2 = index_2, index_1
+        return (index_1, index_2) in self.get_contact_pairs()
 
     def get_robot_state_vector(self, obs):
         return np.concatenate(
@@ -835,17 +1170,14 @@ class BDDLBaseDomain(SingleArmEnv):
         Args:
             object_name (str): The name string of the object in query
         """
-        return object_name in list(self.fixtures_dict.keys())
+        entry = self.object_registry.get(object_name)
+        return entry is not None and entry.kind == "fixture"
 
     @property
     def language_instruction(self):
         return self.parsed_problem["language"]
 
     def get_object(self, object_name):
-        for query_dict in [
-            self.fixtures_dict,
-            self.objects_dict,
-            self.object_sites_dict,
-        ]:
-            if object_name in query_dict:
-                return query_dict[object_name]
+        entry = self.object_registry.get(object_name)
+        if entry is not None:
+            return entry.object
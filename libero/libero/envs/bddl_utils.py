@@ -1,15 +1,27 @@
 from bddl.parsing import *
 
+import copy
+import functools
+import hashlib
 import itertools
+import json
+import os
 import numpy as np
 
 pi = np.pi
 
+# Folder of the on-disk cache of scanned BDDL files, shared by processes.
+# Disabled unless LIBERO_BDDL_CACHE_DIR is set.
+bddl_cache_dir = os.environ.get("LIBERO_BDDL_CACHE_DIR", None)
+# Number of BDDL files kept parsed in memory by each process
+BDDL_CACHE_SIZE = 1024
+
+# Tokens of the files of a bulk pre-parse, by content hash, see load_bddl_index
+_indexed_tokens = {}
+
 
 def get_regions(t, regions, group):
-    group.pop(0)
-    while group:
-        region = group.pop(0)
+    for region in group[1:]:
         region_name = region[0]
         target_name = None
         region_dict = {
@@ -45,11 +57,9 @@ def get_regions(t, regions, group):
 
 
 def get_scenes(t, scene_properties, group):
-    group.pop(0)
-    while group:
-        scene_property = group.pop(0)
+    for scene_property in group[1:]:
         scene_properties_dict = {}
-        for attribute in region[1:]:
+        for attribute in scene_property[1:]:
             if attribute[0] == ":floor":
                 assert len(attribute) == 2
                 scene_properties_dict["floor_style"] = attribute[1]
@@ -60,23 +70,97 @@ def get_scenes(t, scene_properties, group):
                 raise NotImplementedError
 
 
-def get_problem_info(problem_filename):
-    domain_name = "unknown"
-    problem_filename = problem_filename
+def _bddl_file_key(problem_filename):
+    stat = os.stat(problem_filename)
+    return os.path.realpath(problem_filename), stat.st_mtime_ns, stat.st_size
+
+
+def _bddl_digest(content):
+    return hashlib.sha1(content).hexdigest()
+
+
+@functools.lru_cache(maxsize=BDDL_CACHE_SIZE)
+def _scan_bddl_file(file_key):
+    """
+    The tokens of a BDDL file, looked up by content hash in the loaded
+    indices and in bddl_cache_dir before scanning the file. file_key
+    (see _bddl_file_key) changes with the modification time of the file.
+    """
+    problem_filename = file_key[0]
+    with open(problem_filename, "rb") as f:
+        digest = _bddl_digest(f.read())
+    if digest in _indexed_tokens:
+        return _indexed_tokens[digest]
+
+    cache_path = None
+    if bddl_cache_dir is not None:
+        cache_path = os.path.join(bddl_cache_dir, f"{digest}.json")
+        try:
+            with open(cache_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+
     tokens = scan_tokens(filename=problem_filename)
-    if isinstance(tokens, list) and tokens.pop(0) == "define":
+    if cache_path is not None:
+        os.makedirs(bddl_cache_dir, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(tokens, f)
+        os.replace(tmp_path, cache_path)
+    return tokens
+
+
+def scan_bddl_file(problem_filename):
+    """
+    The tokens of a BDDL file, cached: the file is only scanned again once
+    modified. The tokens are shared, callers must not modify them.
+    """
+    return _scan_bddl_file(_bddl_file_key(problem_filename))
+
+
+def build_bddl_index(problem_filenames, index_path):
+    """
+    Scan all problem_filenames (e.g. the BDDL files of a task suite) into a
+    single index file, to be loaded with load_bddl_index.
+    """
+    index = {}
+    for problem_filename in problem_filenames:
+        with open(problem_filename, "rb") as f:
+            digest = _bddl_digest(f.read())
+        index[digest] = scan_bddl_file(problem_filename)
+    tmp_path = f"{index_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(index, f)
+    os.replace(tmp_path, index_path)
+    return index_path
+
+
+def load_bddl_index(index_path):
+    """
+    Make the files of an index built by build_bddl_index parse without
+    being scanned.
+    """
+    with open(index_path, "r") as f:
+        _indexed_tokens.update(json.load(f))
+    _scan_bddl_file.cache_clear()
+    _parse_bddl_file.cache_clear()
+
+
+def _parse_problem_info(tokens):
+    domain_name = "unknown"
+    if isinstance(tokens, list) and tokens[0] == "define":
         problem_name = "unknown"
-        language_instruction = ""
-        while tokens:
-            group = tokens.pop()
+        language_instruction = []
+        # groups are read last to first, the first one of a kind wins
+        for group in reversed(tokens[1:]):
             t = group[0]
             if t == "problem":
                 problem_name = group[-1]
             elif t == ":domain":
                 domain_name = "robosuite"
             elif t == ":language":
-                group.pop(0)
-                language_instruction = group
+                language_instruction = group[1:]
     return {
         "problem_name": problem_name,
         "domain_name": domain_name,
@@ -84,11 +168,13 @@ def get_problem_info(problem_filename):
     }
 
 
-def robosuite_parse_problem(problem_filename):
+def get_problem_info(problem_filename):
+    return _parse_problem_info(scan_bddl_file(problem_filename))
+
+
+def _parse_robosuite_problem(tokens):
     domain_name = "robosuite"
-    problem_filename = problem_filename
-    tokens = scan_tokens(filename=problem_filename)
-    if isinstance(tokens, list) and tokens.pop(0) == "define":
+    if isinstance(tokens, list) and tokens[0] == "define":
         problem_name = "unknown"
         objects = {}
         obj_of_interest = []
@@ -98,8 +184,8 @@ def robosuite_parse_problem(problem_filename):
         regions = {}
         scene_properties = {}
         language_instruction = ""
-        while tokens:
-            group = tokens.pop()
+        # groups are read last to first, the first one of a kind wins
+        for group in reversed(tokens[1:]):
             t = group[0]
             if t == "problem":
                 problem_name = group[-1]
@@ -109,33 +195,29 @@ def robosuite_parse_problem(problem_filename):
             elif t == ":requirements":
                 pass
             elif t == ":objects":
-                group.pop(0)
                 object_list = []
-                while group:
-                    if group[0] == "-":
-                        group.pop(0)
-                        objects[group.pop(0)] = object_list
+                items = iter(group[1:])
+                for item in items:
+                    if item == "-":
+                        objects[next(items)] = object_list
                         object_list = []
                     else:
-                        object_list.append(group.pop(0))
+                        object_list.append(item)
                 if object_list:
                     if not "object" in objects:
                         objects["object"] = []
                     objects["object"] += object_list
             elif t == ":obj_of_interest":
-                group.pop(0)
-                while group:
-                    obj_of_interest.append(group.pop(0))
+                obj_of_interest.extend(group[1:])
             elif t == ":fixtures":
-                group.pop(0)
                 fixture_list = []
-                while group:
-                    if group[0] == "-":
-                        group.pop(0)
-                        fixtures[group.pop(0)] = fixture_list
+                items = iter(group[1:])
+                for item in items:
+                    if item == "-":
+                        fixtures[next(items)] = fixture_list
                         fixture_list = []
                     else:
-                        fixture_list.append(group.pop(0))
+                        fixture_list.append(item)
                 if fixture_list:
                     if not "fixture" in fixtures:
                         fixtures["fixture"] = []
@@ -145,12 +227,10 @@ def robosuite_parse_problem(problem_filename):
             elif t == ":scene_properties":
                 get_scenes(t, scene_properties, group)
             elif t == ":language":
-                group.pop(0)
-                language_instruction = group
+                language_instruction = group[1:]
 
             elif t == ":init":
-                group.pop(0)
-                initial_state = group
+                initial_state = group[1:]
             elif t == ":goal":
                 package_predicates(group[1], goal_state, "", "goals")
             else:
@@ -167,6 +247,18 @@ def robosuite_parse_problem(problem_filename):
             "obj_of_interest": obj_of_interest,
         }
     else:
-        raise Exception(
-            f"Problem {behavior_activity} {activity_definition} does not match problem pattern"
-        )
+        raise Exception(f"Problem {tokens[:2]} does not match problem pattern")
+
+
+@functools.lru_cache(maxsize=BDDL_CACHE_SIZE)
+def _parse_bddl_file(file_key):
+    # package_predicates comes from bddl, keep it away from the shared tokens
+    return _parse_robosuite_problem(copy.deepcopy(_scan_bddl_file(file_key)))
+
+
+def robosuite_parse_problem(problem_filename):
+    """
+    Parse a BDDL problem file. Parsing is cached per process (see
+    scan_bddl_file), every call returns its own copy of the result.
+    """
+    return copy.deepcopy(_parse_bddl_file(_bddl_file_key(problem_filename)))
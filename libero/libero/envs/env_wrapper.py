@@ -38,6 +38,8 @@ class ControlEnv:
         camera_segmentations=None,
         renderer="mujoco",
         renderer_config=None,
+        observation_keys=None,
+        site_visualization=True,
         **kwargs,
     ):
         assert os.path.exists(
@@ -77,6 +79,8 @@ class ControlEnv:
             camera_segmentations=camera_segmentations,
             renderer=renderer,
             renderer_config=renderer_config,
+            observation_keys=observation_keys,
+            site_visualization=site_visualization,
             **kwargs,
         )
 
@@ -126,6 +130,8 @@ class ControlEnv:
 
     def set_state(self, mujoco_state):
         self.env.sim.set_state_from_flattened(mujoco_state)
+        # the contacts and goal checks cached for the previous state are stale
+        self.env.invalidate_sim_caches()
 
     def reset_from_xml_string(self, xml_string):
         self.env.reset_from_xml_string(xml_string)
@@ -144,6 +150,16 @@ class ControlEnv:
         self._update_observables(force=True)
         return self.env._get_observations()
 
+    def load_task(self, **kwargs):
+        """
+        Replace the current scene with a new one, built from the constructor
+        kwargs (bddl_file_name, camera_heights, ...). The env object is kept,
+        so a long-lived worker process can switch tasks without re-importing
+        robosuite.
+        """
+        self.close()
+        self.__init__(**kwargs)
+
     def close(self):
         self.env.close()
         del self.env
@@ -0,0 +1,119 @@
+"""
+Cache of the MuJoCo models of the tasks, so that hard resets and new envs of
+a task skip assembling the MJCF and compiling it again. Entries are keyed by
+model_cache_key, i.e. the content of the BDDL file and the constructor
+arguments that end up in the model.
+"""
+import copy
+import hashlib
+import json
+import os
+
+import mujoco
+import numpy as np
+
+
+def model_cache_key(bddl_file_name, **model_kwargs):
+    """
+    The cache key of the model of a task, a hash of the content of its BDDL
+    file and of model_kwargs (robots, cameras, arena, ...).
+    """
+    h = hashlib.sha1()
+    with open(bddl_file_name, "rb") as f:
+        h.update(f.read())
+    h.update(json.dumps(model_kwargs, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+class ModelCache:
+    """
+    Holds the final XML string and the compiled MjModel of each key in
+    memory, and in cache_dir if given (as <key>.xml and <key>.mjb files,
+    written atomically so that worker processes can share the folder).
+    Callers get their own copy of the compiled model, as envs modify it.
+    A .mjb file that does not load, e.g. written by another MuJoCo version,
+    is compiled again from the .xml file, which skips assembling the MJCF.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+        self._xml = {}
+        self._models = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key, ext):
+        return os.path.join(self.cache_dir, f"{key}.{ext}")
+
+    def _write(self, path, data, mode):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, mode) as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def get_xml(self, key):
+        if key not in self._xml and self.cache_dir is not None:
+            try:
+                with open(self._path(key, "xml"), "r") as f:
+                    self._xml[key] = f.read()
+            except OSError:
+                pass
+        return self._xml.get(key)
+
+    def put_xml(self, key, xml):
+        self._xml[key] = xml
+        if self.cache_dir is not None:
+            self._write(self._path(key, "xml"), xml, "w")
+
+    def get_model(self, key):
+        """
+        Return a copy of the compiled model of key, or None.
+        """
+        if key not in self._models and self.cache_dir is not None:
+            path = self._path(key, "mjb")
+            if os.path.exists(path):
+                try:
+                    self._models[key] = mujoco.MjModel.from_binary_path(path)
+                except ValueError:
+                    xml = self.get_xml(key)
+                    if xml is not None:
+                        try:
+                            self.put_model(key, mujoco.MjModel.from_xml_string(xml))
+                        except ValueError:
+                            pass
+        if key not in self._models:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return copy.deepcopy(self._models[key])
+
+    def put_model(self, key, model):
+        self._models[key] = copy.deepcopy(model)
+        if self.cache_dir is not None:
+            buffer = np.zeros(mujoco.mj_sizeModel(model), dtype=np.uint8)
+            mujoco.mj_saveModel(model, None, buffer)
+            self._write(self._path(key, "mjb"), buffer.tobytes(), "wb")
+
+    def compile(self, key, xml):
+        """
+        Compile xml, the model of key, and cache it along with the result.
+        Returns a model owned by the caller.
+        """
+        self.put_xml(key, xml)
+        model = mujoco.MjModel.from_xml_string(xml)
+        self.put_model(key, model)
+        return model
+
+
+_MODEL_CACHES = {}
+
+
+def get_model_cache(cache_dir=None):
+    """
+    The process-wide model cache backed by cache_dir (memory only if None).
+    """
+    if cache_dir not in _MODEL_CACHES:
+        _MODEL_CACHES[cache_dir] = ModelCache(cache_dir)
+    return _MODEL_CACHES[cache_dir]
@@ -2,10 +2,33 @@ import robosuite.utils.transform_utils as transform_utils
 import numpy as np
 
 
+def get_joint_qpos_addrs(sim, joints):
+    """
+    The qpos addresses of the joints as an index array. A joint with several
+    dofs, e.g. the free joint of a movable object, has a (start, end) range
+    of addresses, which are all included.
+    """
+    qpos_addrs = []
+    for joint in joints:
+        addr = sim.model.get_joint_qpos_addr(joint)
+        if isinstance(addr, tuple):
+            qpos_addrs.extend(range(*addr))
+        else:
+            qpos_addrs.append(addr)
+    return np.array(qpos_addrs, dtype=int)
+
+
 class BaseObjectState:
     def __init__(self):
         pass
 
+    def setup_references(self):
+        """
+        Resolve the sim ids this object state reads, called once the sim is
+        (re)created, see BDDLBaseDomain._setup_references.
+        """
+        pass
+
     def get_geom_state(self):
         raise NotImplementedError
 
@@ -40,50 +63,52 @@ class ObjectState(BaseObjectState):
             self.env.fixtures_dict if self.is_fixture else self.env.objects_dict
         )
         self.object_state_type = "object"
-        self.has_turnon_affordance = hasattr(
-            self.env.get_object(self.object_name), "turn_on"
-        )
+        self.object = self.env.get_object(self.object_name)
+        self.body_id = None
+        self.qpos_addrs = None
+        self.has_turnon_affordance = hasattr(self.object, "turn_on")
+        # articulation thresholds of the object, bound once
+        self._is_open = getattr(self.object, "is_open", None)
+        self._is_close = getattr(self.object, "is_close", None)
+        self._turn_on = getattr(self.object, "turn_on", None)
+        self._turn_off = getattr(self.object, "turn_off", None)
+
+    def setup_references(self):
+        self.body_id = self.env.object_registry[self.object_name].body_id
+        self.qpos_addrs = get_joint_qpos_addrs(self.env.sim, self.object.joints)
+
+    def get_joint_qpos(self):
+        """
+        The qpos of all the joints of the object, read in one access.
+        """
+        return self.env.sim.data.qpos[self.qpos_addrs]
 
     def get_geom_state(self):
-        object_pos = self.env.sim.data.body_xpos[self.env.obj_body_id[self.object_name]]
-        object_quat = self.env.sim.data.body_xquat[
-            self.env.obj_body_id[self.object_name]
-        ]
+        object_pos = self.env.sim.data.body_xpos[self.body_id]
+        object_quat = self.env.sim.data.body_xquat[self.body_id]
         return {"pos": object_pos, "quat": object_quat}
 
     def check_contact(self, other):
-        object_1 = self.env.get_object(self.object_name)
-        object_2 = self.env.get_object(other.object_name)
-        return self.env.check_contact(object_1, object_2)
+        return self.env.check_contact(self.object, other.object)
 
     def check_contain(self, other):
-        object_1 = self.env.get_object(self.object_name)
-        object_1_position = self.env.sim.data.body_xpos[
-            self.env.obj_body_id[self.object_name]
-        ]
-        object_2 = self.env.get_object(other.object_name)
-        object_2_position = self.env.sim.data.body_xpos[
-            self.env.obj_body_id[other.object_name]
-        ]
-        return object_1.in_box(object_1_position, object_2_position)
+        object_1_position = self.env.sim.data.body_xpos[self.body_id]
+        object_2_position = self.env.sim.data.body_xpos[other.body_id]
+        return self.object.in_box(object_1_position, object_2_position)
 
     def get_joint_state(self):
         # Return None if joint state does not exist
+        if self.qpos_addrs is not None:
+            return list(self.get_joint_qpos())
         joint_states = []
-        for joint in self.env.get_object(self.object_name).joints:
+        for joint in self.object.joints:
             qpos_addr = self.env.sim.model.get_joint_qpos_addr(joint)
             joint_states.append(self.env.sim.data.qpos[qpos_addr])
         return joint_states
 
     def check_ontop(self, other):
-        this_object = self.env.get_object(self.object_name)
-        this_object_position = self.env.sim.data.body_xpos[
-            self.env.obj_body_id[self.object_name]
-        ]
-        other_object = self.env.get_object(other.object_name)
-        other_object_position = self.env.sim.data.body_xpos[
-            self.env.obj_body_id[other.object_name]
-        ]
+        this_object_position = self.env.sim.data.body_xpos[self.body_id]
+        other_object_position = self.env.sim.data.body_xpos[other.body_id]
         return (
             (this_object_position[2] <= other_object_position[2])
             and self.check_contact(other)
@@ -94,44 +119,36 @@ class ObjectState(BaseObjectState):
         )
 
     def set_joint(self, qpos=1.5):
-        for joint in self.env.get_object(self.object_name).joints:
+        for joint in self.object.joints:
             self.env.sim.data.set_joint_qpos(joint, qpos)
 
-    def is_open(self):
-        for joint in self.env.get_object(self.object_name).joints:
-            qpos_addr = self.env.sim.model.get_joint_qpos_addr(joint)
-            qpos = self.env.sim.data.qpos[qpos_addr]
-            if self.env.get_object(self.object_name).is_open(qpos):
-                return True
-        return False
+    # The articulation checks below take the joint qpos of the object when it
+    # was already read, e.g. for all the tracked objects at once (see
+    # BDDLBaseDomain._post_process), otherwise they read it themselves.
 
-    def is_close(self):
-        for joint in self.env.get_object(self.object_name).joints:
-            qpos_addr = self.env.sim.model.get_joint_qpos_addr(joint)
-            qpos = self.env.sim.data.qpos[qpos_addr]
-            if not (self.env.get_object(self.object_name).is_close(qpos)):
-                return False
-        return True
+    def is_open(self, qpos=None):
+        if qpos is None:
+            qpos = self.get_joint_qpos()
+        return any(self._is_open(q) for q in qpos)
 
-    def turn_on(self):
-        for joint in self.env.get_object(self.object_name).joints:
-            qpos_addr = self.env.sim.model.get_joint_qpos_addr(joint)
-            qpos = self.env.sim.data.qpos[qpos_addr]
-            if self.env.get_object(self.object_name).turn_on(qpos):
-                return True
-        return False
+    def is_close(self, qpos=None):
+        if qpos is None:
+            qpos = self.get_joint_qpos()
+        return all(self._is_close(q) for q in qpos)
 
-    def turn_off(self):
-        for joint in self.env.get_object(self.object_name).joints:
-            qpos_addr = self.env.sim.model.get_joint_qpos_addr(joint)
-            qpos = self.env.sim.data.qpos[qpos_addr]
-            if not (self.env.get_object(self.object_name).turn_off(qpos)):
-                return False
-        return True
+    def turn_on(self, qpos=None):
+        if qpos is None:
+            qpos = self.get_joint_qpos()
+        return any(self._turn_on(q) for q in qpos)
 
-    def update_state(self):
+    def turn_off(self, qpos=None):
+        if qpos is None:
+            qpos = self.get_joint_qpos()
+        return all(self._turn_off(q) for q in qpos)
+
+    def update_state(self, qpos=None):
         if self.has_turnon_affordance:
-            self.turn_on()
+            self.turn_on(qpos)
 
 
 class SiteObjectState(BaseObjectState):
@@ -148,26 +165,42 @@ class SiteObjectState(BaseObjectState):
             self.env.fixtures_dict if self.is_fixture else self.env.objects_dict
         )
         self.object_state_type = "site"
+        self.object = self.env.object_sites_dict[self.object_name]
+        self.parent_object = self.env.get_object(self.parent_name)
+        self.site_id = None
+        self.qpos_addrs = None
+        # articulation thresholds of the parent object, bound once
+        self._is_open = getattr(self.parent_object, "is_open", None)
+        self._is_close = getattr(self.parent_object, "is_close", None)
+
+    def setup_references(self):
+        self.site_id = self.env.object_registry[self.object_name].site_id
+        self.qpos_addrs = get_joint_qpos_addrs(self.env.sim, self.object.joints)
+
+    def get_joint_qpos(self):
+        """
+        The qpos of all the joints of the site, read in one access.
+        """
+        return self.env.sim.data.qpos[self.qpos_addrs]
+
+    def _get_site_xpos(self):
+        return self.env.sim.data.site_xpos[self.site_id]
+
+    def _get_site_xmat(self):
+        return self.env.sim.data.site_xmat[self.site_id].reshape(3, 3)
 
     def get_geom_state(self):
-        object_pos = self.env.sim.data.get_site_xpos(self.object_name)
-        object_quat = transform_utils.mat2quat(
-            self.env.sim.data.get_site_xmat(self.object_name)
-        )
+        object_pos = self._get_site_xpos()
+        object_quat = transform_utils.mat2quat(self._get_site_xmat())
         return {"pos": object_pos, "quat": object_quat}
 
     def check_contain(self, other):
-        this_object = self.env.object_sites_dict[self.object_name]
-        this_object_position = self.env.sim.data.get_site_xpos(self.object_name)
-        this_object_mat = self.env.sim.data.get_site_xmat(self.object_name)
-
-        other_object = self.env.get_object(other.object_name)
-        other_object_position = self.env.sim.data.body_xpos[
-            self.env.obj_body_id[other.object_name]
-        ]
-        
+        this_object_position = self._get_site_xpos()
+        this_object_mat = self._get_site_xmat()
+        other_object_position = self.env.sim.data.body_xpos[other.body_id]
+
         # print(f"other_object_position: {other_object_position}")
-        return this_object.in_box(
+        return self.object.in_box(
             this_object_position, this_object_mat, other_object_position
         )
 
@@ -178,58 +211,44 @@ class SiteObjectState(BaseObjectState):
         return True
 
     def check_ontop(self, other):
-        this_object = self.env.object_sites_dict[self.object_name]
+        this_object = self.object
         if hasattr(this_object, "under"):
-            this_object_position = self.env.sim.data.get_site_xpos(self.object_name)
-            this_object_mat = self.env.sim.data.get_site_xmat(self.object_name)
-            other_object = self.env.get_object(other.object_name)
-            other_object_position = self.env.sim.data.body_xpos[
-                self.env.obj_body_id[other.object_name]
-            ]
+            this_object_position = self._get_site_xpos()
+            this_object_mat = self._get_site_xmat()
+            other_object_position = self.env.sim.data.body_xpos[other.body_id]
             # print(self.object_name, this_object_position)
             # print(other_object_position)
 
-            parent_object = self.env.get_object(self.parent_name)
-            if parent_object is None:
+            if self.parent_object is None:
                 return this_object.under(
                     this_object_position, this_object_mat, other_object_position
                 )
             else:
                 return this_object.under(
                     this_object_position, this_object_mat, other_object_position
-                ) and self.env.check_contact(parent_object, other_object)
+                ) and self.env.check_contact(self.parent_object, other.object)
         else:
             return True
 
     def set_joint(self, qpos=1.5):
-        for joint in self.env.object_sites_dict[self.object_name].joints:
+        for joint in self.object.joints:
             self.env.sim.data.set_joint_qpos(joint, qpos)
 
-    def is_open(self):
-        for joint in self.env.object_sites_dict[self.object_name].joints:
-            qpos_addr = self.env.sim.model.get_joint_qpos_addr(joint)
-            qpos = self.env.sim.data.qpos[qpos_addr]
-            if self.env.get_object(self.parent_name).is_open(qpos):
-                return True
-        return False
+    def is_open(self, qpos=None):
+        if qpos is None:
+            qpos = self.get_joint_qpos()
+        return any(self._is_open(q) for q in qpos)
 
-    def is_close(self):
-        for joint in self.env.object_sites_dict[self.object_name].joints:
-            qpos_addr = self.env.sim.model.get_joint_qpos_addr(joint)
-            qpos = self.env.sim.data.qpos[qpos_addr]
-            if not (self.env.get_object(self.parent_name).is_close(qpos)):
-                return False
-        return True
+    def is_close(self, qpos=None):
+        if qpos is None:
+            qpos = self.get_joint_qpos()
+        return all(self._is_close(q) for q in qpos)
 
     def check_contain_xy(self, other):
-        this_object = self.env.object_sites_dict[self.object_name]
-        this_position = self.env.sim.data.get_site_xpos(self.object_name)
+        this_position = self._get_site_xpos()
+        other_position = self.env.sim.data.body_xpos[other.body_id]
 
-        other_position = self.env.sim.data.body_xpos[
-            self.env.obj_body_id[other.object_name]
-        ]
-        
-        total_size = this_object.size
+        total_size = self.object.size
 
         ub = this_position + total_size
         lb = this_position - total_size
@@ -1,14 +1,26 @@
+import importlib
 import re
 
 from libero.libero.envs.base_object import OBJECTS_DICT, VISUAL_CHANGE_OBJECTS_DICT
+from libero.libero.envs.registry_manifest import OBJECT_MANIFEST
 
-from .hope_objects import *
-from .google_scanned_objects import *
-from .articulated_objects import *
-from .turbosquid_objects import *
 from .site_object import SiteObject
+from .asset_cache import clear_asset_cache, get_asset_cache_stats
 from .target_zones import *
-from .custom_objects import *
+
+# The object category modules (hope_objects, articulated_objects, ...) are
+# only imported once one of their classes is looked up, through
+# get_object_fn / OBJECTS_DICT or as an attribute of this package.
+_CLASS_MODULES = dict(
+    reversed(entry.split(":")) for entry in OBJECT_MANIFEST.values()
+)
+
+
+def __getattr__(name):
+    if name in _CLASS_MODULES:
+        return getattr(importlib.import_module(_CLASS_MODULES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 def get_object_fn(category_name):
     return OBJECTS_DICT[category_name.lower()]
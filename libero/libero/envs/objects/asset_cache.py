@@ -0,0 +1,76 @@
+"""
+Process-level cache of the object models built from the XML files under
+assets/. Each XML file is parsed and turned into an object model once, under
+a placeholder name, and every instance gets a deep copy of it renamed after
+the instance.
+"""
+import copy
+import xml.etree.ElementTree as ET
+
+from robosuite.models.objects import MujocoXMLObject
+
+_TEMPLATE_NAME = "libero_asset_template"
+_TEMPLATE_PREFIX = f"{_TEMPLATE_NAME}_"
+
+_TEMPLATES = {}
+_STATS = {"hits": 0, "misses": 0}
+
+
+def _rename_elements(root, name, renamed):
+    for element in root.iter():
+        if id(element) in renamed:
+            continue
+        renamed.add(id(element))
+        for key, value in element.attrib.items():
+            if value.startswith(_TEMPLATE_PREFIX):
+                element.set(key, f"{name}_{value[len(_TEMPLATE_PREFIX):]}")
+
+
+def init_from_xml_template(
+    obj, fname, name, joints="default", obj_type="all", duplicate_collision_geoms=True
+):
+    """
+    Same as MujocoXMLObject.__init__(obj, fname, name, ...), except that fname
+    is only parsed the first time a class is built from it with these
+    arguments. Later instances copy the cached model and rename it.
+    """
+    key = (type(obj), fname, repr(joints), obj_type, duplicate_collision_geoms)
+    template = _TEMPLATES.get(key)
+    if template is None:
+        _STATS["misses"] += 1
+        template = type(obj).__new__(type(obj))
+        MujocoXMLObject.__init__(
+            template,
+            fname,
+            name=_TEMPLATE_NAME,
+            joints=copy.deepcopy(joints),
+            obj_type=obj_type,
+            duplicate_collision_geoms=duplicate_collision_geoms,
+        )
+        _TEMPLATES[key] = template
+    else:
+        _STATS["hits"] += 1
+
+    obj.__dict__.update(copy.deepcopy(template.__dict__))
+    obj._name = name
+    # the names given by add_prefix in the xml trees of the model
+    renamed = set()
+    for value in list(obj.__dict__.values()):
+        if isinstance(value, ET.ElementTree):
+            value = value.getroot()
+        if isinstance(value, ET.Element):
+            _rename_elements(value, name, renamed)
+
+
+def get_asset_cache_stats():
+    """
+    The number of object models built from the cache (hits) and from their
+    XML file (misses) so far in this process.
+    """
+    return dict(_STATS, templates=len(_TEMPLATES))
+
+
+def clear_asset_cache():
+    _TEMPLATES.clear()
+    _STATS["hits"] = 0
+    _STATS["misses"] = 0
@@ -1,5 +1,6 @@
 import os
 from robosuite.models.objects import MujocoXMLObject
+from libero.libero.envs.objects.asset_cache import init_from_xml_template
 from libero.libero.envs.base_object import register_object
 from libero.libero.envs.objects import OBJECTS_DICT
 import re
@@ -15,7 +16,8 @@ class CustomXmlObject(MujocoXMLObject):
                 f"assets/custom_objects/{obj_name}/{obj_name}.xml",
             )
         
-        super().__init__(
+        init_from_xml_template(
+            self,
             xml_path,
             name=name,
             joints=joints,
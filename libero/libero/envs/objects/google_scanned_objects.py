@@ -9,6 +9,7 @@ import pathlib
 
 absolute_path = pathlib.Path(__file__).parent.parent.parent.absolute()
 
+from libero.libero.envs.objects.asset_cache import init_from_xml_template
 from libero.libero.envs.base_object import (
     register_visual_change_object,
     register_object,
@@ -17,7 +18,8 @@ from libero.libero.envs.base_object import (
 
 class GoogleScannedObject(MujocoXMLObject):
     def __init__(self, name, obj_name, joints=[dict(type="free", damping="0.0005")]):
-        super().__init__(
+        init_from_xml_template(
+            self,
             os.path.join(
                 str(absolute_path),
                 f"assets/stable_scanned_objects/{obj_name}/{obj_name}.xml",
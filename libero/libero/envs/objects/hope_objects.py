@@ -8,12 +8,14 @@ import pathlib
 
 absolute_path = pathlib.Path(__file__).parent.parent.parent.absolute()
 
+from libero.libero.envs.objects.asset_cache import init_from_xml_template
 from libero.libero.envs.base_object import register_object
 
 
 class HopeBaseObject(MujocoXMLObject):
     def __init__(self, name, obj_name):
-        super().__init__(
+        init_from_xml_template(
+            self,
             os.path.join(
                 str(absolute_path),
                 f"assets/stable_hope_objects/{obj_name}/{obj_name}.xml",
@@ -28,6 +28,25 @@ def eval_predicate_fn(predicate_fn_name, *args):
     return VALIDATE_PREDICATE_FN_DICT[predicate_fn_name](*args)
 
 
+def compile_predicate(state, object_states_dict):
+    """
+    Resolve a BDDL predicate state, e.g. ["on", "obj_1", "obj_2"], into a
+    function of no argument evaluating it on the object states.
+    """
+    predicate_fn_name = state[0]
+    assert predicate_fn_name in VALIDATE_PREDICATE_FN_DICT
+    args = [object_states_dict[object_name] for object_name in state[1:]]
+    return VALIDATE_PREDICATE_FN_DICT[predicate_fn_name].compile(*args)
+
+
+def compile_goal(goal_state, object_states_dict):
+    """
+    Compile a conjunction goal into a list of predicate functions, see
+    compile_predicate. The goal holds if all of them return True.
+    """
+    return [compile_predicate(state, object_states_dict) for state in goal_state]
+
+
 def get_predicate_fn_dict():
     return VALIDATE_PREDICATE_FN_DICT
 
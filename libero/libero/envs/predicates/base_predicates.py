@@ -1,3 +1,4 @@
+from functools import partial
 from typing import List
 
 
@@ -8,6 +9,10 @@ class Expression:
     def __call__(self):
         raise NotImplementedError
 
+    def compile(self, *args):
+        """Bind the arguments once, return a function of no argument that evaluates the predicate"""
+        return partial(self, *args)
+
 
 class UnaryAtomic(Expression):
     def __init__(self):
@@ -40,6 +45,9 @@ class TruePredicateFn(MultiarayAtomic):
     def __call__(self, *args):
         return True
 
+    def compile(self, *args):
+        return lambda: True
+
 
 class FalsePredicateFn(MultiarayAtomic):
     def __init__(self):
@@ -48,17 +56,28 @@ class FalsePredicateFn(MultiarayAtomic):
     def __call__(self, *args):
         return False
 
+    def compile(self, *args):
+        return lambda: False
+
 
 class InContactPredicateFn(BinaryAtomic):
     def __call__(self, arg1, arg2):
         return arg1.check_contact(arg2)
 
+    def compile(self, arg1, arg2):
+        return partial(arg1.check_contact, arg2)
+
 
 class In(BinaryAtomic):
     def __call__(self, arg1, arg2):
         # print("predicate In")
         return arg2.check_contact(arg1) and arg2.check_contain(arg1)
 
+    def compile(self, arg1, arg2):
+        check_contact = arg2.check_contact
+        check_contain = arg2.check_contain
+        return lambda: check_contact(arg1) and check_contain(arg1)
+
 
 class On(BinaryAtomic):
     def __call__(self, arg1, arg2):
@@ -76,6 +95,9 @@ class On(BinaryAtomic):
         #     else:
         #         return False
 
+    def compile(self, arg1, arg2):
+        return partial(arg2.check_ontop, arg1)
+
 
 class Up(BinaryAtomic):
     def __call__(self, arg1):
@@ -106,21 +128,38 @@ class Open(UnaryAtomic):
     def __call__(self, arg):
         return arg.is_open()
 
+    def compile(self, arg):
+        return arg.is_open
+
 
 class Close(UnaryAtomic):
     def __call__(self, arg):
         return arg.is_close()
 
+    def compile(self, arg):
+        return arg.is_close
+
 
 class TurnOn(UnaryAtomic):
     def __call__(self, arg):
         return arg.turn_on()
 
+    def compile(self, arg):
+        return arg.turn_on
+
 
 class TurnOff(UnaryAtomic):
     def __call__(self, arg):
         return arg.turn_off()
-    
+
+    def compile(self, arg):
+        return arg.turn_off
+
+
 class InRegion(BinaryAtomic):
     def __call__(self, arg1, arg2):
         return arg2.check_contain_xy(arg1)
+
+    def compile(self, arg1, arg2):
+        return partial(arg2.check_contain_xy, arg1)
+
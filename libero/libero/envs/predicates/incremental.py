@@ -0,0 +1,178 @@
+"""
+Incremental success checking: the goal predicates are only re-evaluated when
+one of their operands moved, otherwise their last truth value is reused.
+Enabled with the incremental_success_check flag of BDDLBaseDomain.
+"""
+import numpy as np
+
+from libero.libero.envs.predicates import compile_predicate
+
+
+def _span(start, size):
+    return list(range(start, start + size))
+
+
+class GoalOperandTracker:
+    """
+    Reads, at most once per sim step, everything the goal predicates depend
+    on: the pose of the bodies and sites of their operands, the qpos of
+    their joints, and the contacts between task objects.
+    """
+
+    def __init__(self, env, object_states):
+        self.env = env
+        body_ids = []
+        site_ids = []
+        qpos_addrs = []
+        operand_parts = []
+        for object_state in object_states:
+            if object_state.object_state_type == "site":
+                parts = [("site", len(site_ids))]
+                site_ids.append(object_state.site_id)
+            else:
+                parts = [("body", len(body_ids))]
+                body_ids.append(object_state.body_id)
+            if object_state.qpos_addrs is not None:
+                n_qpos = len(object_state.qpos_addrs)
+                parts.append(("qpos", len(qpos_addrs), n_qpos))
+                qpos_addrs.extend(object_state.qpos_addrs)
+            operand_parts.append(parts)
+
+        self.body_ids = np.array(body_ids, dtype=int)
+        self.site_ids = np.array(site_ids, dtype=int)
+        self.qpos_addrs = np.array(qpos_addrs, dtype=int)
+
+        # layout of the values vector, see values()
+        n_body, n_site = len(body_ids), len(site_ids)
+        offsets = {
+            "body_xpos": 0,
+            "body_xquat": 3 * n_body,
+            "site_xpos": 7 * n_body,
+            "site_xmat": 7 * n_body + 3 * n_site,
+            "qpos": 7 * n_body + 12 * n_site,
+        }
+        self.operand_index = []
+        for parts in operand_parts:
+            index = []
+            for part in parts:
+                if part[0] == "body":
+                    j = part[1]
+                    index += _span(offsets["body_xpos"] + 3 * j, 3)
+                    index += _span(offsets["body_xquat"] + 4 * j, 4)
+                elif part[0] == "site":
+                    j = part[1]
+                    index += _span(offsets["site_xpos"] + 3 * j, 3)
+                    index += _span(offsets["site_xmat"] + 9 * j, 9)
+                else:
+                    index += _span(offsets["qpos"] + part[1], part[2])
+            self.operand_index.append(np.array(index, dtype=int))
+
+        self._values = None
+        self.num_checks = 0
+        self.num_evaluations = 0
+
+    def invalidate(self):
+        self._values = None
+
+    def values(self):
+        if self._values is None:
+            data = self.env.sim.data
+            self._values = np.concatenate(
+                [
+                    data.body_xpos[self.body_ids].ravel(),
+                    data.body_xquat[self.body_ids].ravel(),
+                    data.site_xpos[self.site_ids].ravel(),
+                    data.site_xmat[self.site_ids].ravel(),
+                    data.qpos[self.qpos_addrs],
+                ]
+            )
+        return self._values
+
+    def contacts(self, owners):
+        """
+        The contacts between task objects that involve one of owners, the
+        contact indices of the operands (see BDDLBaseDomain.get_contact_pairs).
+        """
+        if len(owners) == 0:
+            return frozenset()
+        return frozenset(
+            pair
+            for pair in self.env.get_contact_pairs()
+            if pair[0] in owners or pair[1] in owners
+        )
+
+
+class IncrementalPredicate:
+    """
+    A compiled goal predicate that keeps its last truth value, and is only
+    evaluated again once one of its operands moved by more than tolerance
+    since that evaluation, or the contacts involving them changed.
+    """
+
+    def __init__(self, predicate, tracker, element_index, contact_owners, tolerance):
+        self.predicate = predicate
+        self.tracker = tracker
+        self.element_index = element_index
+        self.contact_owners = contact_owners
+        self.tolerance = tolerance
+        self.reset()
+
+    def reset(self):
+        self.value = None
+        self.ref_values = None
+        self.ref_contacts = None
+
+    def __call__(self):
+        self.tracker.num_checks += 1
+        values = self.tracker.values()[self.element_index]
+        contacts = self.tracker.contacts(self.contact_owners)
+        if (
+            self.value is None
+            or contacts != self.ref_contacts
+            or np.any(np.abs(values - self.ref_values) > self.tolerance)
+        ):
+            self.tracker.num_evaluations += 1
+            self.value = bool(self.predicate())
+            self.ref_values = values
+            self.ref_contacts = contacts
+        return self.value
+
+
+def compile_incremental_goal(env, goal_state, object_states_dict, tolerance):
+    """
+    Same as compile_goal, except that the predicates cache their truth value,
+    see IncrementalPredicate. Returns the predicates and the tracker of their
+    operands, which env invalidates whenever the sim moves.
+    """
+    operand_names = []
+    for state in goal_state:
+        for object_name in state[1:]:
+            if object_name not in operand_names:
+                operand_names.append(object_name)
+    tracker = GoalOperandTracker(
+        env, [object_states_dict[object_name] for object_name in operand_names]
+    )
+
+    predicates = []
+    for state in goal_state:
+        operands = [operand_names.index(object_name) for object_name in state[1:]]
+        element_index = np.concatenate(
+            [np.zeros(0, dtype=int)] + [tracker.operand_index[i] for i in operands]
+        )
+        contact_owners = set()
+        for object_name in state[1:]:
+            object_state = object_states_dict[object_name]
+            owner_name = getattr(object_state, "parent_name", object_name)
+            owner = env.get_contact_owner(owner_name)
+            if owner is not None:
+                contact_owners.add(owner)
+        predicates.append(
+            IncrementalPredicate(
+                compile_predicate(state, object_states_dict),
+                tracker,
+                element_index,
+                frozenset(contact_owners),
+                tolerance,
+            )
+        )
+    return predicates, tracker
@@ -1,8 +1,16 @@
-from .libero_tabletop_manipulation import Libero_Tabletop_Manipulation
-from .libero_coffee_table_manipulation import Libero_Coffee_Table_Manipulation
-from .libero_floor_manipulation import Libero_Floor_Manipulation
-from .libero_study_tabletop_manipulation import Libero_Study_Tabletop_Manipulation
-from .libero_living_room_tabletop_manipulation import (
-    Libero_Living_Room_Tabletop_Manipulation,
+import importlib
+
+from libero.libero.envs.registry_manifest import PROBLEM_MANIFEST
+
+# The problem modules are only imported once their problem is looked up in
+# TASK_MAPPING, or their class as an attribute of this package.
+__all__ = []
+_CLASS_MODULES = dict(
+    reversed(entry.split(":")) for entry in PROBLEM_MANIFEST.values()
 )
-from .libero_kitchen_tabletop_manipulation import Libero_Kitchen_Tabletop_Manipulation
+
+
+def __getattr__(name):
+    if name in _CLASS_MODULES:
+        return getattr(importlib.import_module(_CLASS_MODULES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
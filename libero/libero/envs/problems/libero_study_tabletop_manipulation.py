@@ -138,14 +138,10 @@ class Libero_Study_Tabletop_Manipulation(BDDLBaseDomain):
         """
         Check if the goal is achieved. Consider conjunction goals at the moment
         """
-        goal_state = self.parsed_problem["goal_state"]
-        result = True
-        for state in goal_state:
-            result = self._eval_predicate(state) and result
-        #     if not result:
-        #         return False
-        # return True
-        return result
+        for predicate in self.goal_predicates:
+            if not predicate():
+                return False
+        return True
 
     def _eval_predicate(self, state):
         if len(state) == 3:
@@ -169,25 +165,6 @@ class Libero_Study_Tabletop_Manipulation(BDDLBaseDomain):
     def _setup_references(self):
         super()._setup_references()
 
-    def _post_process(self):
-        super()._post_process()
-
-        self.set_visualization()
-
-    def set_visualization(self):
-        for object_name in self.visualization_sites_list:
-            for _, (site_name, site_visible) in (
-                self.get_object(object_name).object_properties["vis_site_names"].items()
-            ):
-                vis_g_id = self.sim.model.site_name2id(site_name)
-                if ((self.sim.model.site_rgba[vis_g_id][3] <= 0) and site_visible) or (
-                    (self.sim.model.site_rgba[vis_g_id][3] > 0) and not site_visible
-                ):
-                    # We toggle the alpha value
-                    self.sim.model.site_rgba[vis_g_id][3] = (
-                        1 - self.sim.model.site_rgba[vis_g_id][3]
-                    )
-
     def _setup_camera(self, mujoco_arena):
         mujoco_arena.set_camera(
             camera_name="agentview",
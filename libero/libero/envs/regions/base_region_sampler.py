@@ -11,6 +11,92 @@ from robosuite.utils.transform_utils import quat_multiply
 import robosuite.utils.transform_utils as T
 
 
+# total number of candidate positions drawn per object before giving up
+MAX_PLACEMENT_CANDIDATES = 5000
+# size of the first block of candidates, doubled for every subsequent block
+PLACEMENT_BLOCK_SIZE = 16
+
+
+def sample_valid_position(
+    sampler,
+    placed_objects,
+    obj,
+    range_radius,
+    offset_x,
+    offset_y,
+    object_z,
+):
+    """
+    Rejection-samples the (x, y) position of @obj within the regions of @sampler.
+    Candidates are drawn in blocks: a region index, then x and y uniformly within
+    that region, exactly as _sample_x / _sample_y would. Each block is checked
+    against all objects in @placed_objects at once, and the first valid candidate
+    is returned, so the returned position follows the same distribution as the
+    one-candidate-at-a-time loop.
+    Args:
+        sampler: a sampler with x_ranges, y_ranges and ensure_* attributes
+        placed_objects (dict): object names mapped to (pos, quat, MujocoObject)
+        obj (MujocoObject): the object being placed
+        range_radius (float): margin kept between the object center and the region boundary
+            when ensure_object_boundary_in_range is set
+        offset_x (float): added to the sampled x position
+        offset_y (float): added to the sampled y position
+        object_z (float): z position of the object
+    Returns:
+        None or 2-tuple: the sampled (x, y) position, None if no valid candidate was found
+    """
+    x_ranges = np.array(sampler.x_ranges, dtype=float).reshape(-1, 2)
+    y_ranges = np.array(sampler.y_ranges, dtype=float).reshape(-1, 2)
+    if sampler.ensure_object_boundary_in_range:
+        x_ranges = x_ranges + np.array([range_radius, -range_radius])
+        y_ranges = y_ranges + np.array([range_radius, -range_radius])
+
+    horizontal_radius = obj.horizontal_radius
+    bottom_offset = obj.bottom_offset
+    others = list(placed_objects.values()) if sampler.ensure_valid_placement else []
+    if len(others) > 0:
+        other_xy = np.array([pos[:2] for pos, _, _ in others], dtype=float)
+        min_dist = (
+            np.array([other.horizontal_radius for _, _, other in others])
+            + horizontal_radius
+        )
+        # the z condition does not depend on the candidate, only objects that
+        # are not entirely below this one can collide with it
+        blocking = np.array(
+            [
+                object_z - pos[2] <= other.top_offset[-1] - bottom_offset[-1]
+                for pos, _, other in others
+            ]
+        )
+        other_xy = other_xy[blocking]
+        min_dist = min_dist[blocking]
+    else:
+        other_xy = np.zeros((0, 2))
+        min_dist = np.zeros(0)
+
+    num_drawn = 0
+    block_size = PLACEMENT_BLOCK_SIZE
+    while num_drawn < MAX_PLACEMENT_CANDIDATES:
+        n = min(block_size, MAX_PLACEMENT_CANDIDATES - num_drawn)
+        idx = np.random.randint(sampler.num_ranges, size=n)
+        xs = np.random.uniform(low=x_ranges[idx, 0], high=x_ranges[idx, 1]) + offset_x
+        ys = np.random.uniform(low=y_ranges[idx, 0], high=y_ranges[idx, 1]) + offset_y
+        if len(min_dist) > 0:
+            dist = np.hypot(
+                xs[:, None] - other_xy[None, :, 0], ys[:, None] - other_xy[None, :, 1]
+            )
+            valid = np.all(dist > min_dist[None, :], axis=1)
+        else:
+            valid = np.ones(n, dtype=bool)
+        if valid.any():
+            i = int(np.argmax(valid))
+            sampler.idx = int(idx[i])
+            return float(xs[i]), float(ys[i])
+        num_drawn += n
+        block_size *= 2
+    return None
+
+
 class MultiRegionRandomSampler(ObjectPositionSampler):
     """
     Places all objects within the table uniformly random.
@@ -175,45 +261,34 @@ class MultiRegionRandomSampler(ObjectPositionSampler):
 
             horizontal_radius = obj.horizontal_radius
             bottom_offset = obj.bottom_offset
-            success = False
-            for i in range(5000):  # 5000 retries
-                self.idx = np.random.randint(self.num_ranges)
-                object_x = self._sample_x(horizontal_radius) + base_offset[0]
-                object_y = self._sample_y(horizontal_radius) + base_offset[1]
-                object_z = self.z_offset + base_offset[2]
-                if on_top:
-                    object_z -= bottom_offset[-1]
-
-                # objects cannot overlap
-                location_valid = True
-                if self.ensure_valid_placement:
-                    for (x, y, z), _, other_obj in placed_objects.values():
-                        if (
-                            np.linalg.norm((object_x - x, object_y - y))
-                            <= other_obj.horizontal_radius + horizontal_radius
-                        ) and (
-                            object_z - z <= other_obj.top_offset[-1] - bottom_offset[-1]
-                        ):
-                            location_valid = False
-                            break
-
-                if location_valid:
-                    # random rotation
-                    quat = self._sample_quat()
-
-                    # multiply this quat by the object's initial rotation if it has the attribute specified
-                    if hasattr(obj, "init_quat"):
-                        quat = quat_multiply(quat, obj.init_quat)
-
-                    # location is valid, put the object down
-                    pos = (object_x, object_y, object_z)
-                    placed_objects[obj.name] = (pos, quat, obj)
-                    success = True
-                    break
-
-            if not success:
+            object_z = self.z_offset + base_offset[2]
+            if on_top:
+                object_z -= bottom_offset[-1]
+
+            # objects cannot overlap
+            location = sample_valid_position(
+                self,
+                placed_objects,
+                obj,
+                horizontal_radius,
+                base_offset[0],
+                base_offset[1],
+                object_z,
+            )
+            if location is None:
                 raise RandomizationError("Cannot place all objects ):")
 
+            # random rotation
+            quat = self._sample_quat()
+
+            # multiply this quat by the object's initial rotation if it has the attribute specified
+            if hasattr(obj, "init_quat"):
+                quat = quat_multiply(quat, obj.init_quat)
+
+            # location is valid, put the object down
+            pos = (location[0], location[1], object_z)
+            placed_objects[obj.name] = (pos, quat, obj)
+
         return placed_objects
 
 
@@ -412,47 +487,37 @@ class SiteRegionRandomSampler(ObjectPositionSampler):
 
             horizontal_radius = obj.horizontal_radius
             bottom_offset = obj.bottom_offset
-            success = False
             site_x, site_y, site_z = T.quat2mat(
                 T.convert_quat(ref_quat, to="xyzw")
             ) @ sim.data.get_site_xpos(site_name)
-            for i in range(5000):  # 5000 retries
-                self.idx = np.random.randint(self.num_ranges)
-                object_x = self._sample_x(horizontal_radius) + base_offset[0] + site_x
-                object_y = self._sample_y(horizontal_radius) + base_offset[1] + site_y
-                object_z = self.z_offset + base_offset[2] + site_z
-                if on_top:
-                    object_z -= bottom_offset[-1]
-
-                # objects cannot overlap
-                location_valid = True
-                if self.ensure_valid_placement:
-                    for (x, y, z), _, other_obj in placed_objects.values():
-                        if (
-                            np.linalg.norm((object_x - x, object_y - y))
-                            <= other_obj.horizontal_radius + horizontal_radius
-                        ) and (
-                            object_z - z <= other_obj.top_offset[-1] - bottom_offset[-1]
-                        ):
-                            location_valid = False
-                            break
-
-                if location_valid:
-                    # random rotation
-                    quat = self._sample_quat()
-                    # multiply this quat by the object's initial rotation if it has the attribute specified
-                    if hasattr(obj, "init_quat"):
-                        quat = quat_multiply(quat, obj.init_quat)
-
-                    # location is valid, put the object down
-                    pos = (object_x, object_y, object_z)
-                    placed_objects[obj.name] = (pos, quat, obj)
-                    success = True
-                    break
-
-            if not success:
+            object_z = self.z_offset + base_offset[2] + site_z
+            if on_top:
+                object_z -= bottom_offset[-1]
+
+            # objects cannot overlap
+            location = sample_valid_position(
+                self,
+                placed_objects,
+                obj,
+                horizontal_radius,
+                base_offset[0] + site_x,
+                base_offset[1] + site_y,
+                object_z,
+            )
+            if location is None:
                 raise RandomizationError("Cannot place all objects ):")
 
+            # random rotation
+            quat = self._sample_quat()
+
+            # multiply this quat by the object's initial rotation if it has the attribute specified
+            if hasattr(obj, "init_quat"):
+                quat = quat_multiply(quat, obj.init_quat)
+
+            # location is valid, put the object down
+            pos = (location[0], location[1], object_z)
+            placed_objects[obj.name] = (pos, quat, obj)
+
         return placed_objects
 
 
@@ -619,51 +684,37 @@ class InSiteRegionRandomSampler(SiteRegionRandomSampler):
 
             horizontal_radius = obj.horizontal_radius
             bottom_offset = obj.bottom_offset
-            success = False
             site_x, site_y, site_z = T.quat2mat(
                 T.convert_quat(ref_quat, to="xyzw")
             ) @ sim.data.get_site_xpos(site_name)
-            for i in range(5000):  # 5000 retries
-                self.idx = np.random.randint(self.num_ranges)
-                object_x = self._sample_x(0) + base_offset[0] + site_x
-                object_y = self._sample_y(0) + base_offset[1] + site_y
-                object_z = self.z_offset + base_offset[2] + site_z
-                if on_top:
-                    object_z -= bottom_offset[-1]
-
-                # objects cannot overlap
-                location_valid = True
-                if self.ensure_valid_placement:
-                    for (x, y, z), _, other_obj in placed_objects.values():
-                        if (
-                            np.linalg.norm((object_x - x, object_y - y))
-                            <= other_obj.horizontal_radius + horizontal_radius
-                        ) and (
-                            object_z - z <= other_obj.top_offset[-1] - bottom_offset[-1]
-                        ):
-                            location_valid = False
-                            break
-
-                if location_valid:
-                    # random rotation
-                    quat = self._sample_quat()
-
-                    # multiply this quat by the object's initial rotation if it has the attribute specified
-                    if hasattr(obj, "init_quat"):
-                        quat = quat_multiply(quat, obj.init_quat)
-
-                    # location is valid, put the object down
-                    pos = (object_x, object_y, object_z)
-                    placed_objects[obj.name] = (pos, quat, obj)
-                    success = True
-                    break
-
-            if not success:
-                import pdb
-
-                pdb.set_trace()
+            object_z = self.z_offset + base_offset[2] + site_z
+            if on_top:
+                object_z -= bottom_offset[-1]
+
+            # objects cannot overlap
+            location = sample_valid_position(
+                self,
+                placed_objects,
+                obj,
+                0,
+                base_offset[0] + site_x,
+                base_offset[1] + site_y,
+                object_z,
+            )
+            if location is None:
                 raise RandomizationError("Cannot place all objects ):")
 
+            # random rotation
+            quat = self._sample_quat()
+
+            # multiply this quat by the object's initial rotation if it has the attribute specified
+            if hasattr(obj, "init_quat"):
+                quat = quat_multiply(quat, obj.init_quat)
+
+            # location is valid, put the object down
+            pos = (location[0], location[1], object_z)
+            placed_objects[obj.name] = (pos, quat, obj)
+
         return placed_objects
 
 
@@ -0,0 +1,95 @@
+"""
+Generated by scripts/generate_registry_manifest.py, do not edit.
+Maps the registered object categories and problem names to the
+"module:class" that registers them, see base_object.LazyRegistry.
+"""
+
+OBJECT_MODULES = [
+    "libero.libero.envs.objects.articulated_objects",
+    "libero.libero.envs.objects.custom_objects",
+    "libero.libero.envs.objects.google_scanned_objects",
+    "libero.libero.envs.objects.hope_objects",
+    "libero.libero.envs.objects.target_zones",
+    "libero.libero.envs.objects.turbosquid_objects",
+]
+
+OBJECT_MANIFEST = {
+    "akita_black_bowl": "libero.libero.envs.objects.google_scanned_objects:AkitaBlackBowl",
+    "alphabet_soup": "libero.libero.envs.objects.hope_objects:AlphabetSoup",
+    "basin_faucet": "libero.libero.envs.objects.articulated_objects:BasinFaucet",
+    "basket": "libero.libero.envs.objects.google_scanned_objects:Basket",
+    "bbq_sauce": "libero.libero.envs.objects.hope_objects:BbqSauce",
+    "black_book": "libero.libero.envs.objects.turbosquid_objects:BlackBook",
+    "bowl_drainer": "libero.libero.envs.objects.turbosquid_objects:BowlDrainer",
+    "bridge_brick": "libero.libero.envs.objects.custom_objects:BridgeBrick",
+    "bridge_platform": "libero.libero.envs.objects.custom_objects:BridgePlatform",
+    "butter": "libero.libero.envs.objects.hope_objects:Butter",
+    "chefmate_8_frypan": "libero.libero.envs.objects.google_scanned_objects:Chefmate8Frypan",
+    "cherries": "libero.libero.envs.objects.hope_objects:Cherries",
+    "chocolate_pudding": "libero.libero.envs.objects.hope_objects:ChocolatePudding",
+    "cookies": "libero.libero.envs.objects.hope_objects:Cookies",
+    "corn": "libero.libero.envs.objects.hope_objects:Corn",
+    "cream_cheese": "libero.libero.envs.objects.hope_objects:CreamCheese",
+    "desk_caddy": "libero.libero.envs.objects.turbosquid_objects:DeskCaddy",
+    "dining_set_group": "libero.libero.envs.objects.turbosquid_objects:DiningSetGroup",
+    "faucet": "libero.libero.envs.objects.articulated_objects:Faucet",
+    "flat_stove": "libero.libero.envs.objects.articulated_objects:FlatStove",
+    "glazed_rim_porcelain_ramekin": "libero.libero.envs.objects.google_scanned_objects:GlazedRimPorcelainRamekin",
+    "ketchup": "libero.libero.envs.objects.hope_objects:Ketchup",
+    "macaroni_and_cheese": "libero.libero.envs.objects.hope_objects:MacaroniAndCheese",
+    "mayo": "libero.libero.envs.objects.hope_objects:Mayo",
+    "maze_ball": "libero.libero.envs.objects.custom_objects:MazeBall",
+    "maze_structure": "libero.libero.envs.objects.custom_objects:MazeStructure",
+    "microwave": "libero.libero.envs.objects.articulated_objects:Microwave",
+    "milk": "libero.libero.envs.objects.hope_objects:Milk",
+    "moka_pot": "libero.libero.envs.objects.turbosquid_objects:MokaPot",
+    "new_salad_dressing": "libero.libero.envs.objects.hope_objects:NewSaladDressing",
+    "orange_juice": "libero.libero.envs.objects.hope_objects:OrangeJuice",
+    "plate": "libero.libero.envs.objects.google_scanned_objects:Plate",
+    "popcorn": "libero.libero.envs.objects.hope_objects:Popcorn",
+    "porcelain_mug": "libero.libero.envs.objects.turbosquid_objects:PorcelainMug",
+    "rack": "libero.libero.envs.objects.google_scanned_objects:Rack",
+    "red_coffee_mug": "libero.libero.envs.objects.turbosquid_objects:RedCoffeeMug",
+    "ring_stand": "libero.libero.envs.objects.custom_objects:RingStand",
+    "salad_dressing": "libero.libero.envs.objects.hope_objects:SaladDressing",
+    "short_cabinet": "libero.libero.envs.objects.articulated_objects:ShortCabinet",
+    "short_fridge": "libero.libero.envs.objects.articulated_objects:ShortFridge",
+    "slide_cabinet": "libero.libero.envs.objects.articulated_objects:SlideCabinet",
+    "target_zone": "libero.libero.envs.objects.target_zones:TargetZone",
+    "tomato_sauce": "libero.libero.envs.objects.hope_objects:TomatoSauce",
+    "torus_ring": "libero.libero.envs.objects.custom_objects:TorusRing",
+    "white_bowl": "libero.libero.envs.objects.google_scanned_objects:WhiteBowl",
+    "white_cabinet": "libero.libero.envs.objects.articulated_objects:WhiteCabinet",
+    "white_storage_box": "libero.libero.envs.objects.turbosquid_objects:WhiteStorageBox",
+    "white_yellow_mug": "libero.libero.envs.objects.turbosquid_objects:WhiteYellowMug",
+    "window": "libero.libero.envs.objects.articulated_objects:Window",
+    "wine_bottle": "libero.libero.envs.objects.turbosquid_objects:WineBottle",
+    "wine_rack": "libero.libero.envs.objects.turbosquid_objects:WineRack",
+    "wooden_cabinet": "libero.libero.envs.objects.articulated_objects:WoodenCabinet",
+    "wooden_shelf": "libero.libero.envs.objects.turbosquid_objects:WoodenShelf",
+    "wooden_tray": "libero.libero.envs.objects.turbosquid_objects:WoodenTray",
+    "wooden_two_layer_shelf": "libero.libero.envs.objects.turbosquid_objects:WoodenTwoLayerShelf",
+    "yellow_book": "libero.libero.envs.objects.turbosquid_objects:YellowBook",
+}
+
+VISUAL_CHANGE_OBJECTS = [
+    "flat_stove",
+]
+
+PROBLEM_MODULES = [
+    "libero.libero.envs.problems.libero_coffee_table_manipulation",
+    "libero.libero.envs.problems.libero_floor_manipulation",
+    "libero.libero.envs.problems.libero_kitchen_tabletop_manipulation",
+    "libero.libero.envs.problems.libero_living_room_tabletop_manipulation",
+    "libero.libero.envs.problems.libero_study_tabletop_manipulation",
+    "libero.libero.envs.problems.libero_tabletop_manipulation",
+]
+
+PROBLEM_MANIFEST = {
+    "libero_coffee_table_manipulation": "libero.libero.envs.problems.libero_coffee_table_manipulation:Libero_Coffee_Table_Manipulation",
+    "libero_floor_manipulation": "libero.libero.envs.problems.libero_floor_manipulation:Libero_Floor_Manipulation",
+    "libero_kitchen_tabletop_manipulation": "libero.libero.envs.problems.libero_kitchen_tabletop_manipulation:Libero_Kitchen_Tabletop_Manipulation",
+    "libero_living_room_tabletop_manipulation": "libero.libero.envs.problems.libero_living_room_tabletop_manipulation:Libero_Living_Room_Tabletop_Manipulation",
+    "libero_study_tabletop_manipulation": "libero.libero.envs.problems.libero_study_tabletop_manipulation:Libero_Study_Tabletop_Manipulation",
+    "libero_tabletop_manipulation": "libero.libero.envs.problems.libero_tabletop_manipulation:Libero_Tabletop_Manipulation",
+}
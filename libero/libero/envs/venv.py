@@ -60,6 +60,27 @@ GYM_RESERVED_KEYS = [
 ]
 
 
+class EnvWorkerError(RuntimeError):
+    """An env worker process died, or did not answer a command in time."""
+
+
+def _send_to(conn: connection.Connection, msg: Any) -> None:
+    try:
+        conn.send(msg)
+    except (BrokenPipeError, ConnectionResetError) as e:
+        raise EnvWorkerError("the env worker process died") from e
+
+
+def _recv_from(conn: connection.Connection, timeout: Optional[float] = None) -> Any:
+    """Receive from a worker, waiting at most timeout seconds if given."""
+    try:
+        if timeout is not None and not conn.poll(timeout):
+            raise EnvWorkerError(f"the env worker did not answer within {timeout} s")
+        return conn.recv()
+    except (EOFError, ConnectionResetError) as e:
+        raise EnvWorkerError("the env worker process died") from e
+
+
 ################################################################################
 #
 # Workers
@@ -156,6 +177,37 @@ class EnvWorker(ABC):
         """Given a list of workers, return those ready ones."""
         raise NotImplementedError
 
+    def send_command(self, cmd: str, data: Any = None) -> None:
+        """Send a control command to low-level worker.
+
+        ``cmd`` is one of "check_success", "get_sim_state",
+        "get_segmentation_of_interest", "set_init_state", "load_task" (with
+        the constructor kwargs of the new scene as ``data``) or "call" (with
+        ``data = (method_name, args)``). Like "send" and "recv", it is paired
+        with "recv_command", so that a vector env can send the command to all
+        workers first and gather the results afterwards.
+        """
+        raise NotImplementedError
+
+    def recv_command(self) -> Any:
+        """Receive the result of the last "send_command"."""
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        """Send the commands the worker buffered, if any, without waiting for
+        their results. A vector env flushes all the workers it sent commands
+        to before receiving the first result."""
+        pass
+
+    def respawn(self) -> Union[np.ndarray, Tuple[np.ndarray, dict]]:
+        """Replace a failed env by a new one and return its first observation."""
+        raise NotImplementedError
+
+    def fail(self, error: EnvWorkerError) -> None:
+        """Leave the env failed after its respawn failed, so that its next
+        command raises ``error`` and it is respawned again."""
+        pass
+
     def seed(self, seed: Optional[int] = None) -> Optional[List[int]]:
         # return self.action_space.seed(seed)  # issue 299
         pass
@@ -184,12 +236,11 @@ class ShArray:
         self.dtype = dtype
         self.shape = shape
 
-    def save(self, ndarray: np.ndarray) -> None:
-        assert isinstance(ndarray, np.ndarray)
-        dst = self.arr.get_obj()
-        dst_np = np.frombuffer(dst, dtype=self.dtype).reshape(
-            self.shape
-        )  # type: ignore
+    def save(self, ndarray: np.ndarray, index: Optional[int] = None) -> None:
+        """Copy ``ndarray`` into the buffer, or into row ``index`` of a batched one."""
+        dst_np = self.get()
+        if index is not None:
+            dst_np = dst_np[index]
         np.copyto(dst_np, ndarray)
 
     def get(self) -> np.ndarray:
@@ -208,17 +259,51 @@ def _setup_buf(space: gym.Space) -> Union[dict, tuple, ShArray]:
         return ShArray(space.dtype, space.shape)  # type: ignore
 
 
-def _worker(
-    parent: connection.Connection,
-    p: connection.Connection,
-    env_fn_wrapper: CloudpickleWrapper,
-    obs_bufs: Optional[Union[dict, tuple, ShArray]] = None,
-) -> None:
+def _setup_buf_from_obs(
+    obs: Union[dict, tuple, np.ndarray], batch_size: Optional[int] = None
+) -> Union[dict, tuple, ShArray]:
+    """Build the shared buffer layout from an example observation.
+
+    ``ControlEnv`` does not expose an ``observation_space``, so the layout is
+    inferred from the first observation it returns. If ``batch_size`` is given,
+    every leaf gets a leading ``(batch_size, ...)`` dimension so that all the
+    workers of a vector env write into one preallocated array per key.
+    """
+    if isinstance(obs, dict):
+        return {k: _setup_buf_from_obs(v, batch_size) for k, v in obs.items()}
+    elif isinstance(obs, tuple):
+        return tuple([_setup_buf_from_obs(o, batch_size) for o in obs])
+    else:
+        obs = np.asarray(obs)
+        shape = obs.shape if batch_size is None else (batch_size, *obs.shape)
+        return ShArray(obs.dtype, shape)
+
+
+def _buffer_view(
+    buffer: Union[dict, tuple, ShArray], index: Optional[int] = None
+) -> Union[dict, tuple, np.ndarray]:
+    """Return numpy views into the shared buffer (row ``index`` if batched)."""
+    if isinstance(buffer, ShArray):
+        arr = buffer.get()
+        return arr if index is None else arr[index]
+    elif isinstance(buffer, tuple):
+        return tuple([_buffer_view(b, index) for b in buffer])
+    elif isinstance(buffer, dict):
+        return {k: _buffer_view(v, index) for k, v in buffer.items()}
+    else:
+        raise NotImplementedError
+
+
+def _make_obs_store(
+    obs_bufs: Union[dict, tuple, ShArray], obs_index: Optional[int] = None
+) -> Callable[[Union[dict, tuple, np.ndarray]], Optional[tuple]]:
+    """Return the function writing the observations of an env into obs_bufs."""
+
     def _encode_obs(
         obs: Union[dict, tuple, np.ndarray], buffer: Union[dict, tuple, ShArray]
     ) -> None:
-        if isinstance(obs, np.ndarray) and isinstance(buffer, ShArray):
-            buffer.save(obs)
+        if isinstance(buffer, ShArray):
+            buffer.save(obs, obs_index)
         elif isinstance(obs, tuple) and isinstance(buffer, tuple):
             for o, b in zip(obs, buffer):
                 _encode_obs(o, b)
@@ -227,6 +312,104 @@ def _worker(
                 _encode_obs(obs[k], buffer[k])
         return None
 
+    def _store_obs(obs: Union[dict, tuple, np.ndarray]) -> Optional[tuple]:
+        """Write obs into the shared buffer, return what is left for the pipe.
+
+        ``None`` means the buffer holds the whole observation. After a
+        "load_task" the observation keys or shapes may differ from the ones
+        the buffer was laid out for (e.g. other objects in the scene), then the
+        matching keys still go through shared memory and the rest are returned
+        as ``(shared_keys, extra_obs)``.
+        """
+        if not isinstance(obs, dict):
+            _encode_obs(obs, obs_bufs)
+            return None
+        shared_keys, extra_obs = [], {}
+        for k, v in obs.items():
+            if k in buf_shapes and buf_shapes[k] in (None, np.shape(v)):
+                _encode_obs(v, obs_bufs[k])
+                shared_keys.append(k)
+            else:
+                extra_obs[k] = v
+        if len(extra_obs) == 0 and len(shared_keys) == len(buf_shapes):
+            return None
+        return shared_keys, extra_obs
+
+    buf_shapes: dict = {}
+    if isinstance(obs_bufs, dict):
+        for k, b in obs_bufs.items():
+            if not isinstance(b, ShArray):
+                buf_shapes[k] = None
+            else:
+                buf_shapes[k] = b.shape if obs_index is None else b.shape[1:]
+    return _store_obs
+
+
+def _run_command(
+    env: gym.Env,
+    cmd: str,
+    data: Any,
+    store_obs: Optional[Callable[[Any], Optional[tuple]]] = None,
+) -> Any:
+    """Run a command other than "close" and "setattr" on env, return the reply."""
+    if cmd == "step":
+        env_return = env.step(data)
+        if store_obs is not None:
+            env_return = (store_obs(env_return[0]), *env_return[1:])
+        return env_return
+    elif cmd == "reset":
+        retval = env.reset(**data)
+        reset_returns_info = (
+            isinstance(retval, (tuple, list))
+            and len(retval) == 2
+            and isinstance(retval[1], dict)
+        )
+        if reset_returns_info:
+            obs, info = retval
+        else:
+            obs = retval
+        if store_obs is not None:
+            obs = store_obs(obs)
+        if reset_returns_info:
+            return obs, info
+        return obs
+    elif cmd == "render":
+        return env.render(**data) if hasattr(env, "render") else None
+    elif cmd == "seed":
+        if hasattr(env, "seed"):
+            return env.seed(data)
+        env.reset(seed=data)
+        return None
+    elif cmd == "getattr":
+        return getattr(env, data) if hasattr(env, data) else None
+    elif cmd == "check_success":
+        return env.check_success()
+    elif cmd == "get_segmentation_of_interest":
+        return env.get_segmentation_of_interest(data)
+    elif cmd == "get_sim_state":
+        return env.get_sim_state()
+    elif cmd == "set_init_state":
+        obs = env.set_init_state(data)
+        if store_obs is not None:
+            obs = store_obs(obs)
+        return obs
+    elif cmd == "load_task":
+        return env.load_task(**data)
+    elif cmd == "call":
+        method, args = data
+        return getattr(env, method)(*args)
+    else:
+        raise NotImplementedError(cmd)
+
+
+def _worker(
+    parent: connection.Connection,
+    p: connection.Connection,
+    env_fn_wrapper: CloudpickleWrapper,
+    obs_bufs: Optional[Union[dict, tuple, ShArray]] = None,
+    obs_index: Optional[int] = None,
+) -> None:
+    store_obs = None if obs_bufs is None else _make_obs_store(obs_bufs, obs_index)
     parent.close()
     env = env_fn_wrapper.data()
     try:
@@ -236,58 +419,61 @@ def _worker(
             except EOFError:  # the pipe has been closed
                 p.close()
                 break
-            if cmd == "step":
-                env_return = env.step(data)
-                if obs_bufs is not None:
-                    _encode_obs(env_return[0], obs_bufs)
-                    env_return = (None, *env_return[1:])
-                p.send(env_return)
-            elif cmd == "reset":
-                retval = env.reset(**data)
-                reset_returns_info = (
-                    isinstance(retval, (tuple, list))
-                    and len(retval) == 2
-                    and isinstance(retval[1], dict)
-                )
-                if reset_returns_info:
-                    obs, info = retval
-                else:
-                    obs = retval
-                if obs_bufs is not None:
-                    _encode_obs(obs, obs_bufs)
-                    obs = None
-                if reset_returns_info:
-                    p.send((obs, info))
-                else:
-                    p.send(obs)
-            elif cmd == "close":
+            if cmd == "close":
                 p.send(env.close())
                 p.close()
                 break
-            elif cmd == "render":
-                p.send(env.render(**data) if hasattr(env, "render") else None)
-            elif cmd == "seed":
-                if hasattr(env, "seed"):
-                    p.send(env.seed(data))
-                else:
-                    env.reset(seed=data)
-                    p.send(None)
-            elif cmd == "getattr":
-                p.send(getattr(env, data) if hasattr(env, data) else None)
             elif cmd == "setattr":
                 setattr(env.unwrapped, data["key"], data["value"])
-            elif cmd == "check_success":
-                p.send(env.check_success())
-            elif cmd == "get_segmentation_of_interest":
-                p.send(env.get_segmentation_of_interest(data))
-            elif cmd == "get_sim_state":
-                p.send(env.get_sim_state())
-            elif cmd == "set_init_state":
-                obs = env.set_init_state(data)
-                p.send(obs)
             else:
-                p.close()
-                raise NotImplementedError
+                try:
+                    p.send(_run_command(env, cmd, data, store_obs))
+                except NotImplementedError:
+                    p.close()
+                    raise
+    except KeyboardInterrupt:
+        p.close()
+
+
+def _batch_worker(
+    parent: connection.Connection,
+    p: connection.Connection,
+    env_fn_wrappers: List[CloudpickleWrapper],
+    obs_bufs: Optional[Union[dict, tuple, ShArray]] = None,
+    obs_indices: Optional[List[int]] = None,
+) -> None:
+    """Host several envs in one process, see SubprocBatchEnvWorker.
+
+    Every message is ``[cmd, {env: data}]`` for some of the envs, which run
+    the command one after the other; the reply is ``{env: result}`` (without
+    the envs that were sent "setattr").
+    """
+    if obs_indices is None:
+        obs_indices = [None] * len(env_fn_wrappers)
+    store_fns = [
+        None if obs_bufs is None else _make_obs_store(obs_bufs, i)
+        for i in obs_indices
+    ]
+    parent.close()
+    envs = [fn.data() for fn in env_fn_wrappers]
+    open_envs = len(envs)
+    try:
+        while open_envs > 0:
+            try:
+                cmd, data = p.recv()
+            except EOFError:  # the pipe has been closed
+                break
+            results = {}
+            for i, d in data.items():
+                if cmd == "close":
+                    results[i] = envs[i].close()
+                    open_envs -= 1
+                elif cmd == "setattr":
+                    setattr(envs[i].unwrapped, d["key"], d["value"])
+                else:
+                    results[i] = _run_command(envs[i], cmd, d, store_fns[i])
+            p.send(results)
+        p.close()
     except KeyboardInterrupt:
         p.close()
 
@@ -337,6 +523,20 @@ class DummyEnvWorker(EnvWorker):
     def close_env(self) -> None:
         self.env.close()
 
+    def send_command(self, cmd: str, data: Any = None) -> None:
+        if cmd == "call":
+            method, args = data
+            self.result = getattr(self.env, method)(*args)
+        elif cmd in ["check_success", "get_sim_state"]:
+            self.result = getattr(self.env, cmd)()
+        elif cmd == "load_task":
+            self.result = self.env.load_task(**data)
+        else:
+            self.result = getattr(self.env, cmd)(data)
+
+    def recv_command(self) -> Any:
+        return self.result
+
     def check_success(self):
         return self.env.check_success()
 
@@ -354,49 +554,98 @@ class SubprocEnvWorker(EnvWorker):
     """Subprocess worker used in SubprocVectorEnv and ShmemVectorEnv."""
 
     def __init__(
-        self, env_fn: Callable[[], gym.Env], share_memory: bool = False
+        self,
+        env_fn: Callable[[], gym.Env],
+        share_memory: bool = False,
+        buffer: Optional[Union[dict, tuple, ShArray]] = None,
+        buffer_index: Optional[int] = None,
+        command_timeout: Optional[float] = None,
     ) -> None:
-        self.parent_remote, self.child_remote = Pipe()
+        """
+        :param buffer: a pre-built shared buffer, e.g. the batched one owned by
+            ``SubprocVectorEnv``. If ``None`` and ``share_memory`` is set, a
+            private buffer is built from a dummy env.
+        :param buffer_index: the row of a batched ``buffer`` this worker writes to.
+        :param command_timeout: the number of seconds the worker has to answer
+            a command before an ``EnvWorkerError`` is raised. Default to wait
+            forever.
+        """
         self.share_memory = share_memory
-        self.buffer: Optional[Union[dict, tuple, ShArray]] = None
-        if self.share_memory:
+        self.command_timeout = command_timeout
+        # the kwargs of the last "load_task", replayed by respawn
+        self._task_kwargs: Optional[dict] = None
+        self.buffer: Optional[Union[dict, tuple, ShArray]] = buffer
+        self.buffer_index = buffer_index
+        if self.share_memory and self.buffer is None:
             dummy = env_fn()
-            obs_space = dummy.observation_space
+            if hasattr(dummy, "observation_space"):
+                self.buffer = _setup_buf(dummy.observation_space)
+            else:
+                self.buffer = _setup_buf_from_obs(dummy.reset())
             dummy.close()
             del dummy
-            self.buffer = _setup_buf(obs_space)
+        # the decoded observation is a view into shared memory, so it is built once
+        self._obs_view = (
+            _buffer_view(self.buffer, self.buffer_index) if self.share_memory else None
+        )
+        self._start(env_fn)
+        super().__init__(env_fn)
+
+    def _start(self, env_fn: Callable[[], gym.Env]) -> None:
+        self.parent_remote, self.child_remote = Pipe()
         args = (
             self.parent_remote,
             self.child_remote,
             CloudpickleWrapper(env_fn),
             self.buffer,
+            self.buffer_index,
         )
         self.process = Process(target=_worker, args=args, daemon=True)
         self.process.start()
         self.child_remote.close()
-        super().__init__(env_fn)
+
+    def _send(self, msg: List[Any]) -> None:
+        _send_to(self.parent_remote, msg)
+
+    def _recv(self) -> Any:
+        return _recv_from(self.parent_remote, self.command_timeout)
+
+    def respawn(self) -> Union[np.ndarray, Tuple[np.ndarray, dict]]:
+        """Restart the worker process with a new env, reload the scene of the
+        last "load_task" if any, and return the observation of its reset."""
+        self.process.terminate()
+        self.process.join(timeout=10)
+        self.parent_remote.close()
+        self._start(self._env_fn)
+        if self._task_kwargs is not None:
+            self.send_command("load_task", self._task_kwargs)
+            self.recv_command()
+        return self.reset()
+
+    def fail(self, error: EnvWorkerError) -> None:
+        # a dead process fails every command, and a late answer of a hung one
+        # cannot be mistaken for the result of the next command
+        self.process.terminate()
 
     def get_env_attr(self, key: str) -> Any:
-        self.parent_remote.send(["getattr", key])
-        return self.parent_remote.recv()
+        self._send(["getattr", key])
+        return self._recv()
 
     def set_env_attr(self, key: str, value: Any) -> None:
-        self.parent_remote.send(["setattr", {"key": key, "value": value}])
-
-    def _decode_obs(self) -> Union[dict, tuple, np.ndarray]:
-        def decode_obs(
-            buffer: Optional[Union[dict, tuple, ShArray]]
-        ) -> Union[dict, tuple, np.ndarray]:
-            if isinstance(buffer, ShArray):
-                return buffer.get()
-            elif isinstance(buffer, tuple):
-                return tuple([decode_obs(b) for b in buffer])
-            elif isinstance(buffer, dict):
-                return {k: decode_obs(v) for k, v in buffer.items()}
-            else:
-                raise NotImplementedError
-
-        return decode_obs(self.buffer)
+        self._send(["setattr", {"key": key, "value": value}])
+
+    def _decode_obs(
+        self, remainder: Optional[tuple] = None
+    ) -> Union[dict, tuple, np.ndarray]:
+        # Views stay valid for the lifetime of the buffer, and are overwritten
+        # in place by the next step / reset of this worker.
+        if remainder is None:
+            return self._obs_view
+        # the observation layout changed after "load_task", see _store_obs
+        shared_keys, extra_obs = remainder
+        obs = {k: self._obs_view[k] for k in shared_keys}
+        obs.update(extra_obs)
+        return obs
 
     @staticmethod
     def wait(  # type: ignore
@@ -422,9 +671,9 @@ class SubprocEnvWorker(EnvWorker):
         if action is None:
             if "seed" in kwargs:
                 super().seed(kwargs["seed"])
-            self.parent_remote.send(["reset", kwargs])
+            self._send(["reset", kwargs])
         else:
-            self.parent_remote.send(["step", action])
+            self._send(["step", action])
 
     def recv(
         self,
@@ -434,79 +683,351 @@ class SubprocEnvWorker(EnvWorker):
         Tuple[np.ndarray, dict],
         np.ndarray,
     ]:  # noqa:E125
-        result = self.parent_remote.recv()
+        result = self._recv()
         if isinstance(result, tuple):
             if len(result) == 2:
                 obs, info = result
                 if self.share_memory:
-                    obs = self._decode_obs()
+                    obs = self._decode_obs(obs)
                 return obs, info
             obs = result[0]
             if self.share_memory:
-                obs = self._decode_obs()
+                obs = self._decode_obs(obs)
             return (obs, *result[1:])  # type: ignore
         else:
             obs = result
             if self.share_memory:
-                obs = self._decode_obs()
+                obs = self._decode_obs(obs)
             return obs
 
     def reset(self, **kwargs: Any) -> Union[np.ndarray, Tuple[np.ndarray, dict]]:
         if "seed" in kwargs:
             super().seed(kwargs["seed"])
-        self.parent_remote.send(["reset", kwargs])
+        self._send(["reset", kwargs])
 
-        result = self.parent_remote.recv()
+        result = self._recv()
         if isinstance(result, tuple):
             obs, info = result
             if self.share_memory:
-                obs = self._decode_obs()
+                obs = self._decode_obs(obs)
             return obs, info
         else:
             obs = result
             if self.share_memory:
-                obs = self._decode_obs()
+                obs = self._decode_obs(obs)
             return obs
 
     def seed(self, seed: Optional[int] = None) -> Optional[List[int]]:
         super().seed(seed)
-        self.parent_remote.send(["seed", seed])
-        ret = self.parent_remote.recv()
+        self._send(["seed", seed])
+        ret = self._recv()
         return ret
 
     def render(self, **kwargs: Any) -> Any:
-        self.parent_remote.send(["render", kwargs])
-        return self.parent_remote.recv()
+        self._send(["render", kwargs])
+        return self._recv()
 
     def close_env(self) -> None:
         try:
-            self.parent_remote.send(["close", None])
+            self._send(["close", None])
             # mp may be deleted so it may raise AttributeError
-            self.parent_remote.recv()
+            self._recv()
             self.process.join()
-        except (BrokenPipeError, EOFError, AttributeError):
+        except (EnvWorkerError, AttributeError):
             pass
         # ensure the subproc is terminated
         self.process.terminate()
 
+    def send_command(self, cmd: str, data: Any = None) -> None:
+        if cmd == "load_task":
+            self._task_kwargs = data
+        self._send([cmd, data])
+
+    def recv_command(self) -> Any:
+        return self._recv()
+
     def check_success(self):
-        self.parent_remote.send(["check_success", None])
-        return self.parent_remote.recv()
+        self.send_command("check_success")
+        return self.recv_command()
 
     def get_segmentation_of_interest(self, segmentation_image):
-        self.parent_remote.send(["get_segmentation_of_interest", segmentation_image])
-        return self.parent_remote.recv()
+        self.send_command("get_segmentation_of_interest", segmentation_image)
+        return self.recv_command()
 
     def get_sim_state(self):
-        self.parent_remote.send(["get_sim_state", None])
-        return self.parent_remote.recv()
+        self.send_command("get_sim_state")
+        return self.recv_command()
 
     def set_init_state(self, init_state):
-        self.parent_remote.send(["set_init_state", init_state])
-        obs = self.parent_remote.recv()
-        if self.share_memory:
-            obs = self._decode_obs()
-        return obs
+        self.send_command("set_init_state", init_state)
+        # the result of "set_init_state" is an observation
+        return self.recv()
+
+
+class _EnvProcess:
+    """A process hosting several envs, shared by their SubprocBatchEnvWorker.
+
+    The commands sent to the envs are queued, and all the queued commands
+    (which are the same command for different envs) go through the pipe in
+    one message when the workers are flushed, or as soon as a result is
+    needed. A vector env sends a command to all its workers and flushes them
+    before gathering the results, so all the processes step at the same time
+    and the envs of a process get one message per step instead of one each.
+
+    If the process dies or does not answer within command_timeout seconds,
+    all its envs are marked as failed: their pending and next results raise
+    an ``EnvWorkerError`` until each of them is respawned.
+    """
+
+    def __init__(
+        self,
+        env_fns: List[Callable[[], gym.Env]],
+        buffer: Optional[Union[dict, tuple, ShArray]] = None,
+        buffer_indices: Optional[List[int]] = None,
+        command_timeout: Optional[float] = None,
+    ) -> None:
+        self.env_fns = env_fns
+        self.buffer = buffer
+        self.buffer_indices = buffer_indices
+        self.command_timeout = command_timeout
+        self.env_num = len(env_fns)
+        self.open_envs = len(env_fns)
+        self._failed: dict = {}
+        self._start()
+
+    def _start(self) -> None:
+        self.parent_remote, self.child_remote = Pipe()
+        args = (
+            self.parent_remote,
+            self.child_remote,
+            [CloudpickleWrapper(fn) for fn in self.env_fns],
+            self.buffer,
+            self.buffer_indices,
+        )
+        self.process = Process(target=_batch_worker, args=args, daemon=True)
+        self.process.start()
+        self.child_remote.close()
+        self._cmd: Optional[str] = None
+        self._pending: dict = {}
+        self._results: dict = {}
+        self.in_flight = False
+        self._restart = False
+
+    def fail(self, error: EnvWorkerError) -> None:
+        """Kill the process, its envs fail until they are respawned."""
+        self.process.terminate()
+        self._failed = {i: error for i in range(self.env_num)}
+        self._pending = {}
+        self._results = {}
+        self.in_flight = False
+        self._restart = True
+
+    def respawn_env(self, index: int) -> None:
+        """Restart the process if it failed, and mark env index as usable.
+
+        The restarted process builds all its envs from scratch, they still
+        have to be respawned one by one to reload their scene.
+        """
+        if index not in self._failed:
+            self.fail(EnvWorkerError(f"env {index} is respawned"))
+        if self._restart:
+            self.process.join(timeout=10)
+            self.parent_remote.close()
+            self._start()
+        del self._failed[index]
+
+    def is_failed(self, index: int) -> bool:
+        return index in self._failed
+
+    def mark_failed(self, index: int, error: EnvWorkerError) -> None:
+        """Fail env index alone, its next result raises error."""
+        self._failed.setdefault(index, error)
+        self._pending.pop(index, None)
+        self._results.pop(index, None)
+
+    def queue(self, index: int, cmd: str, data: Any) -> None:
+        if index in self._failed:
+            return
+        if len(self._pending) > 0 and (cmd != self._cmd or index in self._pending):
+            self.flush()
+        self._cmd = cmd
+        self._pending[index] = data
+
+    def flush(self) -> None:
+        """Send the queued commands, after the results of the previous ones."""
+        if len(self._pending) == 0:
+            return
+        self.receive()
+        try:
+            _send_to(self.parent_remote, [self._cmd, self._pending])
+        except EnvWorkerError as e:
+            self.fail(e)
+            raise
+        self._pending = {}
+        self.in_flight = True
+
+    def receive(self) -> None:
+        if self.in_flight:
+            self.in_flight = False
+            try:
+                self._results.update(
+                    _recv_from(self.parent_remote, self.command_timeout)
+                )
+            except EnvWorkerError as e:
+                self.fail(e)
+                raise
+
+    def has_result(self, index: int) -> bool:
+        return index in self._results or index in self._failed
+
+    def result(self, index: int) -> Any:
+        if index not in self._results and index not in self._failed:
+            try:
+                self.flush()
+                self.receive()
+            except EnvWorkerError:
+                pass
+        if index in self._failed:
+            raise self._failed[index]
+        return self._results.pop(index)
+
+    def close_env(self) -> None:
+        self.open_envs -= 1
+        if self.open_envs == 0:
+            self.process.join(timeout=None if len(self._failed) == 0 else 10)
+
+
+class _EnvProcessConnection:
+    """The end of the pipe of an env hosted by an _EnvProcess."""
+
+    def __init__(self, env_process: _EnvProcess, index: int) -> None:
+        self.env_process = env_process
+        self.index = index
+
+    def send(self, msg: List[Any]) -> None:
+        cmd, data = msg
+        self.env_process.queue(self.index, cmd, data)
+
+    def recv(self) -> Any:
+        return self.env_process.result(self.index)
+
+
+class SubprocBatchEnvWorker(SubprocEnvWorker):
+    """Worker of an env hosted with other envs in one process.
+
+    It behaves like SubprocEnvWorker, but the pipe it talks to is shared with
+    the other envs of its _EnvProcess, which batches their commands. When the
+    process fails, all its envs have to be respawned.
+    """
+
+    def __init__(
+        self,
+        env_fn: Callable[[], gym.Env],
+        env_process: _EnvProcess,
+        index: int,
+        share_memory: bool = False,
+        buffer: Optional[Union[dict, tuple, ShArray]] = None,
+        buffer_index: Optional[int] = None,
+    ) -> None:
+        """
+        :param env_process: the process hosting the env, built with env_fn
+            at position ``index`` of its envs.
+        :param buffer: the batched shared buffer the process writes to, if
+            ``share_memory`` is set.
+        :param buffer_index: the row of ``buffer`` of this env.
+        """
+        self.env_process = env_process
+        self.parent_remote = _EnvProcessConnection(env_process, index)
+        self.share_memory = share_memory
+        self.command_timeout = env_process.command_timeout
+        self._task_kwargs = None
+        self.buffer = buffer
+        self.buffer_index = buffer_index
+        self._obs_view = (
+            _buffer_view(self.buffer, self.buffer_index) if self.share_memory else None
+        )
+        EnvWorker.__init__(self, env_fn)
+
+    @property
+    def process(self) -> Process:
+        return self.env_process.process
+
+    def _send(self, msg: List[Any]) -> None:
+        self.parent_remote.send(msg)
+
+    def _recv(self) -> Any:
+        # the timeout is handled by the env process
+        return self.parent_remote.recv()
+
+    def respawn(self) -> Union[np.ndarray, Tuple[np.ndarray, dict]]:
+        self.env_process.respawn_env(self.parent_remote.index)
+        if self._task_kwargs is not None:
+            self.send_command("load_task", self._task_kwargs)
+            self.recv_command()
+        return self.reset()
+
+    def set_env_attr(self, key: str, value: Any) -> None:
+        self._send(["setattr", {"key": key, "value": value}])
+        self.env_process.flush()
+
+    def fail(self, error: EnvWorkerError) -> None:
+        # the other envs of the process are failed by the process itself if
+        # it died
+        self.env_process.mark_failed(self.parent_remote.index, error)
+
+    def flush(self) -> None:
+        try:
+            self.env_process.flush()
+        except EnvWorkerError:
+            # the failure is raised by the result of the env
+            pass
+
+    @staticmethod
+    def wait(  # type: ignore
+        workers: List["SubprocBatchEnvWorker"],
+        wait_num: int,
+        timeout: Optional[float] = None,
+    ) -> List["SubprocBatchEnvWorker"]:
+        env_processes = list(
+            {id(w.env_process): w.env_process for w in workers}.values()
+        )
+        for env_process in env_processes:
+            try:
+                env_process.flush()
+            except EnvWorkerError:
+                pass
+        remain_time, t1 = timeout, time.time()
+        while True:
+            ready = [
+                w for w in workers if w.env_process.has_result(w.parent_remote.index)
+            ]
+            remain = [p for p in env_processes if p.in_flight]
+            if len(ready) >= wait_num or len(remain) == 0:
+                return ready
+            if timeout:
+                remain_time = timeout - (time.time() - t1)
+                if remain_time <= 0:
+                    return ready
+            ready_conns = connection.wait(
+                [p.parent_remote for p in remain], timeout=remain_time
+            )
+            for env_process in remain:
+                if env_process.parent_remote in ready_conns:
+                    try:
+                        env_process.receive()
+                    except EnvWorkerError:
+                        pass
+
+    def close_env(self) -> None:
+        try:
+            self._send(["close", None])
+            self._recv()
+        except (EnvWorkerError, AttributeError):
+            pass
+        self.env_process.close_env()
+        if self.env_process.open_envs == 0:
+            # ensure the subproc is terminated
+            self.process.terminate()
 
 
 ################################################################################
@@ -565,6 +1086,17 @@ class BaseVectorEnv(object):
     :param float timeout: use in asynchronous simulation same as above, in each
         vectorized step it only deal with those environments spending time
         within ``timeout`` seconds.
+    :param float command_timeout: the number of seconds a worker has to answer
+        a command before it is considered hung. Default to wait forever.
+    :param bool auto_respawn: if True, a worker that died or hung is replaced
+        by a new one (see ``EnvWorker.respawn``) instead of raising an
+        ``EnvWorkerError``. Its env is reset, so its result is the first
+        observation of the new env for "reset", "step" (with a zero reward,
+        ``done=False`` and a ``worker_failure`` entry in its info) and
+        "set_init_state", and ``None`` for the other commands. The failures
+        are recorded until ``pop_worker_failures`` is called, so that the
+        caller can restart the episodes of these envs. The envs that share a
+        process with a failed one are recorded along with it.
     """
 
     def __init__(
@@ -573,6 +1105,8 @@ class BaseVectorEnv(object):
         worker_fn: Callable[[Callable[[], gym.Env]], EnvWorker],
         wait_num: Optional[int] = None,
         timeout: Optional[float] = None,
+        command_timeout: Optional[float] = None,
+        auto_respawn: bool = False,
     ) -> None:
         self._env_fns = env_fns
         # A VectorEnv contains a pool of EnvWorkers, which corresponds to
@@ -601,6 +1135,14 @@ class BaseVectorEnv(object):
         # all environments are ready in the beginning
         self.ready_id = list(range(self.env_num))
         self.is_closed = False
+        self.command_timeout = command_timeout
+        self.auto_respawn = auto_respawn
+        self.worker_failures: dict = {}
+        # the last observation of every env, which stands in for the first
+        # one of an env whose respawn failed
+        self._last_obs: dict = {}
+        # the envs whose results _gather is receiving
+        self._gathering: List[int] = []
 
     def _assert_is_not_closed(self) -> None:
         assert (
@@ -670,6 +1212,73 @@ class BaseVectorEnv(object):
         for j in id:
             self.workers[j].set_env_attr(key, value)
 
+    def pop_worker_failures(self) -> dict:
+        """Return the envs whose worker was respawned since the last call, as
+        a dict from their index to the error, and forget them."""
+        failures, self.worker_failures = self.worker_failures, {}
+        return failures
+
+    def _respawn(self, env_id: int, error: EnvWorkerError) -> Any:
+        """Respawn a failed worker if auto_respawn is set, otherwise raise.
+
+        If the respawn fails too, the failure is recorded and the env is left
+        failed: its next command fails and respawns it again. Its last
+        observation (or that of another env) then stands in for the first
+        observation of the new env.
+        """
+        if not self.auto_respawn:
+            raise error
+        warnings.warn(f"env worker {env_id} failed ({error}), respawning it")
+        self.worker_failures[env_id] = str(error)
+        try:
+            return self.workers[env_id].respawn()
+        except Exception as e:
+            warnings.warn(f"env worker {env_id} could not be respawned ({e!r})")
+            self.worker_failures[env_id] = f"{error}, then respawn failed: {e!r}"
+            self.workers[env_id].fail(
+                e if isinstance(e, EnvWorkerError) else EnvWorkerError(repr(e))
+            )
+            if env_id in self._last_obs:
+                return self._last_obs[env_id]
+            if len(self._last_obs) == 0:
+                # no env ever answered, there is nothing to go on with
+                raise
+            return next(iter(self._last_obs.values()))
+
+    def _send(self, env_id: int, send: Callable[[EnvWorker], None]) -> None:
+        try:
+            send(self.workers[env_id])
+        except EnvWorkerError:
+            # a dead worker fails again on recv, where it is respawned
+            if not self.auto_respawn:
+                raise
+
+    def _gather(
+        self,
+        id: Union[List[int], np.ndarray],
+        recv: Callable[[EnvWorker], Any],
+        on_failure: Callable[[int, Any], Any],
+    ) -> List[Any]:
+        """Receive the results of the workers at indices id. The result of a
+        respawned worker is on_failure(env_id, first observation of its env)."""
+        # the envs of all the processes run while the results are received
+        for j in id:
+            self.workers[j].flush()
+        results = []
+        self._gathering = list(id)
+        try:
+            for j in id:
+                try:
+                    results.append(recv(self.workers[j]))
+                except EnvWorkerError as e:
+                    results.append(on_failure(j, self._respawn(j, e)))
+        finally:
+            self._gathering = []
+        return results
+
+    def _failed_step(self, env_id: int, obs: Any) -> tuple:
+        return obs, 0.0, False, {"worker_failure": self.worker_failures[env_id]}
+
     def _wrap_id(
         self,
         id: Optional[Union[int, List[int], np.ndarray]] = None,
@@ -705,8 +1314,8 @@ class BaseVectorEnv(object):
 
         # send(None) == reset() in worker
         for i in id:
-            self.workers[i].send(None, **kwargs)
-        ret_list = [self.workers[i].recv() for i in id]
+            self._send(i, lambda w: w.send(None, **kwargs))
+        ret_list = self._gather(id, lambda w: w.recv(), lambda j, obs: obs)
 
         reset_returns_info = (
             isinstance(ret_list[0], (tuple, list))
@@ -723,10 +1332,7 @@ class BaseVectorEnv(object):
                 "Tuple observation space is not supported. ",
                 "Please change it to array or dict space",
             )
-        try:
-            obs = np.stack(obs_list)
-        except ValueError:  # different len(obs)
-            obs = np.array(obs_list, dtype=object)
+        obs = self._stack_obs(obs_list, id)
 
         if reset_returns_info:
             infos = [r[1] for r in ret_list]
@@ -788,26 +1394,28 @@ class BaseVectorEnv(object):
         if not self.is_async:
             assert len(action) == len(id)
             for i, j in enumerate(id):
-                self.workers[j].send(action[i])
-            result = []
-            for j in id:
-                env_return = self.workers[j].recv()
+                self._send(j, lambda w: w.send(action[i]))
+            result = self._gather(id, lambda w: w.recv(), self._failed_step)
+            for j, env_return in zip(id, result):
                 env_return[-1]["env_id"] = j
-                result.append(env_return)
         else:
             if action is not None:
-                self._assert_id(id)
-                assert len(action) == len(id)
-                for act, env_id in zip(action, id):
-                    self.workers[env_id].send(act)
-                    self.waiting_conn.append(self.workers[env_id])
-                    self.waiting_id.append(env_id)
-                self.ready_id = [x for x in self.ready_id if x not in id]
+                self.step_async(action, id)
             ready_conns: List[EnvWorker] = []
+            hung = False
+            t0 = time.time()
             while not ready_conns:
+                timeout = self.timeout
+                if self.command_timeout is not None:
+                    remain_time = self.command_timeout - (time.time() - t0)
+                    timeout = max(min(timeout or remain_time, remain_time), 1e-3)
                 ready_conns = self.worker_class.wait(
-                    self.waiting_conn, self.wait_num, self.timeout
+                    self.waiting_conn, self.wait_num, timeout
                 )
+                if not ready_conns and self.command_timeout is not None:
+                    if time.time() - t0 >= self.command_timeout:
+                        # none of the stepping workers answered in time
+                        ready_conns, hung = list(self.waiting_conn), True
             result = []
             for conn in ready_conns:
                 waiting_index = self.waiting_conn.index(conn)
@@ -815,19 +1423,67 @@ class BaseVectorEnv(object):
                 env_id = self.waiting_id.pop(waiting_index)
                 # env_return can be (obs, reward, done, info) or
                 # (obs, reward, terminated, truncated, info)
-                env_return = conn.recv()
+                try:
+                    if hung:
+                        raise EnvWorkerError(
+                            "the env worker did not answer within"
+                            + f" {self.command_timeout} s"
+                        )
+                    env_return = conn.recv()
+                except EnvWorkerError as e:
+                    env_return = self._failed_step(
+                        env_id, self._respawn(env_id, e)
+                    )
                 env_return[-1]["env_id"] = env_id  # Add `env_id` to info
                 result.append(env_return)
                 self.ready_id.append(env_id)
         return_lists = tuple(zip(*result))
         obs_list = return_lists[0]
-        try:
-            obs_stack = np.stack(obs_list)
-        except ValueError:  # different len(obs)
-            obs_stack = np.array(obs_list, dtype=object)
+        obs_stack = self._stack_obs(
+            obs_list, [env_return[-1]["env_id"] for env_return in result]
+        )
         other_stacks = map(np.stack, return_lists[1:])
         return (obs_stack, *other_stacks)  # type: ignore
 
+    def step_async(
+        self,
+        action: np.ndarray,
+        id: Optional[Union[int, List[int], np.ndarray]] = None,
+    ) -> None:
+        """Send a batch of action to the envs with the given id and return
+        without waiting for the results (async simulation only). The envs
+        start stepping right away, and step(None) fetches the results."""
+        self._assert_is_not_closed()
+        assert self.is_async, "step_async() needs wait_num or timeout."
+        id = self._wrap_id(id)
+        self._assert_id(id)
+        assert len(action) == len(id)
+        for act, env_id in zip(action, id):
+            self._send(env_id, lambda w: w.send(act))
+            self.waiting_conn.append(self.workers[env_id])
+            self.waiting_id.append(env_id)
+        self.ready_id = [x for x in self.ready_id if x not in id]
+        for env_id in id:
+            self.workers[env_id].flush()
+
+    def _stack_obs(
+        self, obs_list: List[Any], id: Union[List[int], np.ndarray]
+    ) -> np.ndarray:
+        """Batch the observations returned by the workers at indices id."""
+        self._last_obs.update(zip(id, obs_list))
+        try:
+            return np.stack(obs_list)
+        except ValueError:  # different len(obs)
+            return np.array(obs_list, dtype=object)
+
+    def get_obs_batch(
+        self, id: Optional[Union[int, List[int], np.ndarray]] = None
+    ) -> Optional[dict]:
+        """The last observations of the envs id as one ``(len(id), ...)``
+        array per key, without stacking them, or None if they are not
+        available in that form (see ``SubprocVectorEnv``)."""
+        return None
+
     def seed(
         self,
         seed: Optional[Union[int, List[int]]] = None,
@@ -861,40 +1517,79 @@ class BaseVectorEnv(object):
             )
         return [w.render(**kwargs) for w in self.workers]
 
-    def close(self) -> None:
-        """Close all of the environments.
-
-        This function will be called only once (if not, it will be called during
-        garbage collected). This way, ``close`` of all workers can be assured.
-        """
+    def _send_commands(
+        self,
+        cmd: str,
+        data: List[Any],
+        id: Union[List[int], np.ndarray],
+    ) -> None:
+        """Send ``cmd`` with ``data[j]`` to the worker ``id[j]`` without waiting."""
         self._assert_is_not_closed()
-        for w in self.workers:
-            w.close()
-        self.is_closed = True
+        if self.is_async:
+            self._assert_id(id)
+        assert len(data) == len(id)
+        for j, i in enumerate(id):
+            self._send(i, lambda w: w.send_command(cmd, data[j]))
 
+    def _fan_out(
+        self,
+        cmd: str,
+        data: Optional[List[Any]] = None,
+        id: Optional[Union[int, List[int], np.ndarray]] = None,
+    ) -> List[Any]:
+        """Send a control command to all the workers, then gather all the results.
 
-class DummyVectorEnv(BaseVectorEnv):
-    """Dummy vectorized environment wrapper, implemented in for-loop.
+        The envs execute the command in parallel, so the latency is that of the
+        slowest worker rather than the sum over all workers.
+        """
+        id = self._wrap_id(id)
+        if data is None:
+            data = [None] * len(id)
+        self._send_commands(cmd, data, id)
+        return self._gather(id, lambda w: w.recv_command(), lambda j, obs: None)
 
-    .. seealso::
+    def call(
+        self,
+        method: str,
+        args_per_env: Optional[List[Any]] = None,
+        id: Optional[Union[int, List[int], np.ndarray]] = None,
+    ) -> List[Any]:
+        """Call ``method`` of the underlying environments in parallel.
 
-        Please refer to :class:`~tianshou.env.BaseVectorEnv` for other APIs' usage.
-    """
+        :param str method: the name of the env method to call.
+        :param args_per_env: a list with the positional arguments of each call,
+            as a tuple (or a single non-tuple argument). Default to no arguments.
+        :param id: Indice(s) of the desired worker(s). Default to None for all env_id.
 
-    def __init__(self, env_fns: List[Callable[[], gym.Env]], **kwargs: Any) -> None:
-        super().__init__(env_fns, DummyEnvWorker, **kwargs)
+        :return list: The list of return values, ordered correspondingly to id.
+        """
+        id = self._wrap_id(id)
+        if args_per_env is None:
+            args_per_env = [()] * len(id)
+        data = [
+            (method, args if isinstance(args, tuple) else (args,))
+            for args in args_per_env
+        ]
+        return self._fan_out("call", data, id)
 
-    def check_success(self):
-        return [w.check_success() for w in self.workers]
+    def check_success(
+        self, id: Optional[Union[int, List[int], np.ndarray]] = None
+    ) -> List[bool]:
+        return self._fan_out("check_success", id=id)
 
-    def get_segmentation_of_interest(self, segmentation_images):
-        return [
-            w.get_segmentation_of_interest(img)
-            for w, img in zip(self.workers, segmentation_images)
-        ]
+    def get_segmentation_of_interest(
+        self,
+        segmentation_images: List[np.ndarray],
+        id: Optional[Union[int, List[int], np.ndarray]] = None,
+    ) -> List[np.ndarray]:
+        return self._fan_out(
+            "get_segmentation_of_interest", list(segmentation_images), id=id
+        )
 
-    def get_sim_state(self):
-        return [w.get_sim_state() for w in self.workers]
+    def get_sim_state(
+        self, id: Optional[Union[int, List[int], np.ndarray]] = None
+    ) -> List[np.ndarray]:
+        return self._fan_out("get_sim_state", id=id)
 
     def set_init_state(
         self,
@@ -907,22 +1602,45 @@ class DummyVectorEnv(BaseVectorEnv):
         initial observations, otherwise reset the specific environments with
         the given id, either an int or a list.
         """
-        self._assert_is_not_closed()
         id = self._wrap_id(id)
-        if self.is_async:
-            self._assert_id(id)
+        self._send_commands("set_init_state", list(init_state), id)
+        # the result of "set_init_state" is an observation
+        obs_list = self._gather(id, lambda w: w.recv(), lambda j, obs: obs)
+        return self._stack_obs(obs_list, id)
 
-        # send(None) == reset() in worker
-        obs_list = []
-        for j, i in enumerate(id):
-            obs = self.workers[i].set_init_state(init_state[j])
-            obs_list.append(obs)
-        obs = np.stack(obs_list)
-        return obs
+    def load_task(
+        self,
+        task_kwargs: Union[dict, List[dict]],
+        id: Optional[Union[int, List[int], np.ndarray]] = None,
+    ) -> None:
+        """Rebuild the scene of some envs in place, keeping their workers.
 
+        The worker processes, with their imports, stay alive, so switching
+        tasks only costs building the new MuJoCo model.
 
-class SubprocVectorEnv(BaseVectorEnv):
-    """Vectorized environment wrapper based on subprocess.
+        :param task_kwargs: the constructor kwargs of the new scene (e.g.
+            ``bddl_file_name``, ``camera_heights``, ``camera_widths``), either
+            one dict for all the envs or a list with one dict per env in id.
+        """
+        id = self._wrap_id(id)
+        if isinstance(task_kwargs, dict):
+            task_kwargs = [task_kwargs] * len(id)
+        self._fan_out("load_task", list(task_kwargs), id)
+
+    def close(self) -> None:
+        """Close all of the environments.
+
+        This function will be called only once (if not, it will be called during
+        garbage collected). This way, ``close`` of all workers can be assured.
+        """
+        self._assert_is_not_closed()
+        for w in self.workers:
+            w.close()
+        self.is_closed = True
+
+
+class DummyVectorEnv(BaseVectorEnv):
+    """Dummy vectorized environment wrapper, implemented in for-loop.
 
     .. seealso::
 
@@ -930,43 +1648,147 @@ class SubprocVectorEnv(BaseVectorEnv):
     """
 
     def __init__(self, env_fns: List[Callable[[], gym.Env]], **kwargs: Any) -> None:
-        def worker_fn(fn: Callable[[], gym.Env]) -> SubprocEnvWorker:
-            return SubprocEnvWorker(fn, share_memory=False)
+        super().__init__(env_fns, DummyEnvWorker, **kwargs)
 
-        super().__init__(env_fns, worker_fn, **kwargs)
 
-    def check_success(self):
-        return [w.check_success() for w in self.workers]
+class SubprocVectorEnv(BaseVectorEnv):
+    """Vectorized environment wrapper based on subprocess.
 
-    def get_segmentation_of_interest(self, segmentation_images):
-        return [
-            w.get_segmentation_of_interest(img)
-            for w, img in zip(self.workers, segmentation_images)
-        ]
+    :param bool share_memory: if True, observations are not pickled through the
+        pipes. The buffer layout is built from the first observation of a dummy
+        env, and every worker writes its observation into its own row of one
+        shared ``(env_num, ...)`` array per key. The returned observations are
+        views into these arrays, so they are overwritten by the next ``step``,
+        ``reset`` or ``set_init_state``; copy them if they need to be kept
+        (e.g. video frames). The batched arrays themselves are available as
+        ``obs_buffers``, and ``get_obs_batch`` returns them for a batch of
+        envs, so that they can be read without ``np.stack``. After
+        ``load_task``, keys that do not fit the layout are sent through the
+        pipes instead.
+    :param int envs_per_process: the number of envs hosted by each worker
+        process. The envs of a process step one after the other, but they
+        share its imports and memory, and get their commands in one message
+        per process instead of one per env (see SubprocBatchEnvWorker), so
+        ``ceil(env_num / envs_per_process)`` processes can be matched to the
+        number of cores.
 
-    def get_sim_state(self):
-        return [w.get_sim_state() for w in self.workers]
+    .. seealso::
 
-    def set_init_state(
+        Please refer to :class:`~tianshou.env.BaseVectorEnv` for other APIs' usage.
+    """
+
+    def __init__(
         self,
-        init_state: Optional[Union[int, List[int], np.ndarray]] = None,
-        id: Optional[Union[int, List[int], np.ndarray]] = None,
+        env_fns: List[Callable[[], gym.Env]],
+        share_memory: bool = False,
+        envs_per_process: int = 1,
+        command_timeout: Optional[float] = None,
         **kwargs: Any,
-    ) -> Union[np.ndarray, Tuple[np.ndarray, Union[dict, List[dict]]]]:
-        """Reset the state of some envs and return initial observations.
-        If id is None, reset the state of all the environments and return
-        initial observations, otherwise reset the specific environments with
-        the given id, either an int or a list.
-        """
-        self._assert_is_not_closed()
-        id = self._wrap_id(id)
-        if self.is_async:
-            self._assert_id(id)
+    ) -> None:
+        assert envs_per_process >= 1, "envs_per_process should be positive"
+        self.share_memory = share_memory
+        self.envs_per_process = envs_per_process
+        buffer = None
+        if share_memory:
+            dummy = env_fns[0]()
+            buffer = _setup_buf_from_obs(dummy.reset(), batch_size=len(env_fns))
+            dummy.close()
+            del dummy
+        buffer_ids = iter(range(len(env_fns)))
 
-        # send(None) == reset() in worker
-        obs_list = []
-        for j, i in enumerate(id):
-            obs = self.workers[i].set_init_state(init_state[j])
-            obs_list.append(obs)
-        obs = np.stack(obs_list)
+        if envs_per_process == 1:
+
+            def worker_fn(fn: Callable[[], gym.Env]) -> SubprocEnvWorker:
+                return SubprocEnvWorker(
+                    fn,
+                    share_memory=share_memory,
+                    buffer=buffer,
+                    buffer_index=next(buffer_ids),
+                    command_timeout=command_timeout,
+                )
+
+        else:
+            env_processes = []
+            for start in range(0, len(env_fns), envs_per_process):
+                stop = min(start + envs_per_process, len(env_fns))
+                env_process = _EnvProcess(
+                    env_fns[start:stop],
+                    buffer,
+                    list(range(start, stop)),
+                    command_timeout=command_timeout,
+                )
+                env_processes.extend([env_process] * (stop - start))
+
+            def worker_fn(fn: Callable[[], gym.Env]) -> SubprocEnvWorker:
+                i = next(buffer_ids)
+                return SubprocBatchEnvWorker(
+                    fn,
+                    env_processes[i],
+                    i % envs_per_process,
+                    share_memory=share_memory,
+                    buffer=buffer,
+                    buffer_index=i,
+                )
+
+        super().__init__(
+            env_fns, worker_fn, command_timeout=command_timeout, **kwargs
+        )
+        if share_memory:
+            self.obs_buffers = _buffer_view(buffer)
+            # one preallocated batch of per-env views, indexed instead of stacked
+            self._obs_views = np.empty(self.env_num, dtype=object)
+            for i, w in enumerate(self.workers):
+                self._obs_views[i] = w._decode_obs()
+
+    def _respawn(self, env_id: int, error: EnvWorkerError) -> Any:
+        obs = super()._respawn(env_id, error)
+        if self.envs_per_process > 1:
+            # the other envs of the restarted process lost their scene too:
+            # they fail together, so that their episodes are restarted along
+            # with that of env_id. The ones with a pending result are
+            # respawned when it is received, the others right away.
+            start = env_id - env_id % self.envs_per_process
+            stop = min(start + self.envs_per_process, self.env_num)
+            busy = set(self.waiting_id) | set(self._gathering)
+            for j in range(start, stop):
+                worker = self.workers[j]
+                if j == env_id or not worker.env_process.is_failed(
+                    worker.parent_remote.index
+                ):
+                    continue
+                self.worker_failures.setdefault(j, str(error))
+                if j not in busy:
+                    super()._respawn(j, error)
         return obs
+
+    def get_obs_batch(
+        self, id: Optional[Union[int, List[int], np.ndarray]] = None
+    ) -> Optional[dict]:
+        """The rows of ``obs_buffers`` of the envs id, if share_memory is set
+        and the last observation of each of them is entirely in shared memory.
+        They are views if id is a contiguous range of envs (copies
+        otherwise), overwritten by the next step of these envs."""
+        if not self.share_memory or not isinstance(self.obs_buffers, dict):
+            return None
+        id = self._wrap_id(id)
+        if not all(self._last_obs.get(j) is self._obs_views[j] for j in id):
+            return None
+        if len(id) > 0 and np.array_equal(id, np.arange(id[0], id[0] + len(id))):
+            index: Union[slice, List[int], np.ndarray] = slice(id[0], id[0] + len(id))
+        else:
+            index = id
+        return {k: v[index] for k, v in self.obs_buffers.items()}
+
+    def _stack_obs(
+        self, obs_list: List[Any], id: Union[List[int], np.ndarray]
+    ) -> np.ndarray:
+        if self.share_memory:
+            self._last_obs.update(zip(id, obs_list))
+            views = self._obs_views[id]
+            if all(obs is view for obs, view in zip(obs_list, views)):
+                return views
+            # some workers sent part of their observation through the pipe
+            stacked = np.empty(len(obs_list), dtype=object)
+            stacked[:] = obs_list
+            return stacked
+        return super()._stack_obs(obs_list, id)
@@ -1,11 +1,12 @@
 import os
 import yaml
 
-# This is a default path for localizing all the benchmark related files
-libero_config_path = os.environ.get(
-    "LIBERO_CONFIG_PATH", os.path.expanduser("~/.libero")
+from libero.libero import (
+    config_file,
+    get_libero_path,
+    libero_config_path,
+    reset_libero_config,
 )
-config_file = os.path.join(libero_config_path, "config.yaml")
 
 
 def get_path_dict(root_location=os.path.dirname(os.path.abspath(__file__))):
@@ -28,25 +29,8 @@ def get_path_dict(root_location=os.path.dirname(os.path.abspath(__file__))):
     }
 
 
-def get_libero_path(key):
-    with open(config_file, "r") as f:
-        config = dict(yaml.load(f.read(), Loader=yaml.FullLoader))
-    assert key in config, f"Key {key} not found in config file {config_file}"
-    return config[key]
-
-
 def set_libero_path(custom_location=os.path.dirname(os.path.abspath(__file__))):
     new_config = get_path_dict(custom_location)
     with open(config_file, "w") as f:
         yaml.dump(new_config, f)
-
-
-if not os.path.exists(libero_config_path):
-    os.makedirs(libero_config_path)
-
-if not os.path.exists(config_file):
-    # Create a default config file
-
-    # write all the paths into a yaml file
-    with open(config_file, "w") as f:
-        yaml.dump(get_path_dict(), f)
+    reset_libero_config()
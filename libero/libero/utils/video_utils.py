@@ -32,11 +32,13 @@ class VideoWriter:
                 self.image_buffer[idx] = []
             if idx not in self.last_images:
                 self.last_images[idx] = None
+            # copies, as the observations of a vector env with share_memory
+            # are overwritten by its next step
             if not done:
-                self.image_buffer[idx].append(obs[camera_name][::-1])
+                self.image_buffer[idx].append(obs[camera_name][::-1].copy())
             else:
                 if self.last_images[idx] is None:
-                    self.last_images[idx] = obs[camera_name][::-1]
+                    self.last_images[idx] = obs[camera_name][::-1].copy()
                 original_image = np.copy(self.last_images[idx])
                 blank_image = np.ones_like(original_image) * 128
                 blank_image[:, :, 0] = 0
@@ -72,6 +72,8 @@ class Sequential(nn.Module, metaclass=AlgoMeta):
 
         self.policy = get_policy_class(cfg.policy.policy_type)(cfg, cfg.shape_meta)
         self.current_task = -1
+        # the failed env worker attempts of all the evaluations of this run
+        self.worker_failures = []
 
     def end_task(self, dataset, task_id, benchmark, env=None):
         """
@@ -158,6 +160,31 @@ class Sequential(nn.Module, metaclass=AlgoMeta):
         task = benchmark.get_task(task_id)
         task_emb = benchmark.get_task_emb(task_id)
 
+        evaluator = None
+        if use_background_eval(self.cfg):
+            evaluator = get_background_evaluator(
+                self.cfg, benchmark, self.policy, self.worker_failures
+            )
+
+        def record_success(epoch, success_rate, num_episodes, eval_time, state_dict):
+            nonlocal prev_success_rate, idx_at_best_succ, cumulated_counter
+            successes.append(success_rate)
+
+            if prev_success_rate < success_rate:
+                torch_save_state_dict(state_dict, model_checkpoint_name, cfg=self.cfg)
+                prev_success_rate = success_rate
+                idx_at_best_succ = len(successes) - 1
+
+            cumulated_counter += 1.0
+            ci = confidence_interval(success_rate, num_episodes)
+            tmp_successes = np.array(successes)
+            tmp_successes[idx_at_best_succ:] = successes[idx_at_best_succ]
+            print(
+                f"[info] Epoch: {epoch:3d} | succ: {success_rate:4.2f} ± {ci:4.2f} | best succ: {prev_success_rate} "
+                + f"| succ. AoC {tmp_successes.sum()/cumulated_counter:4.2f} | time: {eval_time/60:4.2f}",
+                flush=True,
+            )
+
         # start training
         for epoch in range(0, self.cfg.train.n_epochs + 1):
 
@@ -191,43 +218,55 @@ class Sequential(nn.Module, metaclass=AlgoMeta):
                 # epoch by also considering the agent's performance on old tasks.
                 losses.append(training_loss)
 
-                t0 = time.time()
-
-                task_str = f"k{task_id}_e{epoch//self.cfg.eval.eval_every}"
-                sim_states = (
-                    result_summary[task_str] if self.cfg.eval.save_sim_states else None
-                )
-                success_rate = evaluate_one_task_success(
-                    cfg=self.cfg,
-                    algo=self,
-                    task=task,
-                    task_emb=task_emb,
-                    task_id=task_id,
-                    sim_states=sim_states,
-                    task_str="",
-                )
-                successes.append(success_rate)
-
-                if prev_success_rate < success_rate:
-                    torch_save_model(self.policy, model_checkpoint_name, cfg=self.cfg)
-                    prev_success_rate = success_rate
-                    idx_at_best_succ = len(losses) - 1
-
-                t1 = time.time()
-
-                cumulated_counter += 1.0
-                ci = confidence_interval(success_rate, self.cfg.eval.n_eval)
-                tmp_successes = np.array(successes)
-                tmp_successes[idx_at_best_succ:] = successes[idx_at_best_succ]
-                print(
-                    f"[info] Epoch: {epoch:3d} | succ: {success_rate:4.2f} ± {ci:4.2f} | best succ: {prev_success_rate} "
-                    + f"| succ. AoC {tmp_successes.sum()/cumulated_counter:4.2f} | time: {(t1-t0)/60:4.2f}",
-                    flush=True,
-                )
+                if evaluator is not None:
+                    # the rollouts run in the background, training goes on
+                    evaluator.submit(
+                        self.policy,
+                        epoch,
+                        [task_id],
+                        best_success_rate=prev_success_rate,
+                    )
+                else:
+                    t0 = time.time()
+
+                    task_str = f"k{task_id}_e{epoch//self.cfg.eval.eval_every}"
+                    sim_states = (
+                        result_summary[task_str]
+                        if self.cfg.eval.save_sim_states
+                        else None
+                    )
+                    success_rate, num_episodes = evaluate_one_task_success(
+                        cfg=self.cfg,
+                        algo=self,
+                        task=task,
+                        task_emb=task_emb,
+                        task_id=task_id,
+                        sim_states=sim_states,
+                        task_str="",
+                        best_success_rate=prev_success_rate,
+                        return_num_episodes=True,
+                        worker_failures=self.worker_failures,
+                    )
+                    t1 = time.time()
+                    record_success(
+                        epoch,
+                        success_rate,
+                        num_episodes,
+                        t1 - t0,
+                        self.policy.state_dict(),
+                    )
+
+            if evaluator is not None:
+                for result in evaluator.poll():
+                    record_success(*result)
 
             if self.scheduler is not None and epoch > 0:
                 self.scheduler.step()
 
+        if evaluator is not None:
+            for result in evaluator.drain():
+                record_success(*result)
+
         # load the best performance agent on the current task
         self.policy.load_state_dict(torch_load_model(model_checkpoint_name)[0])
 
@@ -253,5 +292,8 @@ class Sequential(nn.Module, metaclass=AlgoMeta):
         successes[idx_at_best_succ:] = successes[idx_at_best_succ]
         return successes.sum() / cumulated_counter, losses.sum() / cumulated_counter
 
-    def reset(self):
-        self.policy.reset()
+    def reset(self, env_ids=None):
+        if env_ids is None:
+            self.policy.reset()
+        else:
+            self.policy.reset(env_ids=env_ids)
@@ -1,4 +1,5 @@
 import os
+import time
 
 import numpy as np
 import torch
@@ -48,6 +49,36 @@ class Multitask(Sequential):
         successes = []
         losses = []
 
+        evaluator = None
+        if self.cfg.lifelong.eval_in_train and use_background_eval(self.cfg):
+            evaluator = get_background_evaluator(
+                self.cfg, benchmark, self.policy, self.worker_failures
+            )
+
+        def record_success(epoch, success_rates, num_episodes, eval_time, state_dict):
+            nonlocal prev_success_rate, idx_at_best_succ, cumulated_counter
+            success_rate = np.mean(success_rates)
+            successes.append(success_rate)
+
+            if prev_success_rate < success_rate and (not self.cfg.pretrain):
+                torch_save_state_dict(state_dict, model_checkpoint_name, cfg=self.cfg)
+                prev_success_rate = success_rate
+                idx_at_best_succ = len(successes) - 1
+
+            cumulated_counter += 1.0
+            # num_episodes holds the episodes of every task, which can be fewer
+            # than eval.n_eval when the evaluation stopped early
+            ci = confidence_interval(success_rate, np.mean(num_episodes))
+            tmp_successes = np.array(successes)
+            tmp_successes[idx_at_best_succ:] = successes[idx_at_best_succ]
+
+            if self.cfg.lifelong.eval_in_train:
+                print(
+                    f"[info] Epoch: {epoch:3d} | succ: {success_rate:4.2f} ± {ci:4.2f} | best succ: {prev_success_rate} "
+                    + f"| succ. AoC {tmp_successes.sum()/cumulated_counter:4.2f} | time: {eval_time/60:4.2f}",
+                    flush=True,
+                )
+
         # start training
         for epoch in range(0, self.cfg.train.n_epochs + 1):
 
@@ -85,37 +116,44 @@ class Multitask(Sequential):
                 # the agent once every eval_every epochs on all tasks, note that
                 # this can be quite computationally expensive. Nevertheless, we
                 # save the checkpoints, so users can always evaluate afterwards.
-                if self.cfg.lifelong.eval_in_train:
-                    success_rates = evaluate_multitask_training_success(
-                        self.cfg, self, benchmark, all_tasks
-                    )
-                    success_rate = np.mean(success_rates)
+                if evaluator is not None:
+                    # the rollouts run in the background, training goes on
+                    evaluator.submit(self.policy, epoch, all_tasks)
                 else:
-                    success_rate = 0.0
-                successes.append(success_rate)
-
-                if prev_success_rate < success_rate and (not self.cfg.pretrain):
-                    torch_save_model(self.policy, model_checkpoint_name, cfg=self.cfg)
-                    prev_success_rate = success_rate
-                    idx_at_best_succ = len(losses) - 1
-
-                t1 = time.time()
-
-                cumulated_counter += 1.0
-                ci = confidence_interval(success_rate, self.cfg.eval.n_eval)
-                tmp_successes = np.array(successes)
-                tmp_successes[idx_at_best_succ:] = successes[idx_at_best_succ]
-
-                if self.cfg.lifelong.eval_in_train:
-                    print(
-                        f"[info] Epoch: {epoch:3d} | succ: {success_rate:4.2f} ± {ci:4.2f} | best succ: {prev_success_rate} "
-                        + f"| succ. AoC {tmp_successes.sum()/cumulated_counter:4.2f} | time: {(t1-t0)/60:4.2f}",
-                        flush=True,
+                    if self.cfg.lifelong.eval_in_train:
+                        (
+                            success_rates,
+                            num_episodes,
+                        ) = evaluate_multitask_training_success(
+                            self.cfg,
+                            self,
+                            benchmark,
+                            all_tasks,
+                            return_num_episodes=True,
+                            worker_failures=self.worker_failures,
+                        )
+                    else:
+                        success_rates, num_episodes = 0.0, self.cfg.eval.n_eval
+                    t1 = time.time()
+                    record_success(
+                        epoch,
+                        success_rates,
+                        num_episodes,
+                        t1 - t0,
+                        self.policy.state_dict(),
                     )
 
+            if evaluator is not None:
+                for result in evaluator.poll():
+                    record_success(*result)
+
             if self.scheduler is not None and epoch > 0:
                 self.scheduler.step()
 
+        if evaluator is not None:
+            for result in evaluator.drain():
+                record_success(*result)
+
         # load the best policy if there is any
         if self.cfg.lifelong.eval_in_train:
             self.policy.load_state_dict(torch_load_model(model_checkpoint_name)[0])
@@ -29,7 +29,11 @@ from libero.lifelong.datasets import get_dataset, SequenceVLDataset, GroupedTask
 from libero.lifelong.metric import (
     evaluate_loss,
     evaluate_success,
-    raw_obs_to_tensor_obs,
+    eval_cache_key,
+    get_eval_env_args,
+    get_eval_result_cache,
+    policy_digest,
+    run_episode_waves,
 )
 from libero.lifelong.utils import (
     control_seed,
@@ -98,6 +102,8 @@ def parse_args():
     parser.add_argument("--load_task", type=int)
     parser.add_argument("--device_id", type=int)
     parser.add_argument("--save-videos", action="store_true")
+    # reuse the rollout results of the same checkpoint, see eval.cache
+    parser.add_argument("--eval-cache", action="store_true")
     # parser.add_argument('--save_dir',  type=str, required=True)
     args = parser.parse_args()
     args.device_id = "cuda:" + str(args.device_id)
@@ -232,64 +238,74 @@ def main():
     )
 
     with Timer() as t, VideoWriter(video_folder, args.save_videos) as video_writer:
-        env_args = {
-            "bddl_file_name": os.path.join(
-                cfg.bddl_folder, task.problem_folder, task.bddl_file
-            ),
-            "camera_heights": cfg.data.img_h,
-            "camera_widths": cfg.data.img_w,
-        }
+        env_args = get_eval_env_args(cfg, task)
 
         env_num = 20
-        env = SubprocVectorEnv(
-            [lambda: OffScreenRenderEnv(**env_args) for _ in range(env_num)]
-        )
-        env.reset()
-        env.seed(cfg.seed)
-        algo.reset()
-
         init_states_path = os.path.join(
             cfg.init_states_folder, task.problem_folder, task.init_states_file
         )
         init_states = torch.load(init_states_path)
-        indices = np.arange(env_num) % init_states.shape[0]
-        init_states_ = init_states[indices]
-
-        dones = [False] * env_num
-        steps = 0
-        obs = env.set_init_state(init_states_)
-        task_emb = benchmark.get_task_emb(args.task_id)
-
-        num_success = 0
-        for _ in range(5):  # simulate the physics without any actions
-            env.step(np.zeros((env_num, 7)))
-
-        with torch.no_grad():
-            while steps < cfg.eval.max_steps:
-                steps += 1
-
-                data = raw_obs_to_tensor_obs(obs, task_emb, cfg)
-                actions = algo.policy.get_action(data)
-                obs, reward, done, info = env.step(actions)
-                video_writer.append_vector_obs(
-                    obs, dones, camera_name="agentview_image"
-                )
 
-                # check whether succeed
-                for k in range(env_num):
-                    dones[k] = dones[k] or done[k]
-                if all(dones):
-                    break
+        # videos need the rollouts, so the cache is only used without them
+        cache = get_eval_result_cache(
+            cfg, enabled=args.eval_cache and not args.save_videos
+        )
+        cached = None
+        if cache is not None:
+            cache_key = eval_cache_key(
+                cfg,
+                policy_digest(algo.policy),
+                env_args,
+                init_states,
+                env_num,
+                rollout="waves",
+                env_num=env_num,
+            )
+            cached = cache.get(cache_key)
+
+        # the failed attempts of the episodes whose env worker was respawned
+        worker_failures = []
+        if cached is not None:
+            num_success = cached[0]
+            print(f"[info] reuse the cached result of task {args.task_id}")
+        else:
+            env = SubprocVectorEnv(
+                [lambda: OffScreenRenderEnv(**env_args) for _ in range(env_num)],
+                envs_per_process=cfg.eval.get("envs_per_process", 1),
+                command_timeout=cfg.eval.get("worker_timeout", None),
+                auto_respawn=cfg.eval.get("respawn_workers", False),
+            )
+            env.reset()
+            env.seed(cfg.seed)
+            task_emb = benchmark.get_task_emb(args.task_id)
+
+            # episode k runs on env k, the episodes whose env worker failed
+            # are run again from the same init state
+            with torch.no_grad():
+                records = run_episode_waves(
+                    cfg,
+                    algo,
+                    env,
+                    env_num,
+                    init_states,
+                    task_emb,
+                    env_num,
+                    task_ids=[args.task_id],
+                    video_writer=video_writer,
+                )
 
-            for k in range(env_num):
-                num_success += int(dones[k])
+            env.close()
+            num_success = records.num_success()[0]
+            worker_failures = records.failures
+            if cache is not None and not records.lost_episodes():
+                cache.put(cache_key, num_success, env_num)
 
         success_rate = num_success / env_num
-        env.close()
 
         eval_stats = {
             "loss": test_loss,
             "success_rate": success_rate,
+            "worker_failures": worker_failures,
         }
 
         os.system(f"mkdir -p {args.save_dir}")
@@ -22,7 +22,12 @@ from libero.libero.benchmark import get_benchmark
 from libero.lifelong.algos import get_algo_class, get_algo_list
 from libero.lifelong.models import get_policy_list
 from libero.lifelong.datasets import GroupedTaskDataset, SequenceVLDataset, get_dataset
-from libero.lifelong.metric import evaluate_loss, evaluate_success
+from libero.lifelong.metric import (
+    close_background_evaluator,
+    close_eval_env_pool,
+    evaluate_loss,
+    evaluate_success,
+)
 from libero.lifelong.utils import (
     NpEncoder,
     compute_flops,
@@ -190,6 +195,7 @@ def main(hydra_cfg):
                 benchmark=benchmark,
                 task_ids=list(range(n_manip_tasks)),
                 result_summary=result_summary if cfg.eval.save_sim_states else None,
+                worker_failures=algo.worker_failures,
             )
 
             result_summary["L_conf_mat"][-1] = L
@@ -209,6 +215,7 @@ def main(hydra_cfg):
             print(("[All task loss ] " + " %4.2f |" * n_tasks) % tuple(L))
             print(("[All task succ.] " + " %4.2f |" * n_tasks) % tuple(S))
 
+            result_summary["worker_failures"] = algo.worker_failures
             torch.save(result_summary, os.path.join(cfg.experiment_dir, f"result.pt"))
     else:
         for i in range(n_tasks):
@@ -233,6 +240,7 @@ def main(hydra_cfg):
                     benchmark=benchmark,
                     task_ids=list(range((i + 1) * gsz)),
                     result_summary=result_summary if cfg.eval.save_sim_states else None,
+                    worker_failures=algo.worker_failures,
                 )
                 t3 = time.time()
                 result_summary["L_conf_mat"][i][: i + 1] = L
@@ -256,10 +264,13 @@ def main(hydra_cfg):
                 )
                 print(("[Task %2d loss ] " + " %4.2f |" * (i + 1)) % (i, *L))
                 print(("[Task %2d succ.] " + " %4.2f |" * (i + 1)) % (i, *S))
+                result_summary["worker_failures"] = algo.worker_failures
                 torch.save(
                     result_summary, os.path.join(cfg.experiment_dir, f"result.pt")
                 )
 
+    close_background_evaluator()
+    close_eval_env_pool()
     print("[info] finished learning\n")
     if cfg.use_wandb:
         wandb.finish()
@@ -1,7 +1,10 @@
 import copy
 import gc
+import hashlib
+import json
 import numpy as np
 import os
+import queue
 import robomimic.utils.obs_utils as ObsUtils
 import robomimic.utils.tensor_utils as TensorUtils
 import time
@@ -10,6 +13,7 @@ import torch.multiprocessing as mp
 import torch.nn.functional as F
 from torch.utils.data import DataLoader
 
+from libero.libero import libero_config_path
 from libero.libero.envs import OffScreenRenderEnv, SubprocVectorEnv, DummyVectorEnv
 from libero.libero.utils.time_utils import Timer
 from libero.libero.utils.video_utils import VideoWriter
@@ -19,12 +23,14 @@ from libero.lifelong.utils import *
 def raw_obs_to_tensor_obs(obs, task_emb, cfg):
     """
     Prepare the tensor observations as input for the algorithm.
+    task_emb: the embedding of the task all envs run, or a (env_num, E) batch
+              with one row per env
     """
     env_num = len(obs)
 
     data = {
         "obs": {},
-        "task_emb": task_emb.repeat(env_num, 1),
+        "task_emb": task_emb.repeat(env_num, 1) if task_emb.dim() == 1 else task_emb,
     }
 
     all_obs_keys = []
@@ -49,14 +55,959 @@ def raw_obs_to_tensor_obs(obs, task_emb, cfg):
     return data
 
 
+class TensorObsConverter:
+    """
+    A precompiled version of raw_obs_to_tensor_obs, built once per evaluation.
+    The obs keys and their modality are resolved from the config once, the
+    task embedding is moved to the device once, and every obs key is gathered
+    into a preallocated (env_num, ...) staging array, then processed with one
+    vectorized copy / transpose / scale into a preallocated tensor. The
+    returned tensors are overwritten by the next call. If the env gives the
+    observations as one (env_num, ...) array per key (see
+    BaseVectorEnv.get_obs_batch, e.g. with eval.share_memory), they are
+    copied from there instead of stacked.
+    task_emb: the embedding of the task all envs run, or a (env_num, E) batch
+              with one row per env
+    """
+
+    IMAGE_SCALES = {"rgb": 255.0, "depth": 1.0}
+
+    def __init__(self, cfg, task_emb):
+        self.cfg = cfg
+        self.task_emb = task_emb
+        self.obs_keys = []  # (obs_name, env obs key, modality)
+        for modality_name, modality_list in cfg.data.obs.modality.items():
+            for obs_name in modality_list:
+                self.obs_keys.append(
+                    (obs_name, cfg.data.obs_key_mapping[obs_name], modality_name)
+                )
+        self.env_num = None
+
+    def _allocate(self, obs):
+        self.env_num = len(obs)
+        pin_memory = "cuda" in self.cfg.device and torch.cuda.is_available()
+        task_emb = self.task_emb
+        if task_emb.dim() == 1:
+            task_emb = task_emb.repeat(self.env_num, 1)
+        self.data = {
+            "obs": {},
+            "task_emb": safe_device(task_emb, device=self.cfg.device),
+        }
+        self.staging = {}
+        self.staging_np = {}
+        self.raw = {}
+        for obs_name, obs_key, modality_name in self.obs_keys:
+            example = np.asarray(obs[0][obs_key])
+            staging = torch.from_numpy(
+                np.empty((self.env_num, *example.shape), dtype=example.dtype)
+            )
+            if pin_memory:
+                staging = staging.pin_memory()
+            self.staging[obs_name] = staging
+            self.staging_np[obs_name] = staging.numpy()
+            self.raw[obs_name] = safe_device(
+                torch.empty_like(staging), device=self.cfg.device
+            )
+            if modality_name in self.IMAGE_SCALES:
+                H, W, C = example.shape
+                out = torch.empty(self.env_num, C, H, W)
+            else:
+                out = torch.empty(self.env_num, *example.shape)
+            self.data["obs"][obs_name] = safe_device(out, device=self.cfg.device)
+
+    def __call__(self, obs, obs_batch=None):
+        """
+        obs:       the observation dict of every env
+        obs_batch: if not None, the same observations as one array per key
+        """
+        if self.env_num is None:
+            self._allocate(obs)
+        for obs_name, obs_key, modality_name in self.obs_keys:
+            if obs_batch is not None:
+                src = torch.from_numpy(obs_batch[obs_key])
+            else:
+                np.stack(
+                    [obs[k][obs_key] for k in range(self.env_num)],
+                    out=self.staging_np[obs_name],
+                )
+                src = self.staging[obs_name]
+            raw = self.raw[obs_name]
+            raw.copy_(src, non_blocking=True)
+            out = self.data["obs"][obs_name]
+            if modality_name in self.IMAGE_SCALES:
+                # (B, H, W, C) -> (B, C, H, W), as ObsUtils.process_frame
+                torch.div(
+                    raw.permute(0, 3, 1, 2),
+                    self.IMAGE_SCALES[modality_name],
+                    out=out,
+                )
+                out.clamp_(0.0, 1.0)
+            elif modality_name == "low_dim":
+                out.copy_(raw)
+            else:
+                out.copy_(ObsUtils.process_obs(raw, obs_key=obs_name))
+        return self.data
+
+
+def get_eval_env_args(cfg, task):
+    """
+    The OffScreenRenderEnv kwargs to evaluate a task.
+    """
+    env_args = {
+        "bddl_file_name": os.path.join(
+            cfg.bddl_folder, task.problem_folder, task.bddl_file
+        ),
+        "camera_heights": cfg.data.img_h,
+        "camera_widths": cfg.data.img_w,
+    }
+    if cfg.eval.get("policy_obs_only", False):
+        env_args["observation_keys"] = list(cfg.data.obs_key_mapping.values())
+    if not cfg.eval.get("site_visualization", True):
+        env_args["site_visualization"] = False
+    if cfg.eval.get("model_cache", False):
+        env_args["model_cache"] = True
+        env_args["model_cache_dir"] = cfg.eval.get("model_cache_dir", None)
+    return env_args
+
+
+def load_init_states(cfg, task):
+    """
+    Load the fixed init states of a task, to control the experiment randomness.
+    """
+    init_states_path = os.path.join(
+        cfg.init_states_folder, task.problem_folder, task.init_states_file
+    )
+    return torch.load(init_states_path)
+
+
+def create_eval_env(cfg, env_args, env_num, wait_num=None):
+    """
+    Create a vector env of env_num OffScreenRenderEnv built from env_args,
+    either one dict for all the envs or a list with one dict per env.
+    wait_num: if given, the vector env is asynchronous (see BaseVectorEnv)
+    """
+    if isinstance(env_args, dict):
+        env_args = [env_args] * env_num
+    env_fns = [lambda args=args: OffScreenRenderEnv(**args) for args in env_args]
+
+    # Try to handle the frame buffer issue
+    for count in range(5):
+        try:
+            if env_num == 1:
+                return DummyVectorEnv(env_fns)
+            return SubprocVectorEnv(
+                env_fns,
+                share_memory=cfg.eval.get("share_memory", False),
+                envs_per_process=cfg.eval.get("envs_per_process", 1),
+                wait_num=wait_num,
+                command_timeout=cfg.eval.get("worker_timeout", None),
+                auto_respawn=cfg.eval.get("respawn_workers", False),
+            )
+        except Exception as e:
+            print(f"[warning] failed to create the eval envs ({e!r}), retrying")
+            error = e
+            time.sleep(5)
+    raise Exception("Failed to create environment") from error
+
+
+class EvalEnvPool:
+    """
+    A long-lived pool of evaluation envs, reused across tasks and eval rounds
+    of a training run. The workers are created on first use; switching to
+    another task sends them a "load_task" command, so only the scene is
+    rebuilt while the worker processes and their imports stay warm. Envs
+    may run different tasks, then only the envs whose task changed reload.
+    """
+
+    def __init__(self, cfg):
+        self.cfg = cfg
+        self.env = None
+        self.env_num = 0
+        self.wait_num = None
+        self.env_args = None
+
+    def get(self, env_args, env_num, wait_num=None):
+        if isinstance(env_args, dict):
+            env_args = [env_args] * env_num
+        if self.env is not None and (
+            self.env_num != env_num or self.wait_num != wait_num
+        ):
+            self.close()
+        if self.env is None:
+            self.env = create_eval_env(self.cfg, env_args, env_num, wait_num)
+            self.env_num = env_num
+            self.wait_num = wait_num
+        else:
+            changed = [
+                i for i, args in enumerate(env_args) if args != self.env_args[i]
+            ]
+            if len(changed) > 0:
+                self.env.load_task([env_args[i] for i in changed], id=changed)
+        self.env_args = env_args
+        return self.env
+
+    def close(self):
+        if self.env is not None:
+            self.env.close()
+            self.env = None
+            self.env_args = None
+            gc.collect()
+
+
+_eval_env_pool = None
+
+
+def get_eval_env_pool(cfg):
+    """
+    Return the eval env pool of this process, create it if needed.
+    """
+    global _eval_env_pool
+    if _eval_env_pool is None:
+        _eval_env_pool = EvalEnvPool(cfg)
+    return _eval_env_pool
+
+
+def close_eval_env_pool():
+    """
+    Shut down the workers of the eval env pool, if there is one.
+    """
+    global _eval_env_pool
+    if _eval_env_pool is not None:
+        _eval_env_pool.close()
+        _eval_env_pool = None
+
+
+class EvalResultCache:
+    """
+    A persistent on-disk cache of closed-loop evaluation results, shared by
+    training runs and evaluate.py. Every result is a small json file named
+    after its key (see eval_cache_key), written atomically, so concurrent
+    runs can share the same cache folder.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """
+        Return (num_success, num_episodes) of a cached evaluation, or None.
+        """
+        try:
+            with open(self._path(key), "r") as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return result["num_success"], result["num_episodes"]
+
+    def put(self, key, num_success, num_episodes):
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {"num_success": int(num_success), "num_episodes": int(num_episodes)},
+                f,
+            )
+        os.replace(tmp_path, path)
+
+
+def get_eval_result_cache(cfg, enabled=None):
+    """
+    Return the eval result cache, None unless eval.cache is set (or enabled
+    is True). The cache lives in eval.cache_dir, by default under the libero
+    config folder.
+    """
+    if enabled is None:
+        enabled = cfg.eval.get("cache", False)
+    if not enabled:
+        return None
+    cache_dir = cfg.eval.get("cache_dir", None) or os.path.join(
+        libero_config_path, "eval_cache"
+    )
+    return EvalResultCache(cache_dir)
+
+
+def policy_digest(policy):
+    """
+    A hash of the weights of the policy.
+    """
+    h = hashlib.sha1()
+    for k, v in sorted(policy.state_dict().items()):
+        v = v.detach().cpu().contiguous()
+        h.update(f"{k}:{v.dtype}:{tuple(v.shape)}".encode())
+        h.update(v.reshape(-1).view(torch.uint8).numpy().tobytes())
+    return h.hexdigest()
+
+
+def eval_cache_key(
+    cfg,
+    digest,
+    env_args,
+    init_states,
+    n_episodes,
+    best_success_rate=None,
+    rollout="waves",
+    env_num=1,
+    persistent_pool=False,
+):
+    """
+    The eval result cache key of an evaluation of the policy with weights
+    digest (see policy_digest), on the task of env_args, for n_episodes
+    episodes where the e-th one starts from init_states[e % len(init_states)].
+    It covers the content of the BDDL file and of the init states in use,
+    eval.max_steps, the seed, the early stopping setup, the rendering of the
+    env, the policy and observation config (e.g. the sampling of a GMM head)
+    and how the episodes are rolled out:
+        - rollout: "waves", "pool", "pipeline", "cross_task" or
+          "cross_task_pipeline", see the run_episode_* functions
+        - env_num: the number of envs, which decides the env (and so the
+          env seed) each episode runs in
+        - persistent_pool: whether the envs are reused from earlier tasks
+    The options that only change how the same rollouts are computed are
+    deliberately left out: eval.share_memory, eval.envs_per_process,
+    eval.model_cache, eval.policy_obs_only and the worker respawn options
+    (results with lost episodes are never cached).
+    """
+    h = hashlib.sha1()
+    h.update(digest.encode())
+    with open(env_args["bddl_file_name"], "rb") as f:
+        h.update(f.read())
+    indices = np.arange(n_episodes) % init_states.shape[0]
+    h.update(indices.tobytes())
+    h.update(np.ascontiguousarray(np.asarray(init_states[indices])).tobytes())
+    setup = {
+        "n_episodes": int(n_episodes),
+        "max_steps": cfg.eval.max_steps,
+        "seed": cfg.seed,
+        "camera_heights": env_args.get("camera_heights"),
+        "camera_widths": env_args.get("camera_widths"),
+        "site_visualization": env_args.get("site_visualization", True),
+        "policy": cfg.policy,
+        "obs": cfg.data.obs,
+        "rollout": rollout,
+        "env_num": int(env_num),
+        "persistent_pool": persistent_pool,
+    }
+    if cfg.eval.get("early_stop", False):
+        setup["early_stop"] = [
+            cfg.eval.get("early_stop_min_episodes", 10),
+            cfg.eval.get("early_stop_ci_width", 0.3),
+            best_success_rate,
+        ]
+    h.update(json.dumps(setup, sort_keys=True).encode())
+    return h.hexdigest()
+
+
+def make_early_stop_fn(cfg, best_success_rate=None):
+    """
+    Sequential stopping rule of a success-rate evaluation, None unless
+    eval.early_stop is set. stop_fn(num_success, n) is called with the results
+    of the first n episodes and tells whether the remaining episodes can be
+    skipped, i.e. after at least eval.early_stop_min_episodes episodes
+        - the Wilson interval of the success rate is narrower than
+          eval.early_stop_ci_width, or
+        - the upper bound of the interval is below best_success_rate, the
+          success rate to beat (e.g. of the best checkpoint so far).
+    It also stops as soon as best_success_rate cannot be beaten anymore, even
+    if all the remaining episodes succeed, but never before the first episode.
+    """
+    if not cfg.eval.get("early_stop", False):
+        return None
+    n_eval = cfg.eval.n_eval
+    min_episodes = cfg.eval.get("early_stop_min_episodes", 10)
+    ci_width = cfg.eval.get("early_stop_ci_width", 0.3)
+
+    def stop_fn(num_success, n):
+        if n == 0:
+            return False
+        if best_success_rate is not None:
+            if (num_success + n_eval - n) / n_eval <= best_success_rate:
+                return True
+        if n < min_episodes:
+            return False
+        low, high = wilson_interval(num_success, n)
+        if high - low <= ci_width:
+            return True
+        return best_success_rate is not None and high < best_success_rate
+
+    return stop_fn
+
+
+class EpisodeResults:
+    """
+    The success record of every evaluation episode of every task, and the
+    sequential stopping of the tasks whose outcome is already clear. In a
+    continuous pool, successful episodes finish earlier than failed ones, so
+    the stopping rule only sees the longest prefix of finished episodes, in
+    episode order, which keeps the estimate unbiased.
+    An episode whose env worker failed is run again from the same init state,
+    up to max_retries times, see retry. Every failed attempt goes to
+    failures, one dict with the task id, the episode, the error and whether
+    the episode was run again (otherwise it was counted as unsuccessful).
+    The rollouts that time their phases put the times in timing.
+    """
+
+    def __init__(
+        self, n_tasks, n_episodes, stop_fn=None, max_retries=0, task_ids=None
+    ):
+        self.results = np.full((n_tasks, n_episodes), -1)
+        self.num_episodes = np.full(n_tasks, n_episodes)
+        self.stopped = np.zeros(n_tasks, dtype=bool)
+        self.stop_fn = stop_fn
+        self.attempts = np.zeros((n_tasks, n_episodes), dtype=int)
+        self.max_retries = max_retries
+        self.task_ids = list(range(n_tasks)) if task_ids is None else task_ids
+        self.failures = []
+        self.timing = {}
+
+    def retry(self, task, episode, error):
+        """
+        Record an episode whose env worker failed, return whether to run it
+        again. Otherwise it is recorded as unsuccessful.
+        """
+        if self.stopped[task]:
+            # the running episodes of a stopped task are dropped anyway
+            return False
+        self.attempts[task, episode] += 1
+        retried = self.attempts[task, episode] <= self.max_retries
+        self.failures.append(
+            {
+                "task": int(self.task_ids[task]),
+                "episode": int(episode),
+                "attempt": int(self.attempts[task, episode]),
+                "error": error,
+                "retried": bool(retried),
+            }
+        )
+        if not retried:
+            print(
+                f"[warning] episode {episode} of task {self.task_ids[task]} failed"
+                + f" {self.attempts[task, episode]} times, counted as unsuccessful"
+            )
+            self.add(task, episode, False)
+        return retried
+
+    def add(self, task, episode, success):
+        """
+        Record an episode, return whether the task just stopped.
+        """
+        self.results[task, episode] = int(success)
+        if self.stop_fn is None or self.stopped[task]:
+            return False
+        finished = self.results[task] >= 0
+        if finished.all():
+            return False
+        n = int(np.argmin(finished))
+        # a task stops after at least one episode, so that its success rate
+        # is defined
+        if n > 0 and self.stop_fn(int(self.results[task, :n].sum()), n):
+            self.stopped[task] = True
+            self.num_episodes[task] = n
+        return self.stopped[task]
+
+    def lost_episodes(self):
+        """
+        Whether an episode was counted as unsuccessful because of a failed env
+        worker. Such results are not cached.
+        """
+        return any(not failure["retried"] for failure in self.failures)
+
+    def num_success(self):
+        return np.array(
+            [
+                self.results[t, :n].clip(min=0).sum()
+                for t, n in enumerate(self.num_episodes)
+            ]
+        )
+
+
+class EpisodePool:
+    """
+    The episode queues of a pool of envs, shared by run_episode_pool and
+    run_episode_pipeline: which episode every env runs, for how many steps,
+    whether it is live, its latest observation, and the EpisodeResults. An
+    env only runs episodes of its task slot_tasks[k], episode e of task t
+    starts from init_states[t][e % len(init_states[t])].
+    """
+
+    def __init__(
+        self,
+        cfg,
+        env,
+        slot_tasks,
+        init_states,
+        n_episodes,
+        sim_states=None,
+        stop_fn=None,
+        task_ids=None,
+    ):
+        self.cfg = cfg
+        self.env = env
+        self.slot_tasks = np.asarray(slot_tasks)
+        self.init_states = init_states
+        self.sim_states = sim_states
+        env_num = len(slot_tasks)
+        n_tasks = len(init_states)
+        self.episode_queues = [list(range(n_episodes))[::-1] for _ in range(n_tasks)]
+        self.slot_episode = np.full(env_num, -1)
+        self.slot_steps = np.zeros(env_num, dtype=int)
+        self.live = np.zeros(env_num, dtype=bool)
+        self.obs = np.empty(env_num, dtype=object)
+        self.records = EpisodeResults(
+            n_tasks,
+            n_episodes,
+            stop_fn,
+            max_retries=cfg.eval.get("max_episode_retries", 0),
+            task_ids=task_ids,
+        )
+        # envs whose worker was respawned, see take_failures
+        self.worker_failures = {}
+
+    def record_sim_states(self, ids):
+        if self.sim_states is None:
+            return
+        for k, sim_state in zip(ids, self.env.get_sim_state(id=ids)):
+            self.sim_states[self.slot_tasks[k]][self.slot_episode[k]].append(sim_state)
+
+    def take_failures(self, ids):
+        """
+        The envs of ids whose worker was respawned, with their error. The
+        failures of envs that were not running an episode are dropped.
+        """
+        self.worker_failures.update(self.env.pop_worker_failures())
+        failures = {
+            k: self.worker_failures.pop(k) for k in ids if k in self.worker_failures
+        }
+        for k in list(self.worker_failures):
+            if not self.live[k]:
+                del self.worker_failures[k]
+        return failures
+
+    def requeue(self, failures):
+        """
+        Put the episodes of the failed envs back in front of their queue,
+        return the envs.
+        """
+        for k, error in failures.items():
+            t, e = self.slot_tasks[k], self.slot_episode[k]
+            if self.sim_states is not None:
+                self.sim_states[t][e].clear()
+            if self.records.retry(t, e, error):
+                self.episode_queues[t].append(e)
+            elif self.records.stopped[t]:
+                self.episode_queues[t].clear()
+            self.live[k] = False
+        return list(failures)
+
+    def finish(self, k, success):
+        """
+        Record the episode of env k if it succeeded or ran out of steps,
+        return whether it did.
+        """
+        if not success and self.slot_steps[k] < self.cfg.eval.max_steps:
+            return False
+        t = self.slot_tasks[k]
+        if self.records.add(t, self.slot_episode[k], success):
+            self.episode_queues[t].clear()
+        self.live[k] = False
+        return True
+
+    def refill(self, ids, step):
+        """
+        Start the next episode of their task on the envs ids, if any.
+        step(actions, ids) steps the envs ids and returns their observations,
+        it runs the dummy steps of the initial physics simulation.
+        """
+        queues, slot_tasks = self.episode_queues, self.slot_tasks
+        ids = [k for k in ids if len(queues[slot_tasks[k]]) > 0]
+        while len(ids) > 0:
+            init_states_ = []
+            for k in ids:
+                self.slot_episode[k] = queues[slot_tasks[k]].pop()
+                task_init_states = self.init_states[slot_tasks[k]]
+                init_states_.append(
+                    task_init_states[self.slot_episode[k] % task_init_states.shape[0]]
+                )
+            self.slot_steps[ids] = 0
+            self.live[ids] = True
+            self.obs[ids] = self.env.set_init_state(init_states_, id=ids)
+
+            # dummy actions all zeros for initial physics simulation
+            dummy = np.zeros((len(ids), 7))
+            for _ in range(5):
+                for k, obs_k in zip(ids, step(dummy, ids)):
+                    self.obs[k] = obs_k
+            self.record_sim_states(ids)
+            # the envs that failed meanwhile start their next episode
+            ids = self.requeue(self.take_failures(ids))
+            ids = [k for k in ids if len(queues[slot_tasks[k]]) > 0]
+
+
+def run_episode_waves(
+    cfg,
+    algo,
+    env,
+    env_num,
+    init_states,
+    task_emb,
+    n_episodes,
+    sim_states=None,
+    stop_fn=None,
+    task_ids=None,
+    video_writer=None,
+):
+    """
+    Run n_episodes evaluation episodes in lockstep waves of env_num envs and
+    return their EpisodeResults (a single task).
+    Every wave runs until all of its envs succeeded or max_steps is reached.
+    The episodes whose env worker failed are run again in a later wave.
+    sim_states: if not None, sim_states[e] collects the simulated states of
+                episode e
+    stop_fn:    if not None, the sequential stopping rule checked after every
+                wave, see make_early_stop_fn
+    task_ids:   the id of the task, for the failures of EpisodeResults
+    video_writer: if not None, the agentview frames of episode e go to its
+                video e, a retried episode continues the video of its failed
+                attempt
+    """
+    records = EpisodeResults(
+        1,
+        n_episodes,
+        stop_fn,
+        max_retries=cfg.eval.get("max_episode_retries", 0),
+        task_ids=task_ids,
+    )
+    to_tensor_obs = TensorObsConverter(cfg, task_emb)
+    episode_queue = list(range(n_episodes))
+    while len(episode_queue) > 0:
+        # the idle envs of the last wave run the next init states, their
+        # results are dropped
+        episodes = episode_queue[:env_num]
+        episode_queue = episode_queue[env_num:]
+        episodes += [n_episodes + k for k in range(env_num - len(episodes))]
+        env.reset()
+        indices = np.array(episodes) % init_states.shape[0]
+        init_states_ = init_states[indices]
+
+        dones = [False] * env_num
+        steps = 0
+        algo.reset()
+        obs = env.set_init_state(init_states_)
+
+        # dummy actions [env_num, 7] all zeros for initial physics simulation
+        dummy = np.zeros((env_num, 7))
+        for _ in range(5):
+            obs, _, _, _ = env.step(dummy)
+
+        if sim_states is not None:
+            sim_state = env.get_sim_state()
+            for k in range(env_num):
+                if episodes[k] < n_episodes:
+                    sim_states[episodes[k]].append(sim_state[k])
+        failures = env.pop_worker_failures()
+
+        while steps < cfg.eval.max_steps:
+            steps += 1
+
+            data = to_tensor_obs(obs, env.get_obs_batch())
+            actions = algo.policy.get_action(data)
+
+            obs, reward, done, info = env.step(actions)
+
+            # record the sim states for replay purpose
+            if sim_states is not None:
+                sim_state = env.get_sim_state()
+                for k in range(env_num):
+                    if episodes[k] < n_episodes:
+                        sim_states[episodes[k]].append(sim_state[k])
+            if video_writer is not None:
+                for k in range(env_num):
+                    if episodes[k] < n_episodes:
+                        video_writer.append_obs(obs[k], dones[k], idx=episodes[k])
+            # an env that fails after its episode succeeded keeps the success
+            for k, error in env.pop_worker_failures().items():
+                if not dones[k]:
+                    failures[k] = error
+
+            # check whether succeed
+            for k in range(env_num):
+                dones[k] = dones[k] or done[k] or k in failures
+
+            if all(dones):
+                break
+
+        # a new form of success record
+        for k in range(env_num):
+            if episodes[k] >= n_episodes:
+                continue
+            if k in failures:
+                if sim_states is not None:
+                    sim_states[episodes[k]].clear()
+                if records.retry(0, episodes[k], failures[k]):
+                    episode_queue.append(episodes[k])
+            else:
+                records.add(0, episodes[k], dones[k])
+        if records.stopped[0]:
+            break
+    return records
+
+
+def run_episode_pool(
+    cfg,
+    algo,
+    env,
+    slot_tasks,
+    init_states,
+    task_embs,
+    n_episodes,
+    sim_states=None,
+    stop_fn=None,
+    task_ids=None,
+):
+    """
+    Run n_episodes evaluation episodes of every task on a pool of envs and
+    return their EpisodeResults.
+    Instead of lockstep waves, only the live envs are stepped. As soon as an
+    env succeeds or runs out of steps, it pulls the next init state of its
+    task from the queue and the policy history of its batch row is reset, so
+    the workers stay busy until the episode budget is consumed. Episode e of
+    task t starts from init_states[t][e % len(init_states[t])], as in the
+    lockstep loop.
+    slot_tasks: the task index of every env, an env only runs episodes of its
+                task, while a single policy forward pass serves all the envs
+    init_states, task_embs: one entry per task
+    sim_states: if not None, sim_states[t][e] collects the simulated states
+                of episode e of task t
+    stop_fn:    if not None, the sequential stopping rule of every task, see
+                make_early_stop_fn. The running episodes of a stopped task
+                are dropped.
+    task_ids:   the id of every task, for the failures of EpisodeResults
+    An episode whose env worker failed goes back to the front of the queue of
+    its task, to be run again from the same init state.
+    """
+    env_num = len(slot_tasks)
+    pool = EpisodePool(
+        cfg, env, slot_tasks, init_states, n_episodes, sim_states, stop_fn, task_ids
+    )
+    live, obs = pool.live, pool.obs
+    to_tensor_obs = TensorObsConverter(
+        cfg, torch.stack([task_embs[t] for t in pool.slot_tasks])
+    )
+
+    def refill(ids):
+        pool.refill(ids, lambda dummy, ids: env.step(dummy, id=ids)[0])
+
+    env.reset()
+    algo.reset()
+    refill(list(range(env_num)))
+
+    while live.any():
+        # retired envs keep their last observation so that the batch layout of
+        # the policy history stays fixed, their actions are dropped
+        data = to_tensor_obs(obs, env.get_obs_batch())
+        actions = algo.policy.get_action(data)
+
+        ids = np.flatnonzero(live)
+        obs[ids], reward, done, info = env.step(actions[ids], id=ids)
+        pool.slot_steps[ids] += 1
+        pool.record_sim_states(ids)
+
+        failures = pool.take_failures(ids)
+        finished = pool.requeue(failures)
+        for k, d in zip(ids, done):
+            if k not in failures and pool.finish(k, d):
+                finished.append(k)
+        live &= ~pool.records.stopped[pool.slot_tasks]
+        if len(finished) > 0:
+            refill(finished)
+            algo.reset(env_ids=finished)
+
+    return pool.records
+
+
+def run_episode_pipeline(
+    cfg,
+    algo,
+    env,
+    slot_tasks,
+    init_states,
+    task_embs,
+    n_episodes,
+    sim_states=None,
+    stop_fn=None,
+    task_ids=None,
+):
+    """
+    Same as run_episode_pool, but the envs are split into two halves that are
+    rolled out in turns: while one half steps in the worker processes, the
+    policy computes the actions of the other half from its latest
+    observations, so that policy inference overlaps with physics and
+    rendering. env has to be asynchronous with wait_num=len(env) // 2: the
+    actions of a half are sent with step_async, which does not wait, and
+    step(None) returns as soon as a half is ready. The policy history of each
+    half is swapped in and out with policy.get_history / set_history.
+    A per-phase timing report is printed at the end, and returned as the
+    timing of the EpisodeResults. The halves must not share worker processes
+    (envs_per_process == 1), or they would step one after the other.
+    """
+    assert (
+        getattr(env, "envs_per_process", 1) == 1
+    ), "the pipelined halves would share worker processes, see use_pipelined_rollout"
+    env_num = len(slot_tasks)
+    halves = [np.arange(env_num // 2), np.arange(env_num // 2, env_num)]
+    pool = EpisodePool(
+        cfg, env, slot_tasks, init_states, n_episodes, sim_states, stop_fn, task_ids
+    )
+    live, obs = pool.live, pool.obs
+    to_tensor_obs = [
+        TensorObsConverter(
+            cfg, torch.stack([task_embs[t] for t in pool.slot_tasks[half]])
+        )
+        for half in halves
+    ]
+    # step returns that arrived while waiting for the other half
+    pending = {}
+    timing = pool.records.timing
+    timing.update({"inference": 0.0, "env_wait": 0.0, "refill": 0.0})
+
+    def stash(env_return):
+        obs_, _, done_, info_ = env_return
+        for k in range(len(info_)):
+            pending[info_[k]["env_id"]] = (obs_[k], done_[k])
+
+    def collect(ids):
+        t0 = time.time()
+        while any(k not in pending for k in ids):
+            stash(env.step(None))
+        timing["env_wait"] += time.time() - t0
+        return [pending.pop(k) for k in ids]
+
+    def settle(dummy, ids):
+        env.step_async(dummy, id=ids)
+        return [obs_k for obs_k, _ in collect(ids)]
+
+    def refill(ids):
+        t0, env_wait = time.time(), timing["env_wait"]
+        pool.refill(ids, settle)
+        # the dummy steps count as refilling, not as waiting for the rollout
+        timing["env_wait"] = env_wait
+        timing["refill"] += time.time() - t0
+
+    def launch(h):
+        # retired envs of the half keep their last observation so that the
+        # batch layout of its policy history stays fixed
+        ids = halves[h][live[halves[h]]]
+        if len(ids) == 0:
+            return
+        t0 = time.time()
+        algo.policy.set_history(histories[h])
+        data = to_tensor_obs[h](obs[halves[h]], env.get_obs_batch(halves[h]))
+        actions = algo.policy.get_action(data)
+        histories[h] = algo.policy.get_history()
+        timing["inference"] += time.time() - t0
+        # the half steps while the policy runs on the other half, all the
+        # waiting for it is done by collect in land
+        env.step_async(actions[live[halves[h]]], id=ids)
+
+    def land(h):
+        ids = halves[h][live[halves[h]]]
+        if len(ids) == 0:
+            return
+        finished = []
+        returns = collect(ids)
+        failures = pool.take_failures(ids)
+        for k, (obs_k, d) in zip(ids, returns):
+            obs[k] = obs_k
+            pool.slot_steps[k] += 1
+            if k in failures:
+                continue
+            if pool.records.stopped[pool.slot_tasks[k]]:
+                # the task stopped early while this env was stepping
+                live[k] = False
+            elif pool.finish(k, d):
+                finished.append(k)
+        pool.record_sim_states(ids)
+        finished += pool.requeue(failures)
+        if len(finished) > 0:
+            refill(finished)
+            algo.policy.set_history(histories[h])
+            algo.reset(env_ids=[k - halves[h][0] for k in finished])
+            histories[h] = algo.policy.get_history()
+
+    with Timer() as t:
+        env.reset()
+        histories = []
+        for _ in halves:
+            algo.reset()
+            histories.append(algo.policy.get_history())
+        refill(list(range(env_num)))
+
+        launch(0)
+        launch(1)
+        h = 0
+        while live.any():
+            land(h)
+            launch(h)
+            h = 1 - h
+
+    print(
+        f"[info] pipelined rollout takes {t.get_elapsed_time():.1f} seconds: "
+        + f"policy inference {timing['inference']:.1f}, "
+        + f"waiting for envs {timing['env_wait']:.1f}, "
+        + f"refilling envs {timing['refill']:.1f}"
+    )
+    timing["total"] = t.get_elapsed_time()
+    return pool.records
+
+
+def use_pipelined_rollout(cfg, env_num):
+    """
+    Whether to roll out the envs in two pipelined halves, which needs at least
+    two envs in worker processes, one env per process.
+    """
+    if not cfg.eval.get("pipeline", False) or env_num <= 1:
+        return False
+    if cfg.eval.get("envs_per_process", 1) > 1:
+        # the commands of a process run one batch at a time, so halves sharing
+        # processes would not overlap
+        print(
+            "[warning] eval.pipeline needs eval.envs_per_process == 1,"
+            + " rolling out without the pipeline"
+        )
+        return False
+    return True
+
+
 def evaluate_one_task_success(
-    cfg, algo, task, task_emb, task_id, sim_states=None, task_str=""
+    cfg,
+    algo,
+    task,
+    task_emb,
+    task_id,
+    sim_states=None,
+    task_str="",
+    best_success_rate=None,
+    return_num_episodes=False,
+    worker_failures=None,
 ):
     """
     Evaluate a single task's success rate
     sim_states: if not None, will keep track of all simulated states during
                 evaluation, mainly for visualization and debugging purpose
     task_str:   the key to access sim_states dictionary
+    best_success_rate: the success rate to beat, e.g. of the best checkpoint
+                so far, used by the sequential stopping of eval.early_stop
+    return_num_episodes: also return the number of episodes actually used,
+                which is less than eval.n_eval if the evaluation stopped early
+    worker_failures: if not None, the failed env worker attempts of the
+                evaluation are appended to it, see EpisodeResults
     """
     with Timer() as t:
         if cfg.lifelong.algo == "PackNet":  # need preprocess weights for PackNet
@@ -64,107 +1015,234 @@ def evaluate_one_task_success(
 
         algo.eval()
         env_num = min(cfg.eval.num_procs, cfg.eval.n_eval) if cfg.eval.use_mp else 1
-        eval_loop_num = (cfg.eval.n_eval + env_num - 1) // env_num
 
-        # initiate evaluation envs
-        env_args = {
-            "bddl_file_name": os.path.join(
-                cfg.bddl_folder, task.problem_folder, task.bddl_file
-            ),
-            "camera_heights": cfg.data.img_h,
-            "camera_widths": cfg.data.img_w,
-        }
-
-        env_num = min(cfg.eval.num_procs, cfg.eval.n_eval) if cfg.eval.use_mp else 1
-        eval_loop_num = (cfg.eval.n_eval + env_num - 1) // env_num
+        env_args = get_eval_env_args(cfg, task)
+        init_states = load_init_states(cfg, task)
+        if task_str == "":
+            sim_states = None
 
-        # Try to handle the frame buffer issue
-        env_creation = False
+        pipeline = use_pipelined_rollout(cfg, env_num)
+        continuous_pool = cfg.eval.get("continuous_pool", False)
+        persistent_pool = cfg.eval.get("persistent_pool", False)
+        rollout = "pipeline" if pipeline else "pool" if continuous_pool else "waves"
 
-        count = 0
-        while not env_creation and count < 5:
-            try:
-                if env_num == 1:
-                    env = DummyVectorEnv(
-                        [lambda: OffScreenRenderEnv(**env_args) for _ in range(env_num)]
-                    )
-                else:
-                    env = SubprocVectorEnv(
-                        [lambda: OffScreenRenderEnv(**env_args) for _ in range(env_num)]
-                    )
-                env_creation = True
-            except:
-                time.sleep(5)
-                count += 1
-        if count >= 5:
-            raise Exception("Failed to create environment")
-
-        ### Evaluation loop
-        # get fixed init states to control the experiment randomness
-        init_states_path = os.path.join(
-            cfg.init_states_folder, task.problem_folder, task.init_states_file
-        )
-        init_states = torch.load(init_states_path)
-        num_success = 0
-        for i in range(eval_loop_num):
-            env.reset()
-            indices = np.arange(i * env_num, (i + 1) * env_num) % init_states.shape[0]
-            init_states_ = init_states[indices]
-
-            dones = [False] * env_num
-            steps = 0
-            algo.reset()
-            obs = env.set_init_state(init_states_)
+        # the cache is skipped when simulation states are recorded
+        cache = get_eval_result_cache(cfg) if sim_states is None else None
+        cached = None
+        if cache is not None:
+            cache_key = eval_cache_key(
+                cfg,
+                policy_digest(algo.policy),
+                env_args,
+                init_states,
+                cfg.eval.n_eval,
+                best_success_rate,
+                rollout=rollout,
+                env_num=env_num,
+                persistent_pool=persistent_pool,
+            )
+            cached = cache.get(cache_key)
 
-            # dummy actions [env_num, 7] all zeros for initial physics simulation
-            dummy = np.zeros((env_num, 7))
-            for _ in range(5):
-                obs, _, _, _ = env.step(dummy)
+        if cached is not None:
+            num_success, num_episodes = cached
+        else:
+            # initiate evaluation envs
+            wait_num = env_num // 2 if pipeline else None
+            if persistent_pool:
+                env = get_eval_env_pool(cfg).get(env_args, env_num, wait_num)
+            else:
+                env = create_eval_env(cfg, env_args, env_num, wait_num)
 
-            if task_str != "":
-                sim_state = env.get_sim_state()
-                for k in range(env_num):
-                    if i * env_num + k < cfg.eval.n_eval and sim_states is not None:
-                        sim_states[i * env_num + k].append(sim_state[k])
+            ### Evaluation loop
+            if pipeline or continuous_pool:
+                run_episodes = run_episode_pipeline if pipeline else run_episode_pool
+                records = run_episodes(
+                    cfg,
+                    algo,
+                    env,
+                    [0] * env_num,
+                    [init_states],
+                    [task_emb],
+                    cfg.eval.n_eval,
+                    sim_states=None if sim_states is None else [sim_states],
+                    stop_fn=make_early_stop_fn(cfg, best_success_rate),
+                    task_ids=[task_id],
+                )
+            else:
+                records = run_episode_waves(
+                    cfg,
+                    algo,
+                    env,
+                    env_num,
+                    init_states,
+                    task_emb,
+                    cfg.eval.n_eval,
+                    sim_states=sim_states,
+                    stop_fn=make_early_stop_fn(cfg, best_success_rate),
+                    task_ids=[task_id],
+                )
+            if not persistent_pool:
+                env.close()
+                gc.collect()
+            num_success = records.num_success()[0]
+            num_episodes = records.num_episodes[0]
+            if worker_failures is not None:
+                worker_failures.extend(records.failures)
+            if cache is not None and not records.lost_episodes():
+                cache.put(cache_key, num_success, num_episodes)
+        success_rate = num_success / num_episodes
+    print(
+        f"[info] evaluate task {task_id} takes {t.get_elapsed_time():.1f} seconds"
+        + f" for {num_episodes}/{cfg.eval.n_eval} episodes"
+        + (" (cached)" if cached is not None else "")
+    )
+    if return_num_episodes:
+        return success_rate, num_episodes
+    return success_rate
 
-            while steps < cfg.eval.max_steps:
-                steps += 1
 
-                data = raw_obs_to_tensor_obs(obs, task_emb, cfg)
-                actions = algo.policy.get_action(data)
+def evaluate_tasks_success(
+    cfg,
+    algo,
+    benchmark,
+    task_ids,
+    result_summary=None,
+    return_num_episodes=False,
+    worker_failures=None,
+):
+    """
+    Evaluate the success rate for all task in task_ids at once, in a single
+    vector env whose workers are split between the tasks. The task embeddings
+    of the envs are stacked, so one policy forward pass serves all the tasks.
+    If there are more tasks than eval.num_procs, they are evaluated in groups
+    of eval.num_procs tasks.
+    return_num_episodes, worker_failures: see evaluate_one_task_success, the
+    numbers of episodes are returned per task
+    """
+    with Timer() as t:
+        algo.eval()
+        persistent_pool = cfg.eval.get("persistent_pool", False)
+        num_success = np.zeros(len(task_ids))
+        num_episodes = np.zeros(len(task_ids), dtype=int)
 
-                obs, reward, done, info = env.step(actions)
+        # look up the cached results first, only the other tasks are rolled out
+        cache = get_eval_result_cache(cfg) if result_summary is None else None
+        cache_keys = {}
+        pending = list(range(len(task_ids)))
+        if cache is not None:
+            digest = policy_digest(algo.policy)
+            # the split of the workers between the tasks of a group is treated
+            # as equivalent, only whether the groups are pipelined is kept
+            pipeline = (
+                cfg.eval.get("pipeline", False)
+                and cfg.eval.get("envs_per_process", 1) == 1
+            )
+            pending = []
+            for j, i in enumerate(task_ids):
+                task = benchmark.get_task(i)
+                cache_keys[j] = eval_cache_key(
+                    cfg,
+                    digest,
+                    get_eval_env_args(cfg, task),
+                    load_init_states(cfg, task),
+                    cfg.eval.n_eval,
+                    rollout="cross_task_pipeline" if pipeline else "cross_task",
+                    env_num=cfg.eval.num_procs,
+                    persistent_pool=persistent_pool,
+                )
+                cached = cache.get(cache_keys[j])
+                if cached is None:
+                    pending.append(j)
+                else:
+                    num_success[j], num_episodes[j] = cached
 
-                # record the sim states for replay purpose
-                if task_str != "":
-                    sim_state = env.get_sim_state()
-                    for k in range(env_num):
-                        if i * env_num + k < cfg.eval.n_eval and sim_states is not None:
-                            sim_states[i * env_num + k].append(sim_state[k])
+        for g in range(0, len(pending), cfg.eval.num_procs):
+            group = pending[g : g + cfg.eval.num_procs]
+            group_ids = [task_ids[j] for j in group]
+            envs_per_task = max(
+                1, min(cfg.eval.n_eval, cfg.eval.num_procs // len(group_ids))
+            )
+            slot_tasks = np.repeat(np.arange(len(group_ids)), envs_per_task)
+            tasks = [benchmark.get_task(i) for i in group_ids]
+            env_args = [get_eval_env_args(cfg, tasks[k]) for k in slot_tasks]
 
-                # check whether succeed
-                for k in range(env_num):
-                    dones[k] = dones[k] or done[k]
+            env_num = len(slot_tasks)
+            pipeline = use_pipelined_rollout(cfg, env_num)
+            wait_num = env_num // 2 if pipeline else None
+            if persistent_pool:
+                env = get_eval_env_pool(cfg).get(env_args, env_num, wait_num)
+            else:
+                env = create_eval_env(cfg, env_args, env_num, wait_num)
 
-                if all(dones):
-                    break
+            sim_states = None
+            if result_summary is not None:
+                sim_states = [
+                    result_summary[f"k{task_ids[-1]}_p{i}"] for i in group_ids
+                ]
+            run_episodes = run_episode_pipeline if pipeline else run_episode_pool
+            records = run_episodes(
+                cfg,
+                algo,
+                env,
+                slot_tasks,
+                [load_init_states(cfg, task) for task in tasks],
+                [benchmark.get_task_emb(i) for i in group_ids],
+                cfg.eval.n_eval,
+                sim_states=sim_states,
+                stop_fn=make_early_stop_fn(cfg),
+                task_ids=group_ids,
+            )
+            group_success = records.num_success()
+            group_episodes = records.num_episodes
+            num_success[group] = group_success
+            num_episodes[group] = group_episodes
+            if worker_failures is not None:
+                worker_failures.extend(records.failures)
+            if cache is not None and not records.lost_episodes():
+                for k, j in enumerate(group):
+                    cache.put(cache_keys[j], group_success[k], group_episodes[k])
+            if not persistent_pool:
+                env.close()
+                gc.collect()
+    print(
+        f"[info] evaluate tasks {task_ids} takes {t.get_elapsed_time():.1f} seconds"
+        + f" for {num_episodes.sum()}/{len(task_ids) * cfg.eval.n_eval} episodes"
+        + f" ({len(task_ids) - len(pending)} cached)"
+    )
+    if return_num_episodes:
+        return num_success / num_episodes, num_episodes
+    return num_success / num_episodes
 
-            # a new form of success record
-            for k in range(env_num):
-                if i * env_num + k < cfg.eval.n_eval:
-                    num_success += int(dones[k])
 
-        success_rate = num_success / cfg.eval.n_eval
-        env.close()
-        gc.collect()
-    print(f"[info] evaluate task {task_id} takes {t.get_elapsed_time():.1f} seconds")
-    return success_rate
+def use_cross_task_eval(cfg, task_ids):
+    """
+    Whether to evaluate task_ids in a single vector env. PackNet is excluded,
+    as it evaluates every task with a different set of weights.
+    """
+    return (
+        cfg.eval.get("cross_task", False)
+        and cfg.eval.use_mp
+        and len(task_ids) > 1
+        and cfg.lifelong.algo != "PackNet"
+    )
 
 
-def evaluate_success(cfg, algo, benchmark, task_ids, result_summary=None):
+def evaluate_success(
+    cfg, algo, benchmark, task_ids, result_summary=None, worker_failures=None
+):
     """
     Evaluate the success rate for all task in task_ids.
+    worker_failures: see evaluate_one_task_success
     """
+    if use_cross_task_eval(cfg, task_ids):
+        return evaluate_tasks_success(
+            cfg,
+            algo,
+            benchmark,
+            task_ids,
+            result_summary=result_summary,
+            worker_failures=worker_failures,
+        )
     algo.eval()
     successes = []
     for i in task_ids:
@@ -173,26 +1251,244 @@ def evaluate_success(cfg, algo, benchmark, task_ids, result_summary=None):
         task_str = f"k{task_ids[-1]}_p{i}"
         curr_summary = result_summary[task_str] if result_summary is not None else None
         success_rate = evaluate_one_task_success(
-            cfg, algo, task_i, task_emb, i, sim_states=curr_summary, task_str=task_str
+            cfg,
+            algo,
+            task_i,
+            task_emb,
+            i,
+            sim_states=curr_summary,
+            task_str=task_str,
+            worker_failures=worker_failures,
         )
         successes.append(success_rate)
     return np.array(successes)
 
 
-def evaluate_multitask_training_success(cfg, algo, benchmark, task_ids):
+def evaluate_multitask_training_success(
+    cfg, algo, benchmark, task_ids, return_num_episodes=False, worker_failures=None
+):
     """
     Evaluate the success rate for all task in task_ids.
+    return_num_episodes, worker_failures: see evaluate_tasks_success
     """
+    if use_cross_task_eval(cfg, task_ids):
+        return evaluate_tasks_success(
+            cfg,
+            algo,
+            benchmark,
+            task_ids,
+            return_num_episodes=return_num_episodes,
+            worker_failures=worker_failures,
+        )
     algo.eval()
     successes = []
+    num_episodes = []
     for i in task_ids:
         task_i = benchmark.get_task(i)
         task_emb = benchmark.get_task_emb(i)
-        success_rate = evaluate_one_task_success(cfg, algo, task_i, task_emb, i)
+        success_rate, n = evaluate_one_task_success(
+            cfg,
+            algo,
+            task_i,
+            task_emb,
+            i,
+            return_num_episodes=True,
+            worker_failures=worker_failures,
+        )
         successes.append(success_rate)
+        num_episodes.append(n)
+    if return_num_episodes:
+        return np.array(successes), np.array(num_episodes)
     return np.array(successes)
 
 
+def _background_eval_worker(
+    cfg, benchmark, shared_state_dict, snapshot_taken, requests, results
+):
+    """
+    The loop of the background evaluator process. For every request it loads
+    the weight snapshot, signals that the snapshot can be overwritten, then
+    runs the rollouts and sends the success rate back.
+    """
+    from libero.lifelong.algos.base import Sequential
+
+    ObsUtils.initialize_obs_utils_with_obs_specs({"obs": cfg.data.obs.modality})
+    algo = safe_device(Sequential(benchmark.n_tasks, cfg), cfg.device)
+    try:
+        while True:
+            request = requests.get()
+            if request is None:
+                break
+            tag, task_ids, best_success_rate = request
+            algo.policy.load_state_dict(shared_state_dict)
+            snapshot_taken.set()
+            worker_failures = []
+            with Timer() as timer:
+                if len(task_ids) == 1:
+                    task_id = task_ids[0]
+                    success_rate, num_episodes = evaluate_one_task_success(
+                        cfg,
+                        algo,
+                        benchmark.get_task(task_id),
+                        benchmark.get_task_emb(task_id),
+                        task_id,
+                        best_success_rate=best_success_rate,
+                        return_num_episodes=True,
+                        worker_failures=worker_failures,
+                    )
+                else:
+                    success_rate, num_episodes = evaluate_multitask_training_success(
+                        cfg,
+                        algo,
+                        benchmark,
+                        task_ids,
+                        return_num_episodes=True,
+                        worker_failures=worker_failures,
+                    )
+            # the worker failures go to the report of the training process
+            results.put(
+                (
+                    tag,
+                    success_rate,
+                    num_episodes,
+                    timer.get_elapsed_time(),
+                    worker_failures,
+                )
+            )
+    finally:
+        close_eval_env_pool()
+
+
+class BackgroundEvaluator:
+    """
+    Runs the closed-loop evaluation in a separate process while training goes
+    on. submit() copies the current weights into a shared-memory state_dict
+    and returns right away; it only blocks while the evaluator has not yet
+    picked up the previous snapshot. Results come back in submission order
+    through poll() and drain(), each with a CPU copy of the evaluated weights
+    so the caller can still checkpoint the best one.
+    worker_failures: if not None, the failed env worker attempts of the
+    evaluations are appended to it as their results come back
+    """
+
+    def __init__(self, cfg, benchmark, policy, worker_failures=None):
+        ctx = mp.get_context("spawn")
+        self.shared_state_dict = {
+            k: v.detach().cpu().clone().share_memory_()
+            for k, v in policy.state_dict().items()
+        }
+        self.snapshot_taken = ctx.Event()
+        self.snapshot_taken.set()
+        self.requests = ctx.Queue()
+        self.results = ctx.Queue()
+        self.snapshots = {}
+        self.worker_failures = worker_failures
+        self.process = ctx.Process(
+            target=_background_eval_worker,
+            args=(
+                cfg,
+                benchmark,
+                self.shared_state_dict,
+                self.snapshot_taken,
+                self.requests,
+                self.results,
+            ),
+        )
+        self.process.start()
+
+    def _check_alive(self):
+        if not self.process.is_alive():
+            raise RuntimeError(
+                f"[error] background evaluator exited with code {self.process.exitcode}"
+            )
+
+    def submit(self, policy, tag, task_ids, best_success_rate=None):
+        while not self.snapshot_taken.wait(timeout=1.0):
+            self._check_alive()
+        self.snapshot_taken.clear()
+        state_dict = {
+            k: v.detach().cpu().clone() for k, v in policy.state_dict().items()
+        }
+        for k, v in state_dict.items():
+            self.shared_state_dict[k].copy_(v)
+        self.snapshots[tag] = state_dict
+        self.requests.put((tag, list(task_ids), best_success_rate))
+
+    def _get(self, block):
+        while True:
+            try:
+                result = self.results.get(block=block, timeout=1.0 if block else None)
+            except queue.Empty:
+                if not block:
+                    return None
+                self._check_alive()
+                continue
+            *result, failures = result
+            if self.worker_failures is not None:
+                self.worker_failures.extend(failures)
+            tag = result[0]
+            return (*result, self.snapshots.pop(tag))
+
+    def poll(self):
+        """
+        Return the finished evaluations, without waiting for the pending ones.
+        """
+        finished = []
+        while len(self.snapshots) > 0:
+            result = self._get(block=False)
+            if result is None:
+                break
+            finished.append(result)
+        return finished
+
+    def drain(self):
+        """
+        Wait for all the pending evaluations and return them.
+        """
+        finished = []
+        while len(self.snapshots) > 0:
+            finished.append(self._get(block=True))
+        return finished
+
+    def close(self):
+        self.requests.put(None)
+        self.process.join(timeout=60)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.snapshots = {}
+
+
+_background_evaluator = None
+
+
+def use_background_eval(cfg):
+    # PackNet evaluates with task-specific masked weights, which the
+    # evaluator process does not reproduce
+    return cfg.eval.get("async_eval", False) and cfg.lifelong.algo != "PackNet"
+
+
+def get_background_evaluator(cfg, benchmark, policy, worker_failures=None):
+    """
+    Return the background evaluator of this run, start it if needed.
+    """
+    global _background_evaluator
+    if _background_evaluator is None:
+        _background_evaluator = BackgroundEvaluator(
+            cfg, benchmark, policy, worker_failures=worker_failures
+        )
+    return _background_evaluator
+
+
+def close_background_evaluator():
+    """
+    Stop the background evaluator process, if there is one.
+    """
+    global _background_evaluator
+    if _background_evaluator is not None:
+        _background_evaluator.close()
+        _background_evaluator = None
+
+
 @torch.no_grad()
 def evaluate_loss(cfg, algo, benchmark, datasets):
     """
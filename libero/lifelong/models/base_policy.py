@@ -118,8 +118,24 @@ class BasePolicy(nn.Module, metaclass=PolicyMeta):
         loss = self.policy_head.loss_fn(dist, data["actions"], reduction)
         return loss
 
-    def reset(self):
+    def reset(self, env_ids=None):
         """
         Clear all "history" of the policy if there exists any.
+        If env_ids is given, only the history of these batch rows is cleared,
+        so that a finished env can start a new episode while the others keep
+        going.
+        """
+        pass
+
+    def get_history(self):
+        """
+        Return the "history" of the policy. Together with set_history, this
+        allows to roll out several batches of envs in turns with one policy.
+        """
+        return None
+
+    def set_history(self, history):
+        """
+        Restore a "history" returned by get_history.
         """
         pass
@@ -206,6 +206,17 @@ class BCRNNPolicy(BasePolicy):
         action = dist.sample().detach().cpu()
         return action.view(action.shape[0], -1).numpy()
 
-    def reset(self):
-        self.eval_h0 = None
-        self.eval_c0 = None
+    def reset(self, env_ids=None):
+        if env_ids is None or self.eval_h0 is None:
+            self.eval_h0 = None
+            self.eval_c0 = None
+            return
+        env_ids = torch.as_tensor(env_ids, dtype=torch.long)
+        self.eval_h0[:, env_ids] = 0.0
+        self.eval_c0[:, env_ids] = 0.0
+
+    def get_history(self):
+        return self.eval_h0, self.eval_c0
+
+    def set_history(self, history):
+        self.eval_h0, self.eval_c0 = history
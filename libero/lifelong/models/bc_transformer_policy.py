@@ -161,6 +161,22 @@ class PerturbationAttention:
         return attn_
 
 
+def align_latent_history(x, history_len):
+    """
+    Rolls every row of the latent history x (B, T, ...) to the left so that
+    its last history_len[b] valid steps start at position 0. Since the
+    temporal transformer is causal, the output at index history_len[b] - 1
+    then only depends on the episode the row currently belongs to.
+    Returns the aligned latents and the index to read the output from.
+    """
+    B, T = x.shape[:2]
+    history_len = history_len.to(x.device)
+    steps = torch.arange(T, device=x.device)
+    idx = (T - history_len.unsqueeze(1) + steps.unsqueeze(0)) % T  # (B, T)
+    rows = torch.arange(B, device=x.device).unsqueeze(1)
+    return x[rows, idx], history_len - 1
+
+
 ###############################################################################
 #
 # A Transformer Policy
@@ -241,6 +257,7 @@ class BCTransformerPolicy(BasePolicy):
 
         self.latent_queue = []
         self.max_seq_len = policy_cfg.transformer_max_seq_len
+        self.history_len = None
 
     def temporal_encode(self, x):
         pos_emb = self.temporal_position_encoding_fn(x)
@@ -295,10 +312,34 @@ class BCTransformerPolicy(BasePolicy):
             if len(self.latent_queue) > self.max_seq_len:
                 self.latent_queue.pop(0)
             x = torch.cat(self.latent_queue, dim=1)  # (B, T, H_all)
-            x = self.temporal_encode(x)
-            dist = self.policy_head(x[:, -1])
+            if self.history_len is None:
+                x = self.temporal_encode(x)
+                dist = self.policy_head(x[:, -1])
+            else:
+                self.history_len = torch.clamp(
+                    self.history_len + 1, max=len(self.latent_queue)
+                )
+                x, last_idx = align_latent_history(x, self.history_len)
+                x = self.temporal_encode(x)
+                dist = self.policy_head(x[torch.arange(x.shape[0]), last_idx])
+                if bool((self.history_len == len(self.latent_queue)).all()):
+                    self.history_len = None
         action = dist.sample().detach().cpu()
         return action.view(action.shape[0], -1).numpy()
 
-    def reset(self):
-        self.latent_queue = []
+    def reset(self, env_ids=None):
+        if env_ids is None or len(self.latent_queue) == 0:
+            self.latent_queue = []
+            self.history_len = None
+            return
+        if self.history_len is None:
+            self.history_len = torch.full(
+                (self.latent_queue[0].shape[0],), len(self.latent_queue)
+            )
+        self.history_len[torch.as_tensor(env_ids, dtype=torch.long)] = 0
+
+    def get_history(self):
+        return self.latent_queue, self.history_len
+
+    def set_history(self, history):
+        self.latent_queue, self.history_len = history
@@ -8,7 +8,10 @@ from libero.lifelong.models.modules.language_modules import *
 from libero.lifelong.models.modules.transformer_modules import *
 from libero.lifelong.models.base_policy import BasePolicy
 from libero.lifelong.models.policy_head import *
-from libero.lifelong.models.bc_transformer_policy import ExtraModalityTokens
+from libero.lifelong.models.bc_transformer_policy import (
+    ExtraModalityTokens,
+    align_latent_history,
+)
 
 
 ###############################################################################
@@ -139,6 +142,7 @@ class BCViLTPolicy(BasePolicy):
 
         self.latent_queue = []
         self.max_seq_len = policy_cfg.transformer_max_seq_len
+        self.history_len = None
 
         ### 8. reshape transform for attention visualization
         self.reshape_transform = lambda x: reshape_transform(
@@ -224,10 +228,34 @@ class BCViLTPolicy(BasePolicy):
             if len(self.latent_queue) > self.max_seq_len:
                 self.latent_queue.pop(0)
             x = torch.cat(self.latent_queue, dim=1)  # (B, T, H_all)
-            x = self.temporal_encode(x)
-            dist = self.policy_head(x[:, -1])
+            if self.history_len is None:
+                x = self.temporal_encode(x)
+                dist = self.policy_head(x[:, -1])
+            else:
+                self.history_len = torch.clamp(
+                    self.history_len + 1, max=len(self.latent_queue)
+                )
+                x, last_idx = align_latent_history(x, self.history_len)
+                x = self.temporal_encode(x)
+                dist = self.policy_head(x[torch.arange(x.shape[0]), last_idx])
+                if bool((self.history_len == len(self.latent_queue)).all()):
+                    self.history_len = None
         action = dist.sample().detach().cpu()
         return action.view(action.shape[0], -1).numpy()
 
-    def reset(self):
-        self.latent_queue = []
+    def reset(self, env_ids=None):
+        if env_ids is None or len(self.latent_queue) == 0:
+            self.latent_queue = []
+            self.history_len = None
+            return
+        if self.history_len is None:
+            self.history_len = torch.full(
+                (self.latent_queue[0].shape[0],), len(self.latent_queue)
+            )
+        self.history_len[torch.as_tensor(env_ids, dtype=torch.long)] = 0
+
+    def get_history(self):
+        return self.latent_queue, self.history_len
+
+    def set_history(self, history):
+        self.latent_queue, self.history_len = history
@@ -45,9 +45,13 @@ class NpEncoder(json.JSONEncoder):
 
 
 def torch_save_model(model, model_path, cfg=None, previous_masks=None):
+    torch_save_state_dict(model.state_dict(), model_path, cfg, previous_masks)
+
+
+def torch_save_state_dict(state_dict, model_path, cfg=None, previous_masks=None):
     torch.save(
         {
-            "state_dict": model.state_dict(),
+            "state_dict": state_dict,
             "cfg": cfg,
             "previous_masks": previous_masks,
         },
@@ -94,6 +98,21 @@ def confidence_interval(p, n):
     return 1.96 * np.sqrt(p * (1 - p) / n)
 
 
+def wilson_interval(num_success, n, z=1.96):
+    """
+    Wilson score interval (low, high) of a success rate. Unlike the Wald
+    interval of confidence_interval, it does not collapse for 0/n and n/n,
+    so it can be used to decide when to stop rolling out episodes.
+    """
+    if n == 0:
+        return 0.0, 1.0
+    p = num_success / n
+    denom = 1 + z**2 / n
+    center = (p + z**2 / (2 * n)) / denom
+    half_width = z * np.sqrt(p * (1 - p) / n + z**2 / (4 * n**2)) / denom
+    return max(0.0, center - half_width), min(1.0, center + half_width)
+
+
 def compute_flops(algo, dataset, cfg):
     model = copy.deepcopy(algo.policy)
     tmp_loader = DataLoader(dataset, batch_size=1, num_workers=0, shuffle=True)
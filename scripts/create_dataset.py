@@ -151,6 +151,7 @@ def main():
         env.reset_from_xml_string(model_xml)
         env.sim.reset()
         env.sim.set_state_from_flattened(states[init_idx])
+        env.invalidate_sim_caches()
         env.sim.forward()
         model_xml = env.sim.model.get_xml()
 
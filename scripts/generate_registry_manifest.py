@@ -0,0 +1,129 @@
+"""
+Generate libero/libero/envs/registry_manifest.py, the static manifest of the
+object categories and problem classes registered by the modules of
+libero.libero.envs.objects and libero.libero.envs.problems. It is read from
+the sources, without importing them. Run it again after adding or renaming
+an object or a problem class.
+"""
+import ast
+import json
+import os
+import re
+
+ENVS_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "../libero/libero/envs"
+)
+ENVS_PACKAGE = "libero.libero.envs"
+
+
+def object_key(class_name):
+    # same as libero.libero.envs.base_object.register_object
+    return "_".join(re.sub(r"([A-Z0-9])", r" \1", class_name).split()).lower()
+
+
+def problem_key(class_name):
+    # same as libero.libero.envs.bddl_base_domain.register_problem
+    return class_name.lower()
+
+
+def format_value(value):
+    """Format a list or a dict of strings the way black would."""
+    if isinstance(value, dict):
+        items = [
+            f"{json.dumps(k)}: {json.dumps(v)}" for k, v in sorted(value.items())
+        ]
+        brackets = "{}"
+    else:
+        items = [json.dumps(v) for v in value]
+        brackets = "[]"
+    if len(items) == 0:
+        return brackets
+    lines = [brackets[0]] + [f"    {item}," for item in items] + [brackets[1]]
+    return "\n".join(lines)
+
+
+def decorator_names(node):
+    names = []
+    for decorator in node.decorator_list:
+        if isinstance(decorator, ast.Name):
+            names.append(decorator.id)
+        elif isinstance(decorator, ast.Attribute):
+            names.append(decorator.attr)
+    return names
+
+
+def scan_package(subpackage):
+    """
+    Yields (module name, parsed module) of the modules of a subpackage of
+    libero.libero.envs.
+    """
+    folder = os.path.join(ENVS_DIR, subpackage)
+    for file_name in sorted(os.listdir(folder)):
+        if not file_name.endswith(".py") or file_name == "__init__.py":
+            continue
+        with open(os.path.join(folder, file_name), "r") as f:
+            tree = ast.parse(f.read())
+        yield f"{ENVS_PACKAGE}.{subpackage}.{file_name[:-3]}", tree
+
+
+def main():
+    objects = {}
+    visual_change_objects = []
+    object_modules = []
+    for module, tree in scan_package("objects"):
+        registered = False
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef):
+                decorators = decorator_names(node)
+                if "register_object" in decorators:
+                    objects[object_key(node.name)] = f"{module}:{node.name}"
+                    registered = True
+                if "register_visual_change_object" in decorators:
+                    visual_change_objects.append(object_key(node.name))
+            # explicit OBJECTS_DICT["key"] = Class entries
+            elif (
+                isinstance(node, ast.Assign)
+                and isinstance(node.targets[0], ast.Subscript)
+                and isinstance(node.targets[0].value, ast.Name)
+                and node.targets[0].value.id == "OBJECTS_DICT"
+                and isinstance(node.value, ast.Name)
+            ):
+                key = ast.literal_eval(node.targets[0].slice)
+                objects[key] = f"{module}:{node.value.id}"
+                registered = True
+        if registered:
+            object_modules.append(module)
+
+    problems = {}
+    problem_modules = []
+    for module, tree in scan_package("problems"):
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef):
+                if "register_problem" in decorator_names(node):
+                    problems[problem_key(node.name)] = f"{module}:{node.name}"
+                    if module not in problem_modules:
+                        problem_modules.append(module)
+
+    manifest_path = os.path.join(ENVS_DIR, "registry_manifest.py")
+    with open(manifest_path, "w") as f:
+        f.write(
+            '"""\nGenerated by scripts/generate_registry_manifest.py, do not edit.\n'
+            + "Maps the registered object categories and problem names to the\n"
+            + '"module:class" that registers them, see base_object.LazyRegistry.\n"""\n'
+        )
+        for name, value in [
+            ("OBJECT_MODULES", object_modules),
+            ("OBJECT_MANIFEST", objects),
+            ("VISUAL_CHANGE_OBJECTS", sorted(visual_change_objects)),
+            ("PROBLEM_MODULES", problem_modules),
+            ("PROBLEM_MANIFEST", problems),
+        ]:
+            f.write(f"\n{name} = {format_value(value)}\n")
+    print(
+        f"[info] {len(objects)} objects and {len(problems)} problems"
+        + f" written to {os.path.normpath(manifest_path)}"
+    )
+
+
+if __name__ == "__main__":
+    main()
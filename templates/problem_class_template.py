@@ -141,11 +141,10 @@ class YOUR_CLASS_NAME(BDDLBaseDomain):
         """
         Check if the goal is achieved. Consider conjunction goals at the moment
         """
-        goal_state = self.parsed_problem["goal_state"]
-        result = True
-        for state in goal_state:
-            result = self._eval_predicate(state) and result
-        return result
+        for predicate in self.goal_predicates:
+            if not predicate():
+                return False
+        return True
 
     def _eval_predicate(self, state):
         """Evaluate each predicate. For the moment, we only consider unary and binary predicates."""
@@ -171,27 +170,6 @@ class YOUR_CLASS_NAME(BDDLBaseDomain):
         """Set up references for the objects. Add extra implementation here if the method in the parent class is not sufficient."""
         super()._setup_references()
 
-    def _post_process(self):
-        """Post process the simulation step. Mainly for handling site visualization."""
-        super()._post_process()
-
-        self.set_visualization()
-
-    def set_visualization(self):
-        """Set the visualization of the objects in the scene."""
-        for object_name in self.visualization_sites_list:
-            for _, (site_name, site_visible) in (
-                self.get_object(object_name).object_properties["vis_site_names"].items()
-            ):
-                vis_g_id = self.sim.model.site_name2id(site_name)
-                if ((self.sim.model.site_rgba[vis_g_id][3] <= 0) and site_visible) or (
-                    (self.sim.model.site_rgba[vis_g_id][3] > 0) and not site_visible
-                ):
-                    # We toggle the alpha value
-                    self.sim.model.site_rgba[vis_g_id][3] = (
-                        1 - self.sim.model.site_rgba[vis_g_id][3]
-                    )
-
     def _setup_camera(self, mujoco_arena):
         """Configure the camera as the workspace observation."""
         mujoco_arena.set_camera(
@@ -0,0 +1,169 @@
+import glob
+import os
+
+import pytest
+
+bddl_utils = pytest.importorskip("libero.libero.envs.bddl_utils")
+from bddl.parsing import package_predicates, scan_tokens
+
+import libero.libero
+
+BDDL_FILES = sorted(
+    glob.glob(
+        os.path.join(
+            os.path.dirname(libero.libero.__file__), "bddl_files", "**", "*.bddl"
+        ),
+        recursive=True,
+    )
+)
+
+
+# The parser of the BDDL problem files before it was made non-destructive,
+# which consumed the tokens while reading them.
+def old_get_regions(t, regions, group):
+    group.pop(0)
+    while group:
+        region = group.pop(0)
+        region_name = region[0]
+        target_name = None
+        region_dict = {
+            "target": None,
+            "ranges": [],
+            "extra": [],
+            "yaw_rotation": [0, 0],
+            "rgba": [0, 0, 1, 0],
+        }
+        for attribute in region[1:]:
+            if attribute[0] == ":target":
+                region_dict["target"] = attribute[1]
+                target_name = attribute[1]
+            elif attribute[0] == ":ranges":
+                for rect_range in attribute[1]:
+                    region_dict["ranges"].append([float(x) for x in rect_range])
+            elif attribute[0] == ":yaw_rotation":
+                for value in attribute[1]:
+                    region_dict["yaw_rotation"] = [eval(x) for x in value]
+            elif attribute[0] == ":rgba":
+                region_dict["rgba"] = [float(x) for x in attribute[1]]
+            else:
+                raise NotImplementedError
+        regions[target_name + "_" + region_name] = region_dict
+
+
+def old_robosuite_parse_problem(problem_filename):
+    tokens = scan_tokens(filename=problem_filename)
+    assert tokens.pop(0) == "define"
+    problem_name = "unknown"
+    objects = {}
+    obj_of_interest = []
+    initial_state = []
+    goal_state = []
+    fixtures = {}
+    regions = {}
+    language_instruction = ""
+    while tokens:
+        group = tokens.pop()
+        t = group[0]
+        if t == "problem":
+            problem_name = group[-1]
+        elif t == ":objects":
+            group.pop(0)
+            object_list = []
+            while group:
+                if group[0] == "-":
+                    group.pop(0)
+                    objects[group.pop(0)] = object_list
+                    object_list = []
+                else:
+                    object_list.append(group.pop(0))
+            if object_list:
+                if not "object" in objects:
+                    objects["object"] = []
+                objects["object"] += object_list
+        elif t == ":obj_of_interest":
+            group.pop(0)
+            while group:
+                obj_of_interest.append(group.pop(0))
+        elif t == ":fixtures":
+            group.pop(0)
+            fixture_list = []
+            while group:
+                if group[0] == "-":
+                    group.pop(0)
+                    fixtures[group.pop(0)] = fixture_list
+                    fixture_list = []
+                else:
+                    fixture_list.append(group.pop(0))
+            if fixture_list:
+                if not "fixture" in fixtures:
+                    fixtures["fixture"] = []
+                fixtures["fixture"] += fixture_list
+        elif t == ":regions":
+            old_get_regions(t, regions, group)
+        elif t == ":language":
+            group.pop(0)
+            language_instruction = group
+        elif t == ":init":
+            group.pop(0)
+            initial_state = group
+        elif t == ":goal":
+            package_predicates(group[1], goal_state, "", "goals")
+    return {
+        "problem_name": problem_name,
+        "fixtures": fixtures,
+        "regions": regions,
+        "objects": objects,
+        "scene_properties": {},
+        "initial_state": initial_state,
+        "goal_state": goal_state,
+        "language_instruction": language_instruction,
+        "obj_of_interest": obj_of_interest,
+    }
+
+
+def test_bddl_files_found():
+    assert len(BDDL_FILES) > 100
+
+
+@pytest.mark.parametrize(
+    "problem_filename", BDDL_FILES, ids=lambda path: os.path.basename(path)
+)
+def test_parse_matches_old_parser(problem_filename):
+    expected = old_robosuite_parse_problem(problem_filename)
+    assert bddl_utils.robosuite_parse_problem(problem_filename) == expected
+    # parsed again from the cache
+    assert bddl_utils.robosuite_parse_problem(problem_filename) == expected
+
+    info = bddl_utils.get_problem_info(problem_filename)
+    assert info["problem_name"] == expected["problem_name"]
+    assert info["domain_name"] == "robosuite"
+    assert info["language_instruction"] == " ".join(
+        expected["language_instruction"]
+    )
+
+
+def test_parse_keeps_tokens():
+    problem_filename = BDDL_FILES[0]
+    tokens = bddl_utils.scan_bddl_file(problem_filename)
+    expected = scan_tokens(filename=problem_filename)
+    assert tokens == expected
+    bddl_utils.robosuite_parse_problem(problem_filename)
+    bddl_utils.get_problem_info(problem_filename)
+    assert bddl_utils.scan_bddl_file(problem_filename) == expected
+
+
+def test_parse_returns_copies():
+    problem_filename = BDDL_FILES[0]
+    parsed = bddl_utils.robosuite_parse_problem(problem_filename)
+    parsed["objects"].clear()
+    parsed["initial_state"].append(["on", "a", "b"])
+    assert bddl_utils.robosuite_parse_problem(
+        problem_filename
+    ) == old_robosuite_parse_problem(problem_filename)
+
+
+def test_parse_rejects_other_domain(tmp_path):
+    problem_filename = tmp_path / "other.bddl"
+    problem_filename.write_text("(define (problem p) (:domain other))")
+    with pytest.raises(Exception, match="Different domain"):
+        bddl_utils.robosuite_parse_problem(str(problem_filename))
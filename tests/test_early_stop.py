@@ -0,0 +1,73 @@
+import pytest
+
+metric = pytest.importorskip("libero.lifelong.metric")
+from easydict import EasyDict
+
+from libero.lifelong.utils import wilson_interval
+
+
+def make_cfg(**eval_cfg):
+    return EasyDict({"eval": {"n_eval": 20, **eval_cfg}})
+
+
+def test_wilson_interval_no_episodes():
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+
+
+@pytest.mark.parametrize("num_success", [0, 10])
+def test_wilson_interval_does_not_collapse(num_success):
+    low, high = wilson_interval(num_success, 10)
+    assert 0.0 <= low < high <= 1.0
+    assert high - low > 0.2
+
+
+def test_wilson_interval_contains_rate_and_narrows():
+    low, high = wilson_interval(7, 10)
+    assert low < 0.7 < high
+    low_100, high_100 = wilson_interval(70, 100)
+    assert low < low_100 < 0.7 < high_100 < high
+    # symmetric around 1/2
+    low_3, high_3 = wilson_interval(3, 10)
+    assert low_3 == pytest.approx(1 - high)
+    assert high_3 == pytest.approx(1 - low)
+
+
+def test_no_early_stop_by_default():
+    assert metric.make_early_stop_fn(make_cfg()) is None
+    assert metric.make_early_stop_fn(make_cfg(early_stop=False), 0.5) is None
+
+
+def test_stops_once_interval_is_narrow():
+    cfg = make_cfg(
+        early_stop=True, early_stop_min_episodes=10, early_stop_ci_width=0.3
+    )
+    stop_fn = metric.make_early_stop_fn(cfg)
+    # never before the minimum number of episodes
+    assert not stop_fn(0, 0)
+    assert not stop_fn(9, 9)
+    # the interval of 10/10 is about [0.72, 1], of 5/10 about [0.24, 0.76]
+    assert stop_fn(10, 10)
+    assert not stop_fn(5, 10)
+
+
+def test_stops_when_best_cannot_be_beaten():
+    cfg = make_cfg(
+        early_stop=True, early_stop_min_episodes=10, early_stop_ci_width=0.0
+    )
+    stop_fn = metric.make_early_stop_fn(cfg, best_success_rate=0.8)
+    assert not stop_fn(0, 0)
+    # 0/3 can still reach 17/20 > 0.8, 0/4 can only tie it
+    assert not stop_fn(0, 3)
+    assert stop_fn(0, 4)
+    assert not stop_fn(3, 4)
+
+
+def test_stops_when_interval_is_below_best():
+    cfg = make_cfg(
+        n_eval=40, early_stop=True, early_stop_min_episodes=10, early_stop_ci_width=0.0
+    )
+    stop_fn = metric.make_early_stop_fn(cfg, best_success_rate=0.7)
+    # 2/10 can still reach 32/40 = 0.8, but the interval ends at about 0.51
+    assert stop_fn(2, 10)
+    assert not stop_fn(5, 10)
+    assert not metric.make_early_stop_fn(cfg)(2, 10)
@@ -0,0 +1,133 @@
+import copy
+
+import pytest
+
+metric = pytest.importorskip("libero.lifelong.metric")
+import numpy as np
+from easydict import EasyDict
+
+
+@pytest.fixture
+def setup(tmp_path):
+    """The cfg, env_args and init_states of a small evaluation."""
+    bddl_file = tmp_path / "task.bddl"
+    bddl_file.write_text("(define (problem p) (:domain robosuite))")
+    cfg = EasyDict(
+        {
+            "seed": 10000,
+            "eval": {"n_eval": 4, "max_steps": 600, "early_stop": False},
+            "policy": {
+                "policy_head": {
+                    "network": "GMMHead",
+                    "network_kwargs": {"num_modes": 5, "low_eval_noise": False},
+                }
+            },
+            "data": {"obs": {"modality": {"rgb": ["agentview_rgb"], "low_dim": []}}},
+        }
+    )
+    env_args = {
+        "bddl_file_name": str(bddl_file),
+        "camera_heights": 128,
+        "camera_widths": 128,
+    }
+    init_states = np.arange(30, dtype=np.float64).reshape(6, 5)
+    return cfg, env_args, init_states
+
+
+def key(cfg, env_args, init_states, n_episodes=4, digest="abc", **kwargs):
+    return metric.eval_cache_key(
+        cfg, digest, env_args, init_states, n_episodes, **kwargs
+    )
+
+
+def test_same_setup_same_key(setup):
+    cfg, env_args, init_states = setup
+    assert key(cfg, env_args, init_states) == key(
+        copy.deepcopy(cfg), dict(env_args), init_states.copy()
+    )
+
+
+def test_weights_and_episodes_change_key(setup):
+    cfg, env_args, init_states = setup
+    base = key(cfg, env_args, init_states)
+    assert key(cfg, env_args, init_states, digest="abd") != base
+    assert key(cfg, env_args, init_states, n_episodes=5) != base
+    changed = init_states.copy()
+    changed[3, 0] += 1
+    assert key(cfg, env_args, changed) != base
+    # only the init states of the first n_episodes episodes are used
+    changed = init_states.copy()
+    changed[5, 0] += 1
+    assert key(cfg, env_args, changed) == base
+
+
+def test_bddl_content_changes_key(setup):
+    cfg, env_args, init_states = setup
+    base = key(cfg, env_args, init_states)
+    with open(env_args["bddl_file_name"], "a") as f:
+        f.write("\n; a comment")
+    assert key(cfg, env_args, init_states) != base
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"rollout": "pool"},
+        {"rollout": "pipeline"},
+        {"rollout": "cross_task"},
+        {"env_num": 2},
+        {"persistent_pool": True},
+    ],
+)
+def test_rollout_changes_key(setup, kwargs):
+    cfg, env_args, init_states = setup
+    assert key(cfg, env_args, init_states, **kwargs) != key(
+        cfg, env_args, init_states
+    )
+
+
+@pytest.mark.parametrize(
+    "update",
+    [
+        lambda cfg, env_args: cfg.update(seed=1),
+        lambda cfg, env_args: cfg.eval.update(max_steps=300),
+        lambda cfg, env_args: cfg.policy.policy_head.network_kwargs.update(
+            low_eval_noise=True
+        ),
+        lambda cfg, env_args: cfg.data.obs.modality.update(low_dim=["joint_states"]),
+        lambda cfg, env_args: env_args.update(camera_heights=84),
+        lambda cfg, env_args: env_args.update(site_visualization=False),
+    ],
+)
+def test_config_changes_key(setup, update):
+    cfg, env_args, init_states = setup
+    base = key(cfg, env_args, init_states)
+    update(cfg, env_args)
+    assert key(cfg, env_args, init_states) != base
+
+
+def test_transport_options_keep_key(setup):
+    cfg, env_args, init_states = setup
+    base = key(cfg, env_args, init_states)
+    cfg.eval.update(share_memory=True, envs_per_process=4, respawn_workers=True)
+    env_args.update(model_cache=True, model_cache_dir="/tmp/models")
+    assert key(cfg, env_args, init_states) == base
+
+
+def test_early_stop_changes_key(setup):
+    cfg, env_args, init_states = setup
+    base = key(cfg, env_args, init_states)
+    # the success rate to beat only matters with early stopping
+    assert key(cfg, env_args, init_states, best_success_rate=0.5) == base
+    cfg.eval.early_stop = True
+    early_stop = key(cfg, env_args, init_states)
+    assert early_stop != base
+    assert key(cfg, env_args, init_states, best_success_rate=0.5) != early_stop
+
+
+def test_result_cache(tmp_path):
+    cache = metric.EvalResultCache(str(tmp_path / "cache"))
+    assert cache.get("abc") is None
+    cache.put("abc", np.int64(3), 4)
+    assert cache.get("abc") == (3, 4)
+    assert (cache.hits, cache.misses) == (1, 1)
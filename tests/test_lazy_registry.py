@@ -0,0 +1,80 @@
+import sys
+import types
+
+import pytest
+
+base_object = pytest.importorskip("libero.libero.envs.base_object")
+LazyRegistry = base_object.LazyRegistry
+
+MODULE_SOURCE = """
+from lazy_registry_target import registry
+
+
+class {name}:
+    pass
+
+
+registry.register("{key}", {name})
+"""
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    """
+    A registry over two object modules, lazy_objects_a registering "a" and
+    lazy_objects_b registering "b", with only "a" in the manifest.
+    """
+    registry = LazyRegistry(
+        {"a": "lazy_objects_a:A"}, ["lazy_objects_a", "lazy_objects_b"]
+    )
+    target = types.ModuleType("lazy_registry_target")
+    target.registry = registry
+    monkeypatch.setitem(sys.modules, "lazy_registry_target", target)
+    for key in ("a", "b"):
+        (tmp_path / f"lazy_objects_{key}.py").write_text(
+            MODULE_SOURCE.format(name=key.upper(), key=key)
+        )
+        monkeypatch.delitem(sys.modules, f"lazy_objects_{key}", raising=False)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    return registry
+
+
+def test_manifest_entry_imports_its_module(registry):
+    assert "a" in registry
+    assert "lazy_objects_a" not in sys.modules
+    assert registry["a"].__name__ == "A"
+    assert "lazy_objects_a" in sys.modules
+    assert "lazy_objects_b" not in sys.modules
+
+
+def test_stale_manifest_falls_back_to_all_modules(registry):
+    assert "b" not in registry
+    assert registry["b"].__name__ == "B"
+    assert "b" in registry
+    assert "lazy_objects_b" in sys.modules
+
+
+def test_unknown_key(registry):
+    with pytest.raises(KeyError):
+        registry["c"]
+    assert "c" not in registry
+
+
+def test_mapping_interface(registry):
+    assert list(registry) == ["a"]
+    assert len(registry) == 1
+    registry["a"]
+    registry["b"]
+    assert sorted(registry) == ["a", "b"]
+    assert len(registry) == 2
+    del registry["a"]
+    assert "a" not in registry
+    assert list(registry) == ["b"]
+
+
+def test_manifest_matches_registered_objects():
+    registry = base_object.OBJECTS_DICT
+    for key, target in base_object.OBJECT_MANIFEST.items():
+        module, name = target.split(":")
+        assert registry[key].__module__ == module, key
+        assert registry[key].__name__ == name, key
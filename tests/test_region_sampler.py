@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+base_region_sampler = pytest.importorskip(
+    "libero.libero.envs.regions.base_region_sampler"
+)
+sample_valid_position = base_region_sampler.sample_valid_position
+
+
+def make_sampler(x_ranges, y_ranges, boundary=False, valid_placement=True):
+    """The region attributes sample_valid_position reads from a sampler."""
+    return SimpleNamespace(
+        x_ranges=x_ranges,
+        y_ranges=y_ranges,
+        num_ranges=len(x_ranges),
+        ensure_object_boundary_in_range=boundary,
+        ensure_valid_placement=valid_placement,
+        idx=None,
+    )
+
+
+def make_object(radius, bottom=-0.05, top=0.05):
+    """The size attributes sample_valid_position reads from a MujocoObject."""
+    return SimpleNamespace(
+        horizontal_radius=radius,
+        bottom_offset=np.array([0, 0, bottom]),
+        top_offset=np.array([0, 0, top]),
+    )
+
+
+def test_samples_within_regions():
+    np.random.seed(0)
+    sampler = make_sampler([[0.0, 0.1], [1.0, 1.1]], [[0.0, 0.1], [2.0, 2.1]])
+    for _ in range(50):
+        x, y = sample_valid_position(sampler, {}, make_object(0.02), 0.0, 0.5, 0.0, 0.0)
+        # the position is in the region of sampler.idx, shifted by offset_x
+        x_range = sampler.x_ranges[sampler.idx]
+        y_range = sampler.y_ranges[sampler.idx]
+        assert x_range[0] + 0.5 <= x <= x_range[1] + 0.5
+        assert y_range[0] <= y <= y_range[1]
+
+
+def test_keeps_object_boundary_in_range():
+    np.random.seed(0)
+    sampler = make_sampler([[0.0, 1.0]], [[0.0, 1.0]], boundary=True)
+    for _ in range(50):
+        x, y = sample_valid_position(sampler, {}, make_object(0.02), 0.4, 0.0, 0.0, 0.0)
+        assert 0.4 <= x <= 0.6 and 0.4 <= y <= 0.6
+
+
+def test_avoids_placed_objects():
+    np.random.seed(0)
+    sampler = make_sampler([[0.0, 1.0]], [[0.0, 1.0]])
+    placed = {"bowl": (np.array([0.5, 0.5, 0.0]), None, make_object(0.2))}
+    for _ in range(50):
+        x, y = sample_valid_position(
+            sampler, placed, make_object(0.1), 0.0, 0.0, 0.0, 0.0
+        )
+        assert np.hypot(x - 0.5, y - 0.5) > 0.3
+
+
+def test_no_valid_position():
+    np.random.seed(0)
+    sampler = make_sampler([[0.0, 0.1]], [[0.0, 0.1]])
+    placed = {"plate": (np.array([0.05, 0.05, 0.0]), None, make_object(0.5))}
+    obj = make_object(0.1)
+    assert sample_valid_position(sampler, placed, obj, 0.0, 0.0, 0.0, 0.0) is None
+    # objects entirely below the one being placed do not block it
+    assert sample_valid_position(sampler, placed, obj, 0.0, 0.0, 0.0, 1.0) is not None
+    # nor does anything without ensure_valid_placement
+    sampler.ensure_valid_placement = False
+    assert sample_valid_position(sampler, placed, obj, 0.0, 0.0, 0.0, 0.0) is not None
+
+
+def test_seeded():
+    sampler = make_sampler([[0.0, 1.0], [2.0, 3.0]], [[0.0, 1.0], [0.0, 1.0]])
+    placed = {"bowl": (np.array([0.5, 0.5, 0.0]), None, make_object(0.2))}
+    positions = []
+    for _ in range(2):
+        np.random.seed(1)
+        positions.append(
+            [
+                sample_valid_position(
+                    sampler, placed, make_object(0.1), 0.0, 0.0, 0.0, 0.0
+                )
+                for _ in range(10)
+            ]
+        )
+    assert positions[0] == positions[1]